@@ -5,13 +5,33 @@ import os
 import uuid
 import shutil
 import base64
+import binascii
+import hashlib
 import re
-from typing import Optional, Tuple
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
-from PIL import Image
+from urllib.parse import urlparse
+from PIL import Image, features
 import requests
+from requests.adapters import HTTPAdapter
 from io import BytesIO
 
+from DAL.repositories.db_context import db_context
+from DAL.repositories.imagen_repository import imagen_repository
+
+
+class ImageBatchError(ValueError):
+    """Raised by save_images_parallel; carries (index, message) for each failed image"""
+
+    def __init__(self, errors: List[Tuple[int, str]]):
+        self.errors = errors
+        super().__init__("; ".join(f"imagen {i + 1}: {msg}" for i, msg in errors))
+
+
 class CDNService:
     """Service for managing image uploads and storage"""
     
@@ -24,14 +44,343 @@ class CDNService:
     THUMBNAIL_SIZE = (150, 150)
     ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
     
+    # Responsive renditions generated at ingest: /imgs/renditions/<width>/<stem>.<format>
+    RENDITIONS_DIR = os.path.join(BASE_DIR, "renditions")
+    RENDITION_WIDTHS = tuple(sorted(
+        int(w) for w in os.getenv("IMAGE_RENDITION_WIDTHS", "48,96,256,512").split(",") if w.strip()
+    ))
+    RENDITION_QUALITY = int(os.getenv("IMAGE_RENDITION_QUALITY", "80"))
+    # AVIF needs a Pillow build/plugin with AVIF support; silently skipped otherwise
+    RENDITION_AVIF = os.getenv("IMAGE_RENDITION_AVIF", "false").strip().lower() in ("1", "true", "yes", "on")
+    
+    # Content-addressed mode: files named after the sha256 of their bytes, stored once,
+    # reference counted in the imagenes table (SQL_scripts/create_imagenes_table.sql)
+    CONTENT_ADDRESSED = os.getenv("IMAGE_CONTENT_ADDRESSED", "false").strip().lower() in ("1", "true", "yes", "on")
+    _HASH_FILENAME = re.compile(r'^([0-9a-f]{64})\.\w+$')
+    # Re-imports of a URL downloaded less than this long ago reuse the stored image; 0 always downloads
+    ORIGEN_REUSE_SECONDS = float(os.getenv("IMAGE_ORIGEN_REUSE_HOURS", "24")) * 3600
+    
+    # Streaming ingest limits: uploads are spooled to disk in chunks and rejected
+    # on magic bytes / header dimensions before the pixels are decoded
+    STREAM_CHUNK_SIZE = 256 * 1024
+    MAX_UPLOAD_BYTES = int(os.getenv("IMAGE_MAX_UPLOAD_MB", "10")) * 1024 * 1024
+    MAX_DIMENSION = int(os.getenv("IMAGE_MAX_DIMENSION", "6000"))
+    MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", "25000000"))
+    # Longest side of the stored original; larger uploads are downscaled at ingest
+    MAX_STORED_DIMENSION = int(os.getenv("IMAGE_MAX_STORED_DIMENSION", "2048"))
+    _MAGIC_BYTES = (
+        (b'\xff\xd8\xff', '.jpg'),
+        (b'\x89PNG\r\n\x1a\n', '.png'),
+        (b'GIF87a', '.gif'),
+        (b'GIF89a', '.gif'),
+    )
+    
+    # Download settings (bulk loads fetch images concurrently)
+    DOWNLOAD_TIMEOUT = int(os.getenv("IMAGE_DOWNLOAD_TIMEOUT", "10"))
+    DOWNLOAD_WORKERS = int(os.getenv("IMAGE_DOWNLOAD_WORKERS", "16"))
+    DOWNLOAD_PER_HOST = int(os.getenv("IMAGE_DOWNLOAD_PER_HOST", "4"))
+    DOWNLOAD_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Referer': 'https://www.google.com/'
+    }
+    
     def __init__(self):
         """Initialize CDN service and ensure directories exist"""
         self._ensure_directories()
+        self._http: Optional[requests.Session] = None
+        self._http_lock = threading.Lock()
+        self._host_semaphores = {}
+        # stem -> widths written for it; stems are never reused for other content
+        self._rendition_widths: Dict[str, Tuple[int, ...]] = {}
+        self._rendition_lock = threading.Lock()
+    
+    def _get_http_session(self) -> requests.Session:
+        """Shared HTTP session so downloads reuse keep-alive connections"""
+        with self._http_lock:
+            if self._http is None:
+                session = requests.Session()
+                session.headers.update(self.DOWNLOAD_HEADERS)
+                adapter = HTTPAdapter(pool_connections=self.DOWNLOAD_WORKERS, pool_maxsize=self.DOWNLOAD_WORKERS)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._http = session
+            return self._http
+    
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Per-host limit so one CDN is not hit by every worker at once"""
+        host = urlparse(url).netloc.lower()
+        with self._http_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.DOWNLOAD_PER_HOST)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+    
+    def _relative_paths(self, filename: str) -> Tuple[str, str]:
+        return f"/imgs/pics/{filename}", f"/imgs/thumbnails/thumb_{filename}"
+    
+    def _save_image(self, image: Image.Image, ext: str, digest: str, origen_url: Optional[str] = None) -> Tuple[str, str]:
+        """Store an image under a new UUID name, or content-addressed (by digest) when enabled"""
+        if not self.CONTENT_ADDRESSED:
+            return self._store_image(image, f"{uuid.uuid4()}{ext}")
+        
+        referencias, filename = imagen_repository.add_reference(digest, f"{digest}{ext}", origen_url)
+        image_path = os.path.join(self.PICS_DIR, filename)
+        thumbnail_path = os.path.join(self.THUMBNAILS_DIR, f"thumb_{filename}")
+        if referencias == 1 or not (os.path.exists(image_path) and os.path.exists(thumbnail_path)):
+            try:
+                self._store_image(image, filename)
+            except Exception:
+                imagen_repository.release_reference(digest)
+                raise
+        return self._relative_paths(filename)
+    
+    def _sniff_extension(self, head: bytes) -> Optional[str]:
+        """Detect the image type from its magic bytes"""
+        for magic, ext in self._MAGIC_BYTES:
+            if head.startswith(magic):
+                return ext
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return '.webp'
+        return None
+    
+    @contextmanager
+    def _spool(self, chunks: Iterable[bytes]) -> Generator[Tuple[str, str, str], None, None]:
+        """
+        Write chunks to a temp file, enforcing MAX_UPLOAD_BYTES and the magic
+        bytes as data arrives. Yields (temp path, extension, sha256 hex digest);
+        the temp file is removed afterwards.
+        """
+        fd, spool_path = tempfile.mkstemp(suffix=".upload")
+        try:
+            digest = hashlib.sha256()
+            total = 0
+            head = b''
+            ext = None
+            with os.fdopen(fd, 'wb') as spool:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    total += len(chunk)
+                    if total > self.MAX_UPLOAD_BYTES:
+                        raise ValueError(f"La imagen supera el tamaño máximo de {self.MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+                    if ext is None and len(head) < 12:
+                        head += chunk[:12]
+                        if len(head) >= 12:
+                            ext = self._sniff_extension(head)
+                            if ext is None:
+                                raise ValueError("El archivo no es una imagen válida (JPEG, PNG, GIF o WebP)")
+                    digest.update(chunk)
+                    spool.write(chunk)
+            if ext is None:
+                ext = self._sniff_extension(head)
+                if ext is None:
+                    raise ValueError("El archivo no es una imagen válida (JPEG, PNG, GIF o WebP)")
+            yield spool_path, ext, digest.hexdigest()
+        finally:
+            if os.path.exists(spool_path):
+                os.remove(spool_path)
+    
+    def _save_stream(self, chunks: Iterable[bytes], origen_url: Optional[str] = None) -> Tuple[str, str]:
+        """Spool, validate and store an image coming in as a stream of byte chunks"""
+        with self._spool(chunks) as (spool_path, ext, digest):
+            # Image.open only parses the header; pixels are decoded on first use
+            with Image.open(spool_path) as image:
+                width, height = image.size
+                if width > self.MAX_DIMENSION or height > self.MAX_DIMENSION or width * height > self.MAX_PIXELS:
+                    raise ValueError(
+                        f"La imagen es demasiado grande ({width}x{height}); máximo {self.MAX_DIMENSION} píxeles por lado"
+                    )
+                self._fit_for_storage(image)
+                return self._save_image(image, ext, digest, origen_url)
+    
+    def _fit_for_storage(self, image: Image.Image) -> None:
+        """Downscale in place to MAX_STORED_DIMENSION, before the pixels are decoded
+
+        JPEGs are decoded by libjpeg at 1/2, 1/4 or 1/8 scale (draft), never
+        below the target, so a large photo is never fully decoded; other
+        formats are reduced right after the load.
+        """
+        if max(image.size) <= self.MAX_STORED_DIMENSION:
+            return
+        scale = self.MAX_STORED_DIMENSION / max(image.size)
+        target = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        if image.format == "JPEG":
+            # draft only shrinks while both sides stay >= target, hence the fitted size
+            image.draft(image.mode, target)
+        image.thumbnail(target, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    
+    def _iter_base64(self, data: str, start: int = 0) -> Iterator[bytes]:
+        """Decode base64 text in chunks (whitespace tolerant) instead of all at once"""
+        step = self.STREAM_CHUNK_SIZE
+        carry = ''
+        try:
+            for i in range(start, len(data), step):
+                piece = carry + ''.join(data[i:i + step].split())
+                usable = len(piece) - len(piece) % 4
+                carry = piece[usable:]
+                if usable:
+                    yield binascii.a2b_base64(piece[:usable])
+            if carry:
+                yield binascii.a2b_base64(carry + '=' * (-len(carry) % 4))
+        except binascii.Error as e:
+            raise ValueError(f"Error al decodificar base64: {str(e)}")
+    
+    def _reuse_by_origen(self, image_url: str) -> Optional[Tuple[str, str]]:
+        """Content-addressed re-import: reuse a stored image previously downloaded from image_url"""
+        if self.ORIGEN_REUSE_SECONDS <= 0:
+            return None
+        found = imagen_repository.add_reference_by_origen(image_url, self.ORIGEN_REUSE_SECONDS)
+        if not found:
+            return None
+        digest, filename = found
+        if os.path.exists(os.path.join(self.PICS_DIR, filename)) and \
+                os.path.exists(os.path.join(self.THUMBNAILS_DIR, f"thumb_{filename}")):
+            return self._relative_paths(filename)
+        # Files went missing; undo and download again
+        imagen_repository.release_reference(digest)
+        return None
+    
+    def _store_image(self, image: Image.Image, unique_filename: str) -> Tuple[str, str]:
+        """Save original image and its thumbnail, return relative paths"""
+        # Save original image
+        image_path = os.path.join(self.PICS_DIR, unique_filename)
+        self._atomic_save(image, image_path)
+        
+        # Generate and save thumbnail
+        thumbnail_filename = f"thumb_{unique_filename}"
+        thumbnail_path = os.path.join(self.THUMBNAILS_DIR, thumbnail_filename)
+        
+        try:
+            thumbnail = image.copy()
+            thumbnail.thumbnail(self.THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+            self._atomic_save(thumbnail, thumbnail_path)
+        except Exception:
+            # Do not leave an original without its thumbnail behind
+            if os.path.exists(image_path):
+                os.remove(image_path)
+            raise
+        
+        try:
+            self._store_renditions(image, Path(unique_filename).stem)
+        except Exception:
+            self._remove_files(unique_filename)
+            raise
+        
+        # Return relative paths
+        return self._relative_paths(unique_filename)
+    
+    def _rendition_formats(self) -> Tuple[str, ...]:
+        if self.RENDITION_AVIF and '.avif' in Image.registered_extensions():
+            return ("webp", "avif")
+        return ("webp",)
+    
+    def _store_renditions(self, image: Image.Image, stem: str) -> None:
+        """Write every configured width up to the source width in WebP, plus AVIF when available
+
+        Wider renditions are skipped rather than upscaled, so each file is
+        exactly as wide as the width it is listed under in the srcset.
+        """
+        if not self.RENDITION_WIDTHS or not features.check('webp'):
+            return
+        
+        rendition = image
+        if rendition.mode not in ("RGB", "RGBA"):
+            has_alpha = rendition.mode in ("LA", "PA") or "transparency" in rendition.info
+            rendition = rendition.convert("RGBA" if has_alpha else "RGB")
+        
+        formats = self._rendition_formats()
+        widths = tuple(width for width in self.RENDITION_WIDTHS if width <= image.width)
+        # Largest first, each step downscales the previous result (cheaper than from the original)
+        for width in reversed(widths):
+            if rendition.width > width:
+                height = max(1, round(rendition.height * width / rendition.width))
+                rendition = rendition.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            target_dir = os.path.join(self.RENDITIONS_DIR, str(width))
+            os.makedirs(target_dir, exist_ok=True)
+            for fmt in formats:
+                path = os.path.join(target_dir, f"{stem}.{fmt}")
+                tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    rendition.save(tmp_path, format=fmt.upper(), quality=self.RENDITION_QUALITY, method=4)
+                    os.replace(tmp_path, path)
+                except Exception:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+        with self._rendition_lock:
+            self._rendition_widths[stem] = widths
+    
+    def _remove_files(self, filename: str) -> None:
+        """Remove an original, its thumbnail and all of its renditions"""
+        paths = [
+            os.path.join(self.PICS_DIR, filename),
+            os.path.join(self.THUMBNAILS_DIR, f"thumb_{filename}"),
+        ]
+        stem = Path(filename).stem
+        with self._rendition_lock:
+            self._rendition_widths.pop(stem, None)
+        for width in self.RENDITION_WIDTHS:
+            for fmt in ("webp", "avif"):
+                paths.append(os.path.join(self.RENDITIONS_DIR, str(width), f"{stem}.{fmt}"))
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _widths_for(self, stem: str) -> Tuple[int, ...]:
+        """Widths rendered for a stored image (looked up on disk once, then remembered)"""
+        widths = self._rendition_widths.get(stem)
+        if widths is None:
+            widths = tuple(
+                width for width in self.RENDITION_WIDTHS
+                if os.path.exists(os.path.join(self.RENDITIONS_DIR, str(width), f"{stem}.webp"))
+            )
+            if widths:
+                # Misses are not remembered: another worker may render this image later
+                with self._rendition_lock:
+                    self._rendition_widths.setdefault(stem, widths)
+        return widths
+    
+    def get_rendition_urls(self, image_path: Optional[str], fmt: str = "webp") -> dict:
+        """Map width -> URL of each rendition of a stored image (/imgs/pics/<file>)"""
+        if not image_path or not image_path.startswith("/imgs/pics/"):
+            return {}
+        stem = Path(image_path).stem
+        return {width: f"/imgs/renditions/{width}/{stem}.{fmt}" for width in self._widths_for(stem)}
+    
+    def get_srcset(self, image_path: Optional[str], fmt: str = "webp", base_url: str = "") -> Optional[str]:
+        """
+        Build an HTML srcset value for a stored image, e.g.
+        "/imgs/renditions/48/<stem>.webp 48w, /imgs/renditions/96/<stem>.webp 96w, ..."
+        None for external URLs and images without renditions.
+        """
+        urls = self.get_rendition_urls(image_path, fmt)
+        if not urls:
+            return None
+        return ", ".join(f"{self.get_image_url(url, base_url)} {width}w" for width, url in urls.items())
+    
+    def _atomic_save(self, image: Image.Image, path: str) -> None:
+        """Write to a temp file and rename, so readers never see a partial file"""
+        root, ext = os.path.splitext(path)
+        tmp_path = f"{root}.{uuid.uuid4().hex}.tmp{ext}"
+        try:
+            image.save(tmp_path, format=Image.registered_extensions().get(ext.lower()), quality=85, optimize=True)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
     
     def _ensure_directories(self):
         """Create image directories if they don't exist"""
         os.makedirs(self.PICS_DIR, exist_ok=True)
         os.makedirs(self.THUMBNAILS_DIR, exist_ok=True)
+        for width in self.RENDITION_WIDTHS:
+            os.makedirs(os.path.join(self.RENDITIONS_DIR, str(width)), exist_ok=True)
     
     def _get_file_extension(self, filename: str) -> str:
         """Extract file extension from filename"""
@@ -63,53 +412,26 @@ class CDNService:
             ValueError: If URL is invalid or image cannot be downloaded
         """
         try:
-            # Headers to avoid 403 Forbidden errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Referer': 'https://www.google.com/'
-            }
-            
-            # Download image from URL
-            response = requests.get(image_url, timeout=10, headers=headers)
-            response.raise_for_status()
-            
-            # Validate content type
-            content_type = response.headers.get('content-type', '')
-            if not content_type.startswith('image/'):
-                raise ValueError(f"URL does not point to an image: {content_type}")
-            
-            # Generate unique filename
-            original_filename = image_url.split('/')[-1].split('?')[0]
-            if not self._is_valid_extension(original_filename):
-                original_filename += '.jpg'  # Default to jpg if no valid extension
-            
-            unique_filename = self._generate_unique_filename(original_filename)
-            
-            # Open image with PIL
-            image = Image.open(BytesIO(response.content))
-            
-            # Save original image
-            image_path = os.path.join(self.PICS_DIR, unique_filename)
-            image.save(image_path, quality=85, optimize=True)
-            
-            # Generate and save thumbnail
-            thumbnail_filename = f"thumb_{unique_filename}"
-            thumbnail_path = os.path.join(self.THUMBNAILS_DIR, thumbnail_filename)
-            
-            # Create thumbnail
-            thumbnail = image.copy()
-            thumbnail.thumbnail(self.THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-            thumbnail.save(thumbnail_path, quality=85, optimize=True)
-            
-            # Return relative paths
-            relative_image_path = f"/imgs/pics/{unique_filename}"
-            relative_thumbnail_path = f"/imgs/thumbnails/{thumbnail_filename}"
-            
-            return relative_image_path, relative_thumbnail_path
+            if self.CONTENT_ADDRESSED:
+                reused = self._reuse_by_origen(image_url)
+                if reused:
+                    return reused
+            
+            # Download image from URL (shared session, bounded per host), streamed to a spool file
+            with self._host_semaphore(image_url):
+                with self._get_http_session().get(image_url, timeout=self.DOWNLOAD_TIMEOUT, stream=True) as response:
+                    response.raise_for_status()
+                    
+                    # Validate content type
+                    content_type = response.headers.get('content-type', '')
+                    if not content_type.startswith('image/'):
+                        raise ValueError(f"URL does not point to an image: {content_type}")
+                    
+                    content_length = response.headers.get('content-length')
+                    if content_length and content_length.isdigit() and int(content_length) > self.MAX_UPLOAD_BYTES:
+                        raise ValueError(f"La imagen supera el tamaño máximo de {self.MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+                    
+                    return self._save_stream(response.iter_content(self.STREAM_CHUNK_SIZE), origen_url=image_url)
             
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Error al descargar imagen desde URL: {str(e)}")
@@ -131,35 +453,30 @@ class CDNService:
         Raises:
             ValueError: If file is invalid or cannot be processed
         """
+        return self.save_uploaded_stream(BytesIO(file_content), filename, entity_type)
+    
+    def save_uploaded_stream(self, file: BinaryIO, filename: str, entity_type: str = "jugador") -> Tuple[str, str]:
+        """
+        Save an uploaded file read in chunks (e.g. UploadFile.file) and generate thumbnail.
+        The content is spooled to disk, never held in memory as a whole.
+        
+        Args:
+            file: Binary file object positioned at the start of the upload
+            filename: Original filename
+            entity_type: Type of entity (jugador, equipo, usuario, etc.)
+            
+        Returns:
+            Tuple of (image_path, thumbnail_path) - relative paths to stored images
+            
+        Raises:
+            ValueError: If file is invalid, too large or cannot be processed
+        """
         try:
             # Validate file extension
             if not self._is_valid_extension(filename):
                 raise ValueError(f"Extensión de archivo no permitida. Use: {', '.join(self.ALLOWED_EXTENSIONS)}")
             
-            # Generate unique filename
-            unique_filename = self._generate_unique_filename(filename)
-            
-            # Open image with PIL
-            image = Image.open(BytesIO(file_content))
-            
-            # Save original image
-            image_path = os.path.join(self.PICS_DIR, unique_filename)
-            image.save(image_path, quality=85, optimize=True)
-            
-            # Generate and save thumbnail
-            thumbnail_filename = f"thumb_{unique_filename}"
-            thumbnail_path = os.path.join(self.THUMBNAILS_DIR, thumbnail_filename)
-            
-            # Create thumbnail
-            thumbnail = image.copy()
-            thumbnail.thumbnail(self.THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-            thumbnail.save(thumbnail_path, quality=85, optimize=True)
-            
-            # Return relative paths
-            relative_image_path = f"/imgs/pics/{unique_filename}"
-            relative_thumbnail_path = f"/imgs/thumbnails/{thumbnail_filename}"
-            
-            return relative_image_path, relative_thumbnail_path
+            return self._save_stream(iter(lambda: file.read(self.STREAM_CHUNK_SIZE), b''))
             
         except Exception as e:
             raise ValueError(f"Error al procesar archivo subido: {str(e)}")
@@ -183,62 +500,16 @@ class CDNService:
         """
         try:
             # Remove data URI prefix if present (e.g., "data:image/png;base64,")
+            start = 0
             if base64_data.startswith('data:'):
-                # Extract the actual base64 data after the comma
-                match = re.match(r'data:image/(\w+);base64,(.+)', base64_data)
-                if match:
-                    image_format = match.group(1)  # png, jpeg, etc.
-                    base64_string = match.group(2)
-                else:
+                # Only the short header is inspected; the payload is decoded in chunks
+                comma = base64_data.find(',', 0, 100)
+                if comma == -1 or not re.match(r'data:image/(\w+);base64$', base64_data[:comma]):
                     raise ValueError("Formato de data URI inválido")
-            else:
-                # Assume it's just the base64 string
-                base64_string = base64_data
-                image_format = 'jpg'  # Default format
-            
-            # Decode base64 to binary
-            try:
-                image_binary = base64.b64decode(base64_string)
-            except Exception as e:
-                raise ValueError(f"Error al decodificar base64: {str(e)}")
-            
-            # Open image with PIL
-            image = Image.open(BytesIO(image_binary))
-            
-            # Determine file extension
-            # PIL automatically detects format, use it if available
-            if image.format:
-                ext = f".{image.format.lower()}"
-                if ext == '.jpeg':
-                    ext = '.jpg'
-            else:
-                ext = f".{image_format.lower()}"
-            
-            # Validate extension
-            if ext not in self.ALLOWED_EXTENSIONS:
-                ext = '.jpg'  # Default to jpg if format not recognized
-            
-            # Generate unique filename
-            unique_filename = f"{uuid.uuid4()}{ext}"
-            
-            # Save original image
-            image_path = os.path.join(self.PICS_DIR, unique_filename)
-            image.save(image_path, quality=85, optimize=True)
-            
-            # Generate and save thumbnail
-            thumbnail_filename = f"thumb_{unique_filename}"
-            thumbnail_path = os.path.join(self.THUMBNAILS_DIR, thumbnail_filename)
-            
-            # Create thumbnail
-            thumbnail = image.copy()
-            thumbnail.thumbnail(self.THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
-            thumbnail.save(thumbnail_path, quality=85, optimize=True)
+                start = comma + 1
             
-            # Return relative paths
-            relative_image_path = f"/imgs/pics/{unique_filename}"
-            relative_thumbnail_path = f"/imgs/thumbnails/{thumbnail_filename}"
-            
-            return relative_image_path, relative_thumbnail_path
+            # The stored extension comes from the decoded magic bytes
+            return self._save_stream(self._iter_base64(base64_data, start))
             
         except ValueError:
             # Re-raise ValueError with original message
@@ -276,6 +547,59 @@ class CDNService:
         else:
             raise ValueError("Formato de imagen no reconocido. Debe ser una URL (http/https) o datos base64")
     
+    def save_images_parallel(self, images: List[str], entity_type: str = "jugador") -> List[Tuple[str, str]]:
+        """
+        Save many images (URLs or base64) concurrently, all-or-nothing.
+        
+        Downloads, decoding and thumbnailing run on a bounded thread pool
+        (Pillow releases the GIL while resizing/encoding) with a per-host
+        download limit. On the first failure pending work is cancelled and
+        every file already written by this batch is deleted.
+        
+        Args:
+            images: Image sources, in order
+            entity_type: Type of entity (jugador, equipo, usuario, etc.)
+            
+        Returns:
+            List of (image_path, thumbnail_path), in the same order as images
+            
+        Raises:
+            ImageBatchError: If any image cannot be processed
+        """
+        results: List[Optional[Tuple[str, str]]] = [None] * len(images)
+        errors: List[Tuple[int, str]] = []
+        if not images:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(self.DOWNLOAD_WORKERS, len(images)), thread_name_prefix="cdn") as executor:
+            futures = {
+                executor.submit(self.save_image_auto, image_data, entity_type): i
+                for i, image_data in enumerate(images)
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    if not errors:
+                        # Fail fast: no point downloading the rest of the batch
+                        for pending in futures:
+                            pending.cancel()
+                    errors.append((i, str(e)))
+        
+        if errors:
+            self.delete_images(paths[0] for paths in results if paths)
+            raise ImageBatchError(sorted(errors))
+        
+        return results
+    
+    def delete_images(self, image_paths: Iterable[str]) -> None:
+        """Delete several images and their thumbnails (used to roll back a batch)"""
+        for image_path in image_paths:
+            self.delete_image(image_path)
+    
     def _is_base64(self, data: str) -> bool:
         """
         Check if a string is valid base64 encoded data.
@@ -305,7 +629,8 @@ class CDNService:
     
     def delete_image(self, image_path: str) -> bool:
         """
-        Delete an image and its thumbnail.
+        Delete an image, its thumbnail and its renditions.
+        Content-addressed images are only removed when their last reference is released.
         
         Args:
             image_path: Relative path to the image (e.g., /imgs/pics/image.jpg)
@@ -314,18 +639,19 @@ class CDNService:
             True if deleted successfully, False otherwise
         """
         try:
-            # Convert relative path to absolute
-            abs_image_path = os.path.join("/app", image_path.lstrip('/'))
-            
-            # Delete main image
-            if os.path.exists(abs_image_path):
-                os.remove(abs_image_path)
-            
-            # Delete thumbnail
-            filename = os.path.basename(abs_image_path)
-            thumbnail_path = os.path.join(self.THUMBNAILS_DIR, f"thumb_{filename}")
-            if os.path.exists(thumbnail_path):
-                os.remove(thumbnail_path)
+            filename = os.path.basename(image_path)
+            # Content-addressed files are shared: only the last reference removes
+            # them, under the row lock add_reference waits on
+            match = self.CONTENT_ADDRESSED and self._HASH_FILENAME.match(filename)
+            if match:
+                restantes = imagen_repository.release_reference(
+                    match.group(1), on_last=lambda: self._remove_files(filename)
+                )
+                if restantes is not None:
+                    return True
+            
+            # Delete main image, thumbnail and renditions
+            self._remove_files(filename)
             
             return True
             
@@ -333,6 +659,16 @@ class CDNService:
             print(f"Error al eliminar imagen: {str(e)}")
             return False
     
+    def delete_image_after_commit(self, image_path: Optional[str]) -> None:
+        """Delete a stored image once the current unit of work commits (kept on rollback)"""
+        if image_path and image_path.startswith("/imgs/"):
+            db_context.after_commit(lambda: self.delete_image(image_path))
+    
+    def delete_image_after_rollback(self, image_path: Optional[str]) -> None:
+        """Delete a just-stored image if the current unit of work rolls back"""
+        if image_path and image_path.startswith("/imgs/"):
+            db_context.after_rollback(lambda: self.delete_image(image_path))
+    
     def get_image_url(self, relative_path: str, base_url: str = "") -> str:
         """
         Get full URL for an image.
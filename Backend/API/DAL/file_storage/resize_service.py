@@ -0,0 +1,165 @@
+"""
+On-demand image resizing with a size-capped, LRU-evicted disk cache
+"""
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Tuple
+
+from PIL import Image
+
+
+class ImageResizeService:
+    """Service for lazily generated renditions of stored pictures
+
+    Renditions are produced on a bounded worker pool, kept on disk under
+    CACHE_DIR/<w>x<h>/<stem>.webp and evicted least-recently-used once the
+    cache grows past MAX_CACHE_BYTES. Concurrent requests for the same
+    rendition share a single resize.
+    """
+
+    PICS_DIR = "/app/imgs/pics"
+    CACHE_DIR = "/app/imgs/cache/resize"
+
+    MAX_DIMENSION = int(os.getenv("IMAGE_RESIZE_MAX_DIMENSION", "2048"))
+    MAX_CACHE_BYTES = int(os.getenv("IMAGE_RESIZE_CACHE_MB", "512")) * 1024 * 1024
+    WORKERS = int(os.getenv("IMAGE_RESIZE_WORKERS", str(min(4, os.cpu_count() or 1))))
+    QUALITY = int(os.getenv("IMAGE_RESIZE_QUALITY", "80"))
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.WORKERS, thread_name_prefix="resize")
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lru: "OrderedDict[str, int]" = OrderedDict()  # cache path -> size in bytes
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        # Held while the index is rebuilt, so only the first render walks the cache
+        self._index_lock = threading.Lock()
+        self._loaded = False
+
+    def _ensure_index(self) -> None:
+        if self._loaded:
+            return
+        with self._index_lock:
+            if not self._loaded:
+                self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from what is already on disk (oldest access first)"""
+        entries = []
+        if os.path.isdir(self.CACHE_DIR):
+            for root, _, files in os.walk(self.CACHE_DIR):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_atime, path, st.st_size))
+        entries.sort()
+        with self._lock:
+            for _, path, size in entries:
+                # Renditions written meanwhile are already indexed; count them once
+                self._total_bytes += size - self._lru.pop(path, 0)
+                self._lru[path] = size
+            self._loaded = True
+        self._evict()
+
+    def _touch(self, path: str) -> None:
+        with self._lock:
+            if path in self._lru:
+                self._lru.move_to_end(path)
+
+    def _add(self, path: str, size: int) -> None:
+        with self._lock:
+            self._total_bytes += size - self._lru.pop(path, 0)
+            self._lru[path] = size
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used renditions until the cache fits its cap"""
+        while True:
+            with self._lock:
+                if self._total_bytes <= self.MAX_CACHE_BYTES or len(self._lru) <= 1:
+                    return
+                path, size = self._lru.popitem(last=False)
+                self._total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _paths(self, filename: str, width: int, height: int) -> Tuple[str, str]:
+        source = os.path.join(self.PICS_DIR, filename)
+        target = os.path.join(self.CACHE_DIR, f"{width}x{height}", f"{Path(filename).stem}.webp")
+        return source, target
+
+    def _render(self, source: str, target: str, width: int, height: int) -> int:
+        """Resize source to fit within width x height (never upscaled) and write target as WebP"""
+        self._ensure_index()
+        with Image.open(source) as image:
+            # Let JPEG decode at a reduced scale when the target is much smaller
+            image.draft("RGB", (width, height))
+            if image.mode not in ("RGB", "RGBA"):
+                has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+                image = image.convert("RGBA" if has_alpha else "RGB")
+            image.thumbnail((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+            try:
+                image.save(tmp_path, format="WEBP", quality=self.QUALITY, method=4)
+                os.replace(tmp_path, target)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return os.path.getsize(target)
+
+    async def get_resized(self, filename: str, width: int, height: int) -> str:
+        """
+        Return the path of the cached rendition, generating it if needed.
+
+        Raises:
+            ValueError: If the requested size or file name is invalid
+            FileNotFoundError: If the source picture does not exist
+        """
+        if filename != os.path.basename(filename) or filename in ('', '.', '..'):
+            raise ValueError("Ruta inválida")
+        if not (0 < width <= self.MAX_DIMENSION and 0 < height <= self.MAX_DIMENSION):
+            raise ValueError(f"Las dimensiones deben estar entre 1 y {self.MAX_DIMENSION} píxeles")
+
+        source, target = self._paths(filename, width, height)
+        if not os.path.isfile(source):
+            # Also hides renditions of pictures deleted since they were cached
+            raise FileNotFoundError(filename)
+        if os.path.exists(target):
+            self._touch(target)
+            return target
+
+        # Single flight: the first request resizes, the others await its result
+        inflight = self._inflight.get(target)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[target] = future
+        try:
+            size = await loop.run_in_executor(self._executor, self._render, source, target, width, height)
+            self._add(target, size)
+            future.set_result(target)
+            return target
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved so an unawaited failure does not log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(target, None)
+
+
+# Create service instance
+image_resize_service = ImageResizeService()
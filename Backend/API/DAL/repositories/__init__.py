@@ -3,6 +3,7 @@ Repositories Package
 
 Contains all repository classes for database operations following the repository pattern.
 Each repository provides CRUD operations and query methods for a specific entity.
+Async variants (AsyncBaseRepository) serve the hot read paths of async routes.
 
 Available repositories:
 - usuario_repository: User operations
@@ -13,32 +14,44 @@ Available repositories:
 - temporada_repository: Season operations
 - media_repository: Media operations
 - noticia_jugador_repository: Player news operations
+- imagen_repository: Content-addressed image reference counts
+- sesion_repository: Login sessions shared across workers
 """
 
 from .base import BaseRepository
-from .usuario_repository import usuario_repository
-from .liga_repository import liga_repository, liga_miembro_repository, liga_cupo_repository
-from .equipo_repository import equipo_repository
+from .async_base import AsyncBaseRepository
+from .usuario_repository import usuario_repository, async_usuario_repository
+from .liga_repository import liga_repository, liga_miembro_repository, liga_cupo_repository, async_liga_repository
+from .equipo_repository import equipo_repository, async_equipo_repository
 from .equipo_fantasy_repository import equipo_fantasy_repository, equipo_fantasy_audit_repository
-from .jugador_repository import jugador_repository
+from .jugador_repository import jugador_repository, async_jugador_repository
 from .temporada_repository import temporada_repository, temporada_semana_repository
 from .media_repository import media_repository
 from .noticia_jugador_repository import noticia_jugador_repository
+from .imagen_repository import imagen_repository
+from .sesion_repository import sesion_repository
 from .db_context import db_context
 
 __all__ = [
     'BaseRepository',
+    'AsyncBaseRepository',
     'usuario_repository',
+    'async_usuario_repository',
     'liga_repository',
+    'async_liga_repository',
     'liga_miembro_repository',
     'liga_cupo_repository',
     'equipo_repository',
+    'async_equipo_repository',
     'equipo_fantasy_repository',
     'equipo_fantasy_audit_repository',
     'jugador_repository',
+    'async_jugador_repository',
     'temporada_repository',
     'temporada_semana_repository',
     'media_repository',
     'noticia_jugador_repository',
+    'imagen_repository',
+    'sesion_repository',
     'db_context',
 ]
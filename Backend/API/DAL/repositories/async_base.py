@@ -0,0 +1,106 @@
+"""
+Async base repository built on SQLAlchemy AsyncSession
+Same CRUD surface as BaseRepository, for use from async def routes without blocking the event loop
+"""
+from abc import ABC
+from typing import List, Optional, Type, TypeVar, Generic, Callable, Awaitable, Any, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from DAL.repositories.db_context import db_context
+from DAL.repositories.pagination import default_sort_columns, apply_keyset, build_page
+
+# Generic types
+ModelType = TypeVar('ModelType')
+CreateSchemaType = TypeVar('CreateSchemaType')
+UpdateSchemaType = TypeVar('UpdateSchemaType')
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC):
+    """Async base repository class with common CRUD operations
+
+    Mirrors BaseRepository: sessions are managed internally and
+    query functions receive an AsyncSession and must be coroutines.
+    """
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+    
+    @property
+    def sort_columns(self) -> Tuple[Any, ...]:
+        """Stable, unique sort key used for listings and cursor pagination"""
+        return default_sort_columns(self.model)
+
+    async def _execute_query(self, query_func: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """Execute an async query function with automatic session management"""
+        async with db_context.get_async_session() as db:
+            return await query_func(db)
+
+    async def get(self, id: UUID) -> Optional[ModelType]:
+        """Get a single record by ID"""
+        async def query(db: AsyncSession):
+            return await db.get(self.model, id)
+        return await self._execute_query(query)
+
+    async def get_multi(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        """Get multiple records with pagination"""
+        async def query(db: AsyncSession):
+            result = await db.execute(select(self.model).order_by(*self.sort_columns).offset(skip).limit(limit))
+            return list(result.scalars().all())
+        return await self._execute_query(query)
+    
+    async def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[ModelType], Optional[str]]:
+        """Get one page of records after cursor; returns (items, next_cursor)"""
+        async def query(db: AsyncSession):
+            columns = self.sort_columns
+            result = await db.execute(apply_keyset(select(self.model), columns, cursor, limit))
+            return build_page(result.scalars().all(), columns, limit)
+        return await self._execute_query(query)
+
+    async def create(self, obj_in: CreateSchemaType) -> ModelType:
+        """Create a new record"""
+        async def query(db: AsyncSession):
+            if isinstance(obj_in, dict):
+                obj_data = obj_in
+            else:
+                obj_data = obj_in.model_dump() if hasattr(obj_in, 'model_dump') else obj_in.dict()
+            db_obj = self.model(**obj_data)
+            db.add(db_obj)
+            await db.flush()
+            await db.refresh(db_obj)
+            return db_obj
+        return await self._execute_query(query)
+
+    async def update(self, db_obj: ModelType, obj_in: UpdateSchemaType) -> ModelType:
+        """Update an existing record"""
+        async def query(db: AsyncSession):
+            if isinstance(obj_in, dict):
+                obj_data = obj_in
+            elif hasattr(obj_in, 'model_dump'):
+                obj_data = obj_in.model_dump(exclude_unset=True)
+            else:
+                obj_data = obj_in.dict(exclude_unset=True)
+
+            # Re-attach object to session if needed
+            merged_obj = db_obj
+            if merged_obj not in db:
+                merged_obj = await db.merge(db_obj)
+
+            for field, value in obj_data.items():
+                setattr(merged_obj, field, value)
+
+            await db.flush()
+            await db.refresh(merged_obj)
+            return merged_obj
+        return await self._execute_query(query)
+
+    async def delete(self, id: UUID) -> bool:
+        """Delete a record by ID"""
+        async def query(db: AsyncSession):
+            obj = await db.get(self.model, id)
+            if obj:
+                await db.delete(obj)
+                await db.flush()
+                return True
+            return False
+        return await self._execute_query(query)
@@ -3,7 +3,7 @@ Base repository pattern implementation for consistent data access
 Repositories manage their own database sessions internally
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Type, TypeVar, Generic, Callable, Any
+from typing import List, Optional, Type, TypeVar, Generic, Callable, Any, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
@@ -11,6 +11,7 @@ from fastapi import HTTPException, status
 from contextlib import contextmanager
 
 from DAL.repositories.db_context import db_context
+from DAL.repositories.pagination import default_sort_columns, apply_keyset, build_page
 
 # Generic types
 ModelType = TypeVar('ModelType')
@@ -27,6 +28,11 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
     def __init__(self, model: Type[ModelType]):
         self.model = model
     
+    @property
+    def sort_columns(self) -> Tuple[Any, ...]:
+        """Stable, unique sort key used for listings and cursor pagination"""
+        return default_sort_columns(self.model)
+    
     def _execute_query(self, query_func: Callable[[Session], Any]) -> Any:
         """Execute a query function with automatic session management"""
         with db_context.get_session() as db:
@@ -41,7 +47,14 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], ABC
     def get_multi(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get multiple records with pagination"""
         def query(db: Session):
-            return db.query(self.model).offset(skip).limit(limit).all()
+            return db.query(self.model).order_by(*self.sort_columns).offset(skip).limit(limit).all()
+        return self._execute_query(query)
+    
+    def get_page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[ModelType], Optional[str]]:
+        """Get one page of records after cursor; returns (items, next_cursor)"""
+        def query(db: Session):
+            columns = self.sort_columns
+            return build_page(apply_keyset(db.query(self.model), columns, cursor, limit).all(), columns, limit)
         return self._execute_query(query)
     
     def create(self, obj_in: CreateSchemaType) -> ModelType:
@@ -1,22 +1,199 @@
 """
 Database session context manager for repositories
 This ensures only repositories have access to database sessions
+
+Sessions are request scoped: main.py opens a unit of work per HTTP request
+and every repository call made while it is active joins the same session,
+so a request costs one connection checkout and one commit. Outside of a
+request (scripts, background jobs) each call falls back to its own session.
 """
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar
+from typing import Callable, Generator, AsyncGenerator, List, Optional
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from database import SessionLocal, AsyncSessionLocal
+
+
+class UnitOfWork:
+    """Sessions shared by every repository call inside one request/transaction
+
+    Sessions are opened lazily, so requests that never touch the database
+    never check out a connection.
+    """
+
+    __slots__ = ("_session", "_async_session", "failed", "_after_commit", "_after_rollback")
+
+    def __init__(self):
+        self._session: Optional[Session] = None
+        self._async_session: Optional[AsyncSession] = None
+        self.failed = False
+        self._after_commit: List[Callable[[], None]] = []
+        self._after_rollback: List[Callable[[], None]] = []
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            self._session = SessionLocal()
+        return self._session
+
+    @property
+    def async_session(self) -> AsyncSession:
+        if self._async_session is None:
+            self._async_session = AsyncSessionLocal()
+        return self._async_session
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the unit of work has committed (dropped on rollback)
+
+        Callbacks run after the data is durable and must not raise.
+        """
+        self._after_commit.append(callback)
+
+    def after_rollback(self, callback: Callable[[], None]) -> None:
+        """Run callback if the unit of work rolls back (dropped on commit); must not raise"""
+        self._after_rollback.append(callback)
+
+    def _run_after_commit(self, committed: bool) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        rollback_callbacks, self._after_rollback = self._after_rollback, []
+        for callback in (callbacks if committed else rollback_callbacks):
+            callback()
+
+    def _complete_session(self, commit: bool) -> bool:
+        """Commit (or roll back) and close the sync session; True if it committed"""
+        db, self._session = self._session, None
+        if db is None:
+            return False
+        try:
+            if commit and not self.failed:
+                try:
+                    db.commit()
+                except Exception:
+                    self.failed = True
+                    raise
+                return True
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def complete(self, commit: bool = True) -> None:
+        """Commit (or roll back) and close the sync session"""
+        committed = False
+        try:
+            committed = self._complete_session(commit)
+        finally:
+            self._run_after_commit(committed or (commit and not self.failed))
+
+    async def complete_async(self, commit: bool = True) -> None:
+        """Commit (or roll back) and close both sessions
+
+        A failed commit marks the unit of work failed, so the other session
+        rolls back. Once either session has committed the rollback callbacks
+        no longer run: the after-commit ones do, for the data that is durable.
+        """
+        db, self._async_session = self._async_session, None
+        async_committed = sync_committed = False
+        try:
+            try:
+                if db is not None:
+                    try:
+                        if commit and not self.failed:
+                            try:
+                                await db.commit()
+                            except Exception:
+                                self.failed = True
+                                raise
+                            async_committed = True
+                        else:
+                            await db.rollback()
+                    finally:
+                        await db.close()
+            finally:
+                if self._session is not None:
+                    # Sync commit does blocking I/O, keep it off the event loop
+                    sync_committed = await run_in_threadpool(self._complete_session, commit)
+        finally:
+            self._run_after_commit(async_committed or sync_committed or (commit and not self.failed))
+
+
+_current_uow: ContextVar[Optional[UnitOfWork]] = ContextVar("current_uow", default=None)
 
 
 class DatabaseContext:
     """Context manager for database sessions"""
-    
+
+    @staticmethod
+    def current() -> Optional[UnitOfWork]:
+        """Return the active unit of work, if any"""
+        return _current_uow.get()
+
+    @staticmethod
+    def after_commit(callback: Callable[[], None]) -> None:
+        """
+        Run callback after the active unit of work commits, or right away when
+        there is none (every repository call has then already committed).
+        Used to keep in-process caches in step with committed data.
+        """
+        uow = _current_uow.get()
+        if uow is None:
+            callback()
+        else:
+            uow.after_commit(callback)
+
+    @staticmethod
+    def after_rollback(callback: Callable[[], None]) -> None:
+        """
+        Run callback if the active unit of work rolls back. Without one there
+        is nothing left to roll back, so the callback is dropped. Used to undo
+        side effects (files) of work that did not commit.
+        """
+        uow = _current_uow.get()
+        if uow is not None:
+            uow.after_rollback(callback)
+
     @staticmethod
     @contextmanager
     def get_session() -> Generator[Session, None, None]:
         """
         Context manager that provides a database session.
-        Automatically handles commit/rollback and cleanup.
+        Joins the active unit of work if there is one, otherwise
+        automatically handles commit/rollback and cleanup.
+        """
+        uow = _current_uow.get()
+        if uow is not None:
+            db = uow.session
+            try:
+                yield db
+            except SQLAlchemyError:
+                # A failed statement dooms the whole unit of work; reset the
+                # session so later reads in the same request keep working.
+                # Other exceptions are the caller's to handle or propagate.
+                uow.failed = True
+                db.rollback()
+                raise
+            return
+
+        db = SessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    @contextmanager
+    def get_standalone_session() -> Generator[Session, None, None]:
+        """
+        Session with its own transaction, never joined to the unit of work.
+        For bookkeeping of non-transactional side effects (e.g. files on disk)
+        that must persist even if the surrounding request rolls back.
         """
         db = SessionLocal()
         try:
@@ -27,7 +204,85 @@ class DatabaseContext:
             raise
         finally:
             db.close()
-    
+
+    @staticmethod
+    @asynccontextmanager
+    async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+        """
+        Async context manager that provides an AsyncSession.
+        Same commit/rollback semantics as get_session() without blocking the event loop.
+        """
+        uow = _current_uow.get()
+        if uow is not None:
+            db = uow.async_session
+            try:
+                yield db
+            except SQLAlchemyError:
+                uow.failed = True
+                await db.rollback()
+                raise
+            return
+
+        db = AsyncSessionLocal()
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+
+    @staticmethod
+    @contextmanager
+    def unit_of_work() -> Generator[UnitOfWork, None, None]:
+        """
+        Run a block in a single transaction.
+        Joins the active unit of work if there is one, otherwise opens
+        a new one that commits once at the end of the block.
+        """
+        uow = _current_uow.get()
+        if uow is not None:
+            try:
+                yield uow
+            except Exception:
+                # The block is all-or-nothing: the enclosing unit of work must not commit it
+                uow.failed = True
+                raise
+            return
+
+        uow = UnitOfWork()
+        token = _current_uow.set(uow)
+        try:
+            yield uow
+        except Exception:
+            uow.complete(commit=False)
+            raise
+        else:
+            uow.complete()
+        finally:
+            _current_uow.reset(token)
+
+    @staticmethod
+    @asynccontextmanager
+    async def request_scope() -> AsyncGenerator[UnitOfWork, None]:
+        """
+        Async unit of work bound to one HTTP request (see main.py).
+        Commits once when the request finishes, unless a repository call failed
+        or the caller marked the unit of work as failed.
+        """
+        uow = UnitOfWork()
+        token = _current_uow.set(uow)
+        try:
+            yield uow
+        except BaseException:
+            await uow.complete_async(commit=False)
+            raise
+        else:
+            await uow.complete_async()
+        finally:
+            _current_uow.reset(token)
+
     @staticmethod
     def execute_in_transaction(func, *args, **kwargs):
         """
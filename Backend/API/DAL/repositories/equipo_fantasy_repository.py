@@ -1,7 +1,7 @@
 """
 Repository for Equipos Fantasy (Fantasy Teams) data access operations
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, or_, func
@@ -10,6 +10,7 @@ from models.database_models import EquipoFantasyDB, EquipoFantasyAuditDB
 from models.equipo_fantasy import EquipoFantasyCreate, EquipoFantasyUpdate, EquipoFantasyFilter
 from DAL.repositories.base import BaseRepository
 from DAL.repositories.db_context import db_context
+from DAL.repositories.pagination import apply_keyset, build_page
 
 class EquipoFantasyRepository(BaseRepository[EquipoFantasyDB, EquipoFantasyCreate, EquipoFantasyUpdate]):
     
@@ -52,7 +53,15 @@ class EquipoFantasyRepository(BaseRepository[EquipoFantasyDB, EquipoFantasyCreat
         def query(db: Session):
             return db.query(EquipoFantasyDB).filter(
                 EquipoFantasyDB.liga_id == liga_id
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
+        return self._execute_query(query)
+    
+    def get_by_liga_page(self, liga_id: UUID, cursor: Optional[str] = None,
+                         limit: int = 100) -> Tuple[List[EquipoFantasyDB], Optional[str]]:
+        """Get one page of a league's fantasy teams after cursor; returns (items, next_cursor)"""
+        def query(db: Session):
+            q = db.query(EquipoFantasyDB).filter(EquipoFantasyDB.liga_id == liga_id)
+            return build_page(apply_keyset(q, self.sort_columns, cursor, limit).all(), self.sort_columns, limit)
         return self._execute_query(query)
     
     def get_by_usuario(self, usuario_id: UUID, skip: int = 0, limit: int = 100) -> List[EquipoFantasyDB]:
@@ -60,7 +69,7 @@ class EquipoFantasyRepository(BaseRepository[EquipoFantasyDB, EquipoFantasyCreat
         def query(db: Session):
             return db.query(EquipoFantasyDB).filter(
                 EquipoFantasyDB.usuario_id == usuario_id
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def search_with_filter(self, filtros: EquipoFantasyFilter, skip: int = 0, limit: int = 100) -> List[EquipoFantasyDB]:
@@ -78,7 +87,7 @@ class EquipoFantasyRepository(BaseRepository[EquipoFantasyDB, EquipoFantasyCreat
                 search_term = f"%{filtros.nombre.lower()}%"
                 q = q.filter(func.lower(EquipoFantasyDB.nombre).like(search_term))
             
-            return q.offset(skip).limit(limit).all()
+            return q.order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def count_by_liga(self,  liga_id: UUID) -> int:
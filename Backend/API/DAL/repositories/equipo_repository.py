@@ -1,12 +1,13 @@
 """
 Repository for NFL Equipo entity operations
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 
 from DAL.repositories.base import BaseRepository
+from DAL.repositories.async_base import AsyncBaseRepository
 from models.database_models import EquipoDB, MediaDB
 from models.equipo import EquipoNFLCreate, EquipoNFLUpdate
 
@@ -26,6 +27,17 @@ class EquipoNFLRepository(BaseRepository[EquipoDB, EquipoNFLCreate, EquipoNFLUpd
                 q = q.filter(EquipoDB.id != exclude_id)
             return q.first()
         return self._execute_query(query)
+    def get_by_nombres(self, nombres: Iterable[str]) -> Dict[str, EquipoDB]:
+        """Get several NFL teams by name in one query, keyed by lower-cased name"""
+        nombres_lower = {nombre.lower() for nombre in nombres if nombre}
+        if not nombres_lower:
+            return {}
+        def query(db: Session):
+            equipos = db.query(EquipoDB).filter(
+                func.lower(EquipoDB.nombre).in_(nombres_lower)
+            ).all()
+            return {equipo.nombre.lower(): equipo for equipo in equipos}
+        return self._execute_query(query)
     def list_all(self) -> List[EquipoDB]:
         """List all NFL teams"""
         def query(db: Session):
@@ -50,5 +62,13 @@ class EquipoNFLRepository(BaseRepository[EquipoDB, EquipoNFLCreate, EquipoNFLUpd
         return self._execute_query(query)
 
 
-# Create repository instance
+class AsyncEquipoNFLRepository(AsyncBaseRepository[EquipoDB, EquipoNFLCreate, EquipoNFLUpdate]):
+    """Async repository for NFL Team read operations"""
+    
+    def __init__(self):
+        super().__init__(EquipoDB)
+
+
+# Create repository instances
 equipo_repository = EquipoNFLRepository()
+async_equipo_repository = AsyncEquipoNFLRepository()
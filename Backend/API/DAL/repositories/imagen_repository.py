@@ -0,0 +1,97 @@
+"""
+Repository for content-addressed images (reference counting)
+"""
+from datetime import timedelta
+from typing import Callable, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from DAL.repositories.base import BaseRepository
+from DAL.repositories.db_context import db_context
+from models.database_models import ImagenDB
+
+class ImagenRepository(BaseRepository[ImagenDB, dict, dict]):
+    """Repository for Image reference counts
+    
+    Runs outside the request unit of work: the files these rows describe are
+    written/removed immediately, so their counts must be committed immediately too.
+    """
+    
+    def __init__(self):
+        super().__init__(ImagenDB)
+    
+    def _execute_query(self, query_func):
+        """Execute a query function in its own short transaction"""
+        with db_context.get_standalone_session() as db:
+            return query_func(db)
+    
+    def add_reference(self, hash: str, archivo: str, origen_url: Optional[str] = None) -> Tuple[int, str]:
+        """Insert the image or bump its reference count; returns (referencias, archivo)"""
+        def query(db: Session):
+            stmt = insert(self.model).values(
+                hash=hash, archivo=archivo, origen_url=origen_url, referencias=1
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[self.model.hash],
+                set_={
+                    "referencias": self.model.referencias + 1,
+                    "origen_url": stmt.excluded.origen_url if origen_url else self.model.origen_url,
+                    "descargado_en": func.now() if origen_url else self.model.descargado_en,
+                }
+            ).returning(self.model.referencias, self.model.archivo)
+            row = db.execute(stmt).one()
+            return row.referencias, row.archivo
+        return self._execute_query(query)
+    
+    def add_reference_by_origen(self, origen_url: str, max_age_seconds: float) -> Optional[Tuple[str, str]]:
+        """Bump the image downloaded from origen_url within max_age_seconds; returns (hash, archivo) or None
+
+        Older downloads are not reused, so an image that changed at its source
+        is fetched again (and stored under its new hash).
+        """
+        def query(db: Session):
+            latest = select(self.model.hash).where(
+                self.model.origen_url == origen_url,
+                self.model.descargado_en >= func.now() - timedelta(seconds=max_age_seconds),
+            ).order_by(self.model.descargado_en.desc()).limit(1).scalar_subquery()
+            row = db.execute(
+                update(self.model)
+                .where(self.model.hash == latest)
+                .values(referencias=self.model.referencias + 1)
+                .returning(self.model.hash, self.model.archivo)
+            ).first()
+            return (row.hash, row.archivo) if row else None
+        return self._execute_query(query)
+    
+    def release_reference(self, hash: str, on_last: Optional[Callable[[], None]] = None) -> Optional[int]:
+        """Drop one reference; deletes the row at zero. Returns remaining count, None if unknown
+
+        on_last (removing the files) runs when the count reaches zero, while the
+        row is still locked: a concurrent add_reference for the same hash waits
+        on that lock and, once this commits, inserts a fresh row and rewrites
+        the files instead of counting on files that are about to disappear.
+        """
+        def query(db: Session):
+            restantes = db.execute(
+                update(self.model)
+                .where(self.model.hash == hash, self.model.referencias > 0)
+                .values(referencias=self.model.referencias - 1)
+                .returning(self.model.referencias)
+            ).scalar()
+            if restantes == 0:
+                # Re-check under the row lock before touching the files
+                restantes = db.execute(
+                    select(self.model.referencias).where(self.model.hash == hash).with_for_update()
+                ).scalar()
+            if restantes == 0:
+                if on_last is not None:
+                    on_last()
+                db.execute(
+                    delete(self.model).where(self.model.hash == hash, self.model.referencias == 0)
+                )
+            return restantes
+        return self._execute_query(query)
+
+# Repository instance
+imagen_repository = ImagenRepository()
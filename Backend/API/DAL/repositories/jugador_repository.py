@@ -1,18 +1,54 @@
 """
 Repository for Jugadores (Players) entity operations
 """
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select, insert, tuple_
 
 from DAL.repositories.base import BaseRepository
+from DAL.repositories.async_base import AsyncBaseRepository
+from DAL.repositories.pagination import apply_keyset, build_page
+from DAL.repositories import text_search
 from models.database_models import JugadoresDB, PosicionJugadorEnum
 from models.jugador import JugadorCreate, JugadorUpdate, JugadorFilter
 
+# Players are browsed alphabetically; id breaks ties between equal names
+SORT_COLUMNS = (JugadoresDB.nombre, JugadoresDB.id)
+
+# Columns loaded into services/jugador_catalog.py (no ORM identity map overhead)
+CATALOG_COLUMNS = tuple(JugadoresDB.__table__.columns)
+
+def _apply_filters(query, filters: JugadorFilter):
+    """Apply JugadorFilter to an ORM Query or a select() statement"""
+    model = JugadoresDB
+    if filters.posicion:
+        query = query.filter(model.posicion == filters.posicion)
+    
+    if filters.equipo_id:
+        query = query.filter(model.equipo_id == filters.equipo_id)
+    
+    if filters.activo is not None:
+        query = query.filter(model.activo == filters.activo)
+    
+    if filters.nombre:
+        query = query.filter(text_search.contains(model.nombre, filters.nombre))
+    return query
+
+def _typeahead_query(term: str, limit: int, activo: Optional[bool]):
+    """Best matches for term: prefix, substring or fuzzy, ranked by similarity"""
+    condition, order_by = text_search.ranked_match(JugadoresDB.nombre, term)
+    query = select(JugadoresDB).filter(condition)
+    if activo is not None:
+        query = query.filter(JugadoresDB.activo == activo)
+    return query.order_by(*order_by, *SORT_COLUMNS).limit(limit)
+
 class JugadorRepository(BaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate]):
     """Repository for Player operations"""
     
+    sort_columns = SORT_COLUMNS
+    
     def __init__(self):
         super().__init__(JugadoresDB)
     
@@ -32,6 +68,30 @@ class JugadorRepository(BaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate
             return q.first()
         return self._execute_query(query)
     
+    def get_existing_nombre_equipo(self, pares: Iterable[Tuple[UUID, str]]) -> Set[Tuple[UUID, str]]:
+        """Return the (equipo_id, nombre) pairs that already exist, using a single query"""
+        pares = list(pares)
+        if not pares:
+            return set()
+        def query(db: Session):
+            rows = db.query(self.model.equipo_id, self.model.nombre).filter(
+                tuple_(self.model.equipo_id, self.model.nombre).in_(pares)
+            ).all()
+            return {(row.equipo_id, row.nombre) for row in rows}
+        return self._execute_query(query)
+    
+    def bulk_create(self, rows: List[dict]) -> List[UUID]:
+        """Insert many players with multi-row INSERT ... RETURNING (no per-row flush/refresh)"""
+        if not rows:
+            return []
+        def query(db: Session):
+            result = db.execute(
+                insert(self.model).returning(self.model.id, sort_by_parameter_order=True),
+                rows
+            )
+            return list(result.scalars().all())
+        return self._execute_query(query)
+    
     def get_with_equipo(self, jugador_id: UUID) -> Optional[JugadoresDB]:
         """Get player with NFL team information loaded"""
         def query(db: Session):
@@ -45,7 +105,7 @@ class JugadorRepository(BaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate
         def query(db: Session):
             return db.query(self.model).filter(
                 self.model.equipo_id == equipo_id
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def get_by_posicion(self, posicion: PosicionJugadorEnum, skip: int = 0, limit: int = 100) -> List[JugadoresDB]:
@@ -53,7 +113,7 @@ class JugadorRepository(BaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate
         def query(db: Session):
             return db.query(self.model).filter(
                 self.model.posicion == posicion
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def get_activos(self,  skip: int = 0, limit: int = 100) -> List[JugadoresDB]:
@@ -61,38 +121,40 @@ class JugadorRepository(BaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate
         def query(db: Session):
             return db.query(self.model).filter(
                 self.model.activo == True
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def search_by_nombre(self, nombre: str, skip: int = 0, limit: int = 100) -> List[JugadoresDB]:
-        """Search players by name (case insensitive partial match)"""
+        """Search players by name (case and accent insensitive partial match)"""
         def query(db: Session):
             return db.query(self.model).filter(
-                func.lower(self.model.nombre).contains(func.lower(nombre))
-            ).offset(skip).limit(limit).all()
+                text_search.contains(self.model.nombre, nombre)
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def get_with_filters(self, filters: JugadorFilter, skip: int = 0, limit: int = 100) -> List[JugadoresDB]:
         """Get players with multiple filters"""
         def query(db: Session):
-
-            complete_query = db.query(self.model)
-            
-            if filters.posicion:
-                complete_query = complete_query.filter(self.model.posicion == filters.posicion)
-            
-            if filters.equipo_id:
-                complete_query = complete_query.filter(self.model.equipo_id == filters.equipo_id)
-            
-            if filters.activo is not None:
-                complete_query = complete_query.filter(self.model.activo == filters.activo)
-            
-            if filters.nombre:
-                complete_query = complete_query.filter(
-                    func.lower(self.model.nombre).contains(func.lower(filters.nombre))
-                )
-            
-            return complete_query.offset(skip).limit(limit).all()
+            complete_query = _apply_filters(db.query(self.model), filters)
+            return complete_query.order_by(*self.sort_columns).offset(skip).limit(limit).all()
+        return self._execute_query(query)
+    
+    def get_with_filters_page(self, filters: JugadorFilter, cursor: Optional[str] = None,
+                              limit: int = 100) -> Tuple[List[JugadoresDB], Optional[str]]:
+        """Get one page of filtered players after cursor; returns (items, next_cursor)"""
+        def query(db: Session):
+            complete_query = _apply_filters(db.query(self.model), filters)
+            rows = apply_keyset(complete_query, self.sort_columns, cursor, limit).all()
+            return build_page(rows, self.sort_columns, limit)
+        return self._execute_query(query)
+    
+    def get_catalogo(self, ids: Optional[Iterable[UUID]] = None) -> list:
+        """All player rows (or only ids) as plain column rows, for the in-memory catalog"""
+        def query(db: Session):
+            stmt = select(*CATALOG_COLUMNS)
+            if ids is not None:
+                stmt = stmt.filter(self.model.id.in_(list(ids)))
+            return db.execute(stmt).all()
         return self._execute_query(query)
     
     def count_by_equipo(self, equipo_id: UUID) -> int:
@@ -115,7 +177,7 @@ class JugadorRepository(BaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate
                 EquipoDB, self.model.equipo_id == EquipoDB.id
             ).filter(
                 EquipoDB.liga_id == liga_id
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def get_by_usuario_id(self,  usuario_id: UUID, skip: int = 0, limit: int = 100) -> List[JugadoresDB]:
@@ -126,7 +188,7 @@ class JugadorRepository(BaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate
                 EquipoDB, self.model.equipo_id == EquipoDB.id
             ).filter(
                 EquipoDB.usuario_id == usuario_id
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     def get_by_email(self, email: str, exclude_id: Optional[UUID] = None) -> Optional[JugadoresDB]:
         """Get player by email"""
@@ -152,5 +214,78 @@ class JugadorRepository(BaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate
             return q.first()
         return self._execute_query(query)
 
-# Repository instance
-jugador_repository = JugadorRepository()
\ No newline at end of file
+class AsyncJugadorRepository(AsyncBaseRepository[JugadoresDB, JugadorCreate, JugadorUpdate]):
+    """Async repository for Player read operations"""
+    
+    sort_columns = SORT_COLUMNS
+    
+    def __init__(self):
+        super().__init__(JugadoresDB)
+    
+    async def get_with_equipo(self, jugador_id: UUID) -> Optional[JugadoresDB]:
+        """Get player with NFL team information loaded"""
+        async def query(db: AsyncSession):
+            result = await db.execute(
+                select(self.model).options(
+                    joinedload(self.model.equipo_nfl)
+                ).filter(self.model.id == jugador_id)
+            )
+            return result.scalars().first()
+        return await self._execute_query(query)
+    
+    async def get_by_equipo(self, equipo_id: UUID, skip: int = 0, limit: int = 100) -> List[JugadoresDB]:
+        """Get all players from a specific NFL team"""
+        async def query(db: AsyncSession):
+            result = await db.execute(
+                select(self.model).filter(
+                    self.model.equipo_id == equipo_id
+                ).order_by(*self.sort_columns).offset(skip).limit(limit)
+            )
+            return list(result.scalars().all())
+        return await self._execute_query(query)
+    
+    async def get_by_posicion(self, posicion: PosicionJugadorEnum, skip: int = 0, limit: int = 100) -> List[JugadoresDB]:
+        """Get all players by position"""
+        async def query(db: AsyncSession):
+            result = await db.execute(
+                select(self.model).filter(
+                    self.model.posicion == posicion
+                ).order_by(*self.sort_columns).offset(skip).limit(limit)
+            )
+            return list(result.scalars().all())
+        return await self._execute_query(query)
+    
+    async def get_with_filters(self, filters: JugadorFilter, skip: int = 0, limit: int = 100) -> List[JugadoresDB]:
+        """Get players with multiple filters"""
+        async def query(db: AsyncSession):
+            complete_query = _apply_filters(select(self.model), filters)
+            result = await db.execute(complete_query.order_by(*self.sort_columns).offset(skip).limit(limit))
+            return list(result.scalars().all())
+        return await self._execute_query(query)
+    
+    async def get_with_filters_page(self, filters: JugadorFilter, cursor: Optional[str] = None,
+                                    limit: int = 100) -> Tuple[List[JugadoresDB], Optional[str]]:
+        """Get one page of filtered players after cursor; returns (items, next_cursor)"""
+        async def query(db: AsyncSession):
+            complete_query = _apply_filters(select(self.model), filters)
+            result = await db.execute(apply_keyset(complete_query, self.sort_columns, cursor, limit))
+            return build_page(result.scalars().all(), self.sort_columns, limit)
+        return await self._execute_query(query)
+    
+    async def get_catalogo(self) -> list:
+        """All player rows as plain column rows, for the in-memory catalog"""
+        async def query(db: AsyncSession):
+            result = await db.execute(select(*CATALOG_COLUMNS))
+            return result.all()
+        return await self._execute_query(query)
+    
+    async def search_typeahead(self, term: str, limit: int = 10, activo: Optional[bool] = None) -> List[JugadoresDB]:
+        """Top matches for a search-box term, ranked by trigram similarity"""
+        async def query(db: AsyncSession):
+            result = await db.execute(_typeahead_query(term, limit, activo))
+            return list(result.scalars().all())
+        return await self._execute_query(query)
+
+# Repository instances
+jugador_repository = JugadorRepository()
+async_jugador_repository = AsyncJugadorRepository()
\ No newline at end of file
@@ -1,18 +1,92 @@
 """
 Repository for Liga entity operations
 """
-from typing import List, Optional, TYPE_CHECKING
+from typing import List, NamedTuple, Optional, Tuple, TYPE_CHECKING
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
 
 from DAL.repositories.base import BaseRepository
-from models.database_models import LigaDB, LigaMiembroDB, LigaCupoDB
+from DAL.repositories.async_base import AsyncBaseRepository
+from DAL.repositories.pagination import apply_keyset, build_page
+from models.database_models import LigaDB, LigaMiembroDB, LigaCupoDB, EquipoFantasyDB, TemporadaDB, RolMembresiaEnum
 from models.liga import LigaCreate, LigaUpdate, LigaMiembroCreate
 
 if TYPE_CHECKING:
     from models.liga import LigaFilter
 
+def _apply_filter(query, filtros: 'LigaFilter'):
+    """Apply LigaFilter to an ORM Query or a select() statement"""
+    if filtros.nombre:
+        query = query.filter(LigaDB.nombre.ilike(f"%{filtros.nombre}%"))
+    
+    if filtros.temporada_id:
+        query = query.filter(LigaDB.temporada_id == filtros.temporada_id)
+    
+    if filtros.estado:
+        query = query.filter(LigaDB.estado == filtros.estado)
+    return query
+
+class JoinPrecheck(NamedTuple):
+    """League row plus everything that can block a user from joining it (miembros_actuales from ligas_cupos)"""
+    liga: LigaDB
+    miembros_actuales: int
+    ya_es_miembro: bool
+    alias_ocupado: bool
+    nombre_equipo_ocupado: bool
+
+def _directorio_query():
+    """League summaries with season name, commissioner alias and capacity in one statement
+
+    Capacity comes from the ligas_cupos counters (one row per league), so no
+    member rows are counted; each join is a primary/unique key lookup.
+    """
+    comisionado = aliased(LigaMiembroDB)
+    miembros = func.coalesce(LigaCupoDB.miembros_actuales, 0)
+    return select(
+        LigaDB.id,
+        LigaDB.nombre,
+        LigaDB.descripcion,
+        LigaDB.estado,
+        LigaDB.temporada_id,
+        TemporadaDB.nombre.label("temporada_nombre"),
+        LigaDB.comisionado_id,
+        comisionado.alias.label("comisionado_alias"),
+        LigaDB.equipos_max,
+        miembros.label("miembros_actuales"),
+        func.greatest(LigaDB.equipos_max - miembros, 0).label("cupos_disponibles"),
+        (miembros >= LigaDB.equipos_max).label("esta_llena"),
+        LigaDB.creado_en,
+    ).join(
+        TemporadaDB, TemporadaDB.id == LigaDB.temporada_id
+    ).outerjoin(
+        LigaCupoDB, LigaCupoDB.liga_id == LigaDB.id
+    ).outerjoin(
+        comisionado,
+        and_(comisionado.liga_id == LigaDB.id, comisionado.rol == RolMembresiaEnum.Comisionado)
+    )
+
+def _manager_count_query():
+    """Manager members per league, as counted by ligas_cupos.miembros_actuales"""
+    return select(
+        LigaMiembroDB.liga_id, func.count().label("miembros")
+    ).where(LigaMiembroDB.rol == RolMembresiaEnum.Manager).group_by(LigaMiembroDB.liga_id)
+
+def _join_precheck_query(liga_id: UUID, usuario_id: UUID, alias: str, nombre_equipo: str):
+    miembro = LigaMiembroDB
+    return select(
+        LigaDB,
+        LigaCupoDB.miembros_actuales,
+        exists().where(miembro.liga_id == LigaDB.id, miembro.usuario_id == usuario_id).label("ya_es_miembro"),
+        exists().where(miembro.liga_id == LigaDB.id, miembro.alias == alias).label("alias_ocupado"),
+        exists().where(
+            EquipoFantasyDB.liga_id == LigaDB.id,
+            func.lower(EquipoFantasyDB.nombre) == func.lower(nombre_equipo)
+        ).label("nombre_equipo_ocupado"),
+    ).join(LigaCupoDB, LigaCupoDB.liga_id == LigaDB.id).where(LigaDB.id == liga_id)
+
 class LigaRepository(BaseRepository[LigaDB, LigaCreate, LigaUpdate]):
     """Repository for League operations"""
     
@@ -36,18 +110,34 @@ class LigaRepository(BaseRepository[LigaDB, LigaCreate, LigaUpdate]):
     def search_with_filter(self, filtros: 'LigaFilter', skip: int = 0, limit: int = 100) -> List[LigaDB]:
         """Search leagues with filters"""
         def query(db: Session):
-            q = db.query(self.model)
-            
-            if filtros.nombre:
-                q = q.filter(self.model.nombre.ilike(f"%{filtros.nombre}%"))
-            
-            if filtros.temporada_id:
-                q = q.filter(self.model.temporada_id == filtros.temporada_id)
-            
-            if filtros.estado:
-                q = q.filter(self.model.estado == filtros.estado)
-            
-            return q.offset(skip).limit(limit).all()
+            q = _apply_filter(db.query(self.model), filtros)
+            return q.order_by(*self.sort_columns).offset(skip).limit(limit).all()
+        return self._execute_query(query)
+    
+    def search_with_filter_page(self, filtros: 'LigaFilter', cursor: Optional[str] = None,
+                                limit: int = 100) -> Tuple[List[LigaDB], Optional[str]]:
+        """Search one page of leagues after cursor; returns (items, next_cursor)"""
+        def query(db: Session):
+            q = _apply_filter(db.query(self.model), filtros)
+            return build_page(apply_keyset(q, self.sort_columns, cursor, limit).all(), self.sort_columns, limit)
+        return self._execute_query(query)
+    
+    def get_join_precheck(self, liga_id: UUID, usuario_id: UUID, alias: str, nombre_equipo: str,
+                          lock: bool = False) -> Optional[JoinPrecheck]:
+        """League, member counter and join conflicts in a single query (None if the league does not exist)
+
+        With lock=True the league's ligas_cupos row is locked (FOR UPDATE, held
+        until the transaction ends), so concurrent joins to the same league are
+        serialized. PostgreSQL re-reads a locked row after waiting for it, so the
+        counter is current even if another join committed meanwhile; duplicate
+        memberships/aliases/names are also rejected by unique constraints.
+        """
+        def query(db: Session):
+            stmt = _join_precheck_query(liga_id, usuario_id, alias, nombre_equipo)
+            if lock:
+                stmt = stmt.with_for_update(of=LigaCupoDB)
+            row = db.execute(stmt).first()
+            return JoinPrecheck(*row) if row is not None else None
         return self._execute_query(query)
     
     def has_associated_ligas(self, temporada_id: UUID) -> bool:
@@ -119,7 +209,7 @@ class LigaMiembroRepository(BaseRepository[LigaMiembroDB, LigaMiembroCreate, Non
             miembro = db.query(LigaMiembroDB).filter(LigaMiembroDB.id == miembro_id).first()
             if miembro:
                 miembro.alias = nuevo_alias
-                db.commit()
+                db.flush()
                 db.refresh(miembro)
             return miembro
         return self._execute_query(query)
@@ -135,8 +225,88 @@ class LigaCupoRepository(BaseRepository[LigaCupoDB, dict, dict]):
         def query(db: Session):
             return db.query(self.model).filter(self.model.liga_id == liga_id).first()
         return self._execute_query(query)
+    
+    def get_capacidad(self, liga_id: UUID) -> Optional[Tuple[int, int]]:
+        """(equipos_max, miembros_actuales) of a league from its counter, or None if the league does not exist"""
+        def query(db: Session):
+            row = db.execute(
+                select(LigaDB.equipos_max, func.coalesce(self.model.miembros_actuales, 0))
+                .outerjoin(self.model, self.model.liga_id == LigaDB.id)
+                .where(LigaDB.id == liga_id)
+            ).first()
+            return (row[0], row[1]) if row is not None else None
+        return self._execute_query(query)
+    
+    def find_drift(self) -> List[Tuple[UUID, Optional[int], int]]:
+        """(liga_id, counter, actual Manager count) for every league whose counter is wrong or missing"""
+        def query(db: Session):
+            reales = _manager_count_query().subquery()
+            actual = func.coalesce(reales.c.miembros, 0)
+            rows = db.execute(
+                select(LigaDB.id, self.model.miembros_actuales, actual)
+                .outerjoin(self.model, self.model.liga_id == LigaDB.id)
+                .outerjoin(reales, reales.c.liga_id == LigaDB.id)
+                .where(self.model.miembros_actuales.is_distinct_from(actual))
+                .order_by(LigaDB.id)
+            ).all()
+            return [(row[0], row[1], row[2]) for row in rows]
+        return self._execute_query(query)
+    
+    def reconcile(self, liga_id: UUID) -> int:
+        """Recount a league's Manager members into its counter; returns the new value
+        
+        The counter row is locked before counting so joins/leaves committing in
+        between cannot be lost.
+        """
+        def query(db: Session):
+            db.execute(select(self.model.liga_id).where(self.model.liga_id == liga_id).with_for_update())
+            miembros = db.execute(
+                select(func.count()).where(
+                    LigaMiembroDB.liga_id == liga_id, LigaMiembroDB.rol == RolMembresiaEnum.Manager
+                )
+            ).scalar_one()
+            stmt = insert(self.model).values(liga_id=liga_id, miembros_actuales=miembros)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[self.model.liga_id],
+                set_={"miembros_actuales": stmt.excluded.miembros_actuales, "actualizado_en": func.now()}
+            ))
+            return miembros
+        return self._execute_query(query)
+
+class AsyncLigaRepository(AsyncBaseRepository[LigaDB, LigaCreate, LigaUpdate]):
+    """Async repository for League read operations"""
+    
+    def __init__(self):
+        super().__init__(LigaDB)
+    
+    async def search_with_filter(self, filtros: 'LigaFilter', skip: int = 0, limit: int = 100) -> List[LigaDB]:
+        """Search leagues with filters"""
+        async def query(db: AsyncSession):
+            q = _apply_filter(select(self.model), filtros)
+            result = await db.execute(q.order_by(*self.sort_columns).offset(skip).limit(limit))
+            return list(result.scalars().all())
+        return await self._execute_query(query)
+    
+    async def search_with_filter_page(self, filtros: 'LigaFilter', cursor: Optional[str] = None,
+                                      limit: int = 100) -> Tuple[List[LigaDB], Optional[str]]:
+        """Search one page of leagues after cursor; returns (items, next_cursor)"""
+        async def query(db: AsyncSession):
+            q = _apply_filter(select(self.model), filtros)
+            result = await db.execute(apply_keyset(q, self.sort_columns, cursor, limit))
+            return build_page(result.scalars().all(), self.sort_columns, limit)
+        return await self._execute_query(query)
+    
+    async def get_directorio_page(self, filtros: 'LigaFilter', cursor: Optional[str] = None,
+                                  limit: int = 100) -> Tuple[list, Optional[str]]:
+        """One page of league directory rows (see _directorio_query) after cursor; returns (rows, next_cursor)"""
+        async def query(db: AsyncSession):
+            q = _apply_filter(_directorio_query(), filtros)
+            result = await db.execute(apply_keyset(q, self.sort_columns, cursor, limit))
+            return build_page(result.all(), self.sort_columns, limit)
+        return await self._execute_query(query)
 
 # Repository instances
 liga_repository = LigaRepository()
+async_liga_repository = AsyncLigaRepository()
 liga_miembro_repository = LigaMiembroRepository()
 liga_cupo_repository = LigaCupoRepository()
\ No newline at end of file
@@ -34,13 +34,9 @@ class MediaRepository(BaseRepository[MediaDB, MediaCreate, MediaUpdate]):
         def query(db: Session):
             media = db.query(get_by_equipo(equipo_id))
             if media:
-                try:
-                    db.delete(media)
-                    db.commit()
-                    return True
-                except Exception:
-                    db.rollback()
-                    return False
+                db.delete(media)
+                db.flush()
+                return True
             return False
         return self._execute_query(query)
     
@@ -56,7 +52,7 @@ class MediaRepository(BaseRepository[MediaDB, MediaCreate, MediaUpdate]):
 
             for field, value in media_update.dict(exclude_unset=True).items():
                 setattr(media, field, value)
-            db.commit()
+            db.flush()
             db.refresh(media)
             return media
         return self._execute_query(query)
@@ -68,7 +64,7 @@ class MediaRepository(BaseRepository[MediaDB, MediaCreate, MediaUpdate]):
             media = self.get_by_equipo(db, equipo_id)
             if media:
                 db.delete(media)
-                db.commit()
+                db.flush()
                 return True
             return False
         return self._execute_query(query)
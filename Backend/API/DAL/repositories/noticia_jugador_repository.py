@@ -6,7 +6,6 @@ from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 
 from DAL.repositories.base import BaseRepository
-from DAL.repositories.db_context import db_context
 from models.database_models import NoticiaJugadorDB, UsuarioDB
 from models.jugador import NoticiaJugadorCreate
 
@@ -19,35 +18,41 @@ class NoticiaJugadorRepository(BaseRepository[NoticiaJugadorDB, NoticiaJugadorCr
     
     def get_by_jugador_id(self,  jugador_id: UUID, skip: int = 0, limit: int = 100) -> List[NoticiaJugadorDB]:
         """Get all news for a specific player, ordered by creation date (newest first)"""
-        return (
-            db_context.get_session().query(self.model)
-            .filter(self.model.jugador_id == jugador_id)
-            .order_by(self.model.creado_en.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        def query(db: Session):
+            return (
+                db.query(self.model)
+                .filter(self.model.jugador_id == jugador_id)
+                .order_by(self.model.creado_en.desc())
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        return self._execute_query(query)
     
     def get_with_author(self, noticia_id: UUID) -> Optional[NoticiaJugadorDB]:
         """Get a news item with author information"""
-        return (
-            db_context.get_session().query(self.model)
-            .options(joinedload(self.model.autor))
-            .filter(self.model.id == noticia_id)
-            .first()
-        )
+        def query(db: Session):
+            return (
+                db.query(self.model)
+                .options(joinedload(self.model.autor))
+                .filter(self.model.id == noticia_id)
+                .first()
+            )
+        return self._execute_query(query)
     
     def get_by_jugador_with_author(self, jugador_id: UUID, skip: int = 0, limit: int = 100) -> List[NoticiaJugadorDB]:
         """Get all news for a player with author information"""
-        return (
-            db_context.get_session().query(self.model)
-            .options(joinedload(self.model.autor))
-            .filter(self.model.jugador_id == jugador_id)
-            .order_by(self.model.creado_en.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        def query(db: Session):
+            return (
+                db.query(self.model)
+                .options(joinedload(self.model.autor))
+                .filter(self.model.jugador_id == jugador_id)
+                .order_by(self.model.creado_en.desc())
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        return self._execute_query(query)
     
     def get_recent_injury_news(self, days: int = 7, skip: int = 0, limit: int = 100) -> List[NoticiaJugadorDB]:
         """Get recent injury news from the last N days"""
@@ -55,18 +60,20 @@ class NoticiaJugadorRepository(BaseRepository[NoticiaJugadorDB, NoticiaJugadorCr
         
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        return (
-            db_context.get_session().query(self.model)
-            .options(joinedload(self.model.jugador))
-            .filter(
-                self.model.es_lesion == True,
-                self.model.creado_en >= cutoff_date
+        def query(db: Session):
+            return (
+                db.query(self.model)
+                .options(joinedload(self.model.jugador))
+                .filter(
+                    self.model.es_lesion == True,
+                    self.model.creado_en >= cutoff_date
+                )
+                .order_by(self.model.creado_en.desc())
+                .offset(skip)
+                .limit(limit)
+                .all()
             )
-            .order_by(self.model.creado_en.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        return self._execute_query(query)
     
     def create_with_author(self, jugador_id: UUID, obj_in: NoticiaJugadorCreate, author_id: UUID) -> NoticiaJugadorDB:
         """Create a new player news item with author"""
@@ -81,11 +88,12 @@ class NoticiaJugadorRepository(BaseRepository[NoticiaJugadorDB, NoticiaJugadorCr
             designacion=db_obj_data['designacion'],  # Pass as string
             creado_por=author_id
         )
-        with db_context.get_session() as db:
+        def query(db: Session):
             db.add(db_obj)
-            db.commit()
+            db.flush()
             db.refresh(db_obj)
-        return db_obj
+            return db_obj
+        return self._execute_query(query)
 
 
 # Create repository instance
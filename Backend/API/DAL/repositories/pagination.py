@@ -0,0 +1,97 @@
+"""
+Keyset (cursor) pagination helpers shared by sync and async repositories
+
+Pages are read with WHERE (k1, k2) > (:v1, :v2) ORDER BY k1, k2 LIMIT n+1
+over a stable, unique sort key, so every page costs the same no matter how
+deep it is (OFFSET has to walk and discard all previous rows). The cursor
+is the sort key of the last row returned, encoded as opaque base64 JSON.
+"""
+import base64
+import binascii
+import enum
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import inspect, tuple_
+
+from exceptions.business_exceptions import ValidationError
+
+QueryType = TypeVar('QueryType')
+
+
+def default_sort_columns(model) -> Tuple[Any, ...]:
+    """(creado_en, id) when the model has both, otherwise its primary key"""
+    if hasattr(model, 'creado_en') and hasattr(model, 'id'):
+        return (model.creado_en, model.id)
+    return tuple(getattr(model, column.key) for column in inspect(model).primary_key)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    if issubclass(python_type, enum.Enum):
+        return python_type(value)
+    return value
+
+
+def encode_cursor(row: Any, columns: Sequence[Any]) -> str:
+    """Opaque cursor pointing just after row"""
+    values = [_encode_value(getattr(row, column.key)) for column in columns]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Sort key values from a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("longitud incorrecta")
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise ValidationError("Cursor de paginación inválido")
+
+
+def apply_keyset(query: QueryType, columns: Sequence[Any], cursor: Optional[str], limit: int) -> QueryType:
+    """Order by the sort key, seek past the cursor and fetch one extra row to detect a next page
+
+    Works on both ORM Query objects and 2.0-style select() statements.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if len(columns) == 1:
+            query = query.filter(columns[0] > values[0])
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+    return query.order_by(*columns).limit(limit + 1)
+
+
+def build_page(rows: Sequence[Any], columns: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Split the limit+1 rows fetched by apply_keyset into (items, next_cursor)"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    items = rows[:limit]
+    return items, encode_cursor(items[-1], columns)
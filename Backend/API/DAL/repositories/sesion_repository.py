@@ -0,0 +1,97 @@
+"""
+Repository for login sessions shared across API workers
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, func, bindparam
+
+from DAL.repositories.base import BaseRepository
+from DAL.repositories.db_context import db_context
+from models.database_models import SesionDB
+
+class SesionRepository(BaseRepository[SesionDB, dict, dict]):
+    """Repository for Session operations
+
+    Runs outside the request unit of work: a login or logout must be visible
+    to the other workers immediately, whatever happens to the request.
+    """
+
+    def __init__(self):
+        super().__init__(SesionDB)
+
+    def _execute_query(self, query_func):
+        """Execute a query function in its own short transaction"""
+        with db_context.get_standalone_session() as db:
+            return query_func(db)
+
+    def crear(self, session_id: str, usuario_id: UUID, expira_en: datetime, ahora: datetime) -> None:
+        """Register a new session"""
+        def query(db: Session):
+            db.add(self.model(
+                session_id=session_id,
+                usuario_id=usuario_id,
+                creado_en=ahora,
+                expira_en=expira_en,
+                ultima_actividad=ahora,
+            ))
+        self._execute_query(query)
+
+    def get_by_session_id(self, session_id: str) -> Optional[SesionDB]:
+        """Primary key lookup"""
+        def query(db: Session):
+            return db.get(self.model, session_id)
+        return self._execute_query(query)
+
+    def touch_many(self, actividad: Dict[str, datetime]) -> None:
+        """Write back last activity for many sessions in one executemany round trip"""
+        if not actividad:
+            return
+        def query(db: Session):
+            stmt = (
+                update(self.model.__table__)
+                .where(self.model.session_id == bindparam("sid"))
+                .where(self.model.ultima_actividad < bindparam("ts"))
+                .values(ultima_actividad=bindparam("ts"))
+            )
+            db.execute(stmt, [{"sid": sid, "ts": ts} for sid, ts in actividad.items()])
+        self._execute_query(query)
+
+    def delete_by_session_id(self, session_id: str) -> bool:
+        def query(db: Session):
+            return db.execute(delete(self.model).where(self.model.session_id == session_id)).rowcount > 0
+        return self._execute_query(query)
+
+    def delete_by_usuario(self, usuario_id: UUID) -> List[str]:
+        """Remove every session of a user; returns the removed session ids"""
+        def query(db: Session):
+            return list(db.execute(
+                delete(self.model).where(self.model.usuario_id == usuario_id).returning(self.model.session_id)
+            ).scalars().all())
+        return self._execute_query(query)
+
+    def count_by_usuario(self, usuario_id: UUID, activas_desde: datetime, ahora: datetime) -> int:
+        """Sessions of a user that are neither expired nor past the inactivity window"""
+        def query(db: Session):
+            return db.execute(
+                select(func.count()).select_from(self.model).where(
+                    self.model.usuario_id == usuario_id,
+                    self.model.ultima_actividad >= activas_desde,
+                    self.model.expira_en > ahora,
+                )
+            ).scalar_one()
+        return self._execute_query(query)
+
+    def purge(self, activas_desde: datetime, ahora: datetime) -> int:
+        """Delete sessions past the inactivity window or their expiry"""
+        def query(db: Session):
+            return db.execute(
+                delete(self.model).where(
+                    (self.model.ultima_actividad < activas_desde) | (self.model.expira_en <= ahora)
+                )
+            ).rowcount
+        return self._execute_query(query)
+
+# Repository instance
+sesion_repository = SesionRepository()
@@ -4,13 +4,16 @@ Repository for Temporada entity operations
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, text
 from datetime import date
 
 from DAL.repositories.base import BaseRepository
 from models.database_models import TemporadaDB, TemporadaSemanaDB
 from models.temporada import TemporadaCreate, TemporadaUpdate
 
+# Postgres NOTIFY channel announcing season/week changes to every worker
+CALENDAR_CHANNEL = "temporada_calendar"
+
 class TemporadaRepository(BaseRepository[TemporadaDB, TemporadaCreate, TemporadaUpdate]):
     """Repository for Season operations"""
     
@@ -55,6 +58,13 @@ class TemporadaRepository(BaseRepository[TemporadaDB, TemporadaCreate, Temporada
             q.update({"es_actual": False})
             db.flush()
         self._execute_query(query)
+
+    def notify_calendar_changed(self) -> None:
+        """NOTIFY listeners that seasons or weeks changed (delivered when the transaction commits)"""
+        def query(db: Session):
+            db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": CALENDAR_CHANNEL})
+        self._execute_query(query)
+
     def get_overlapping_season(self, fecha_inicio: date, fecha_fin: date, exclude_id: Optional[UUID] = None) -> Optional[TemporadaDB]:
         """Get season that overlaps with given date range"""
         def query(db: Session):
@@ -140,6 +150,14 @@ class TemporadaSemanaRepository(BaseRepository[TemporadaSemanaDB, dict, dict]):
             return q.first()
         return self._execute_query(query)
 
+    def create_many(self, temporada_id: UUID, semanas: List[dict]) -> None:
+        """Insert all weeks of a season with a single multi-row INSERT"""
+        def query(db: Session):
+            db.execute(insert(TemporadaSemanaDB).values([
+                {**semana, "temporada_id": temporada_id} for semana in semanas
+            ]))
+        self._execute_query(query)
+
     def create_from_pydantic(self, semana_create) -> TemporadaSemanaDB:
         """Create a week from a Pydantic model"""
         def query(db: Session):
@@ -0,0 +1,64 @@
+"""
+Accent- and case-insensitive name search backed by pg_trgm GIN indexes
+
+Searches compare f_unaccent(lower(column)) against a term normalized the same
+way in Python. The expression must match the one in the index created by
+SQL_scripts/create_trigram_search_indexes.sql exactly, otherwise PostgreSQL
+falls back to a sequential scan.
+"""
+import unicodedata
+
+from sqlalchemy import func
+
+# Escape character for LIKE patterns built from user input
+LIKE_ESCAPE = "\\"
+
+
+def normalize(term: str) -> str:
+    """Lowercase and strip accents (Mbappé -> mbappe), mirroring f_unaccent(lower(...))"""
+    decomposed = unicodedata.normalize("NFKD", term.strip().lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def search_key(column):
+    """Indexed search expression for column"""
+    return func.f_unaccent(func.lower(column))
+
+
+def _escape_like(value: str) -> str:
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+
+
+def contains_pattern(term: str) -> str:
+    """LIKE pattern matching normalized term anywhere, with wildcards in term escaped"""
+    return f"%{_escape_like(normalize(term))}%"
+
+
+def contains(column, term: str):
+    """column contains term, ignoring case and accents (trigram index scan)"""
+    return search_key(column).like(contains_pattern(term), escape=LIKE_ESCAPE)
+
+
+def ranked_match(column, term: str):
+    """(filter, order_by) for typeahead: substring or fuzzy word match, best first
+
+    key %> term (word similarity above pg_trgm.word_similarity_threshold) also
+    catches typos such as "mahome" or "mahomse"; both conditions are served by
+    the GIN index. Prefix matches come first, then by word similarity.
+    """
+    key = search_key(column)
+    normalized = normalize(term)
+    condition = (
+        key.like(contains_pattern(term), escape=LIKE_ESCAPE)
+        | key.op("%>")(normalized)
+    )
+    order_by = (
+        key.like(f"{_escape_like(normalized)}%", escape=LIKE_ESCAPE).desc(),
+        func.word_similarity(normalized, key).desc(),
+        func.similarity(normalized, key).desc(),
+    )
+    return condition, order_by
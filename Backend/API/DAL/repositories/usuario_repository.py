@@ -1,20 +1,66 @@
 """
 Repository for Usuario entity operations
 """
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, select, func
 
 from DAL.repositories.base import BaseRepository
-from models.database_models import UsuarioDB
+from DAL.repositories.async_base import AsyncBaseRepository
+from DAL.repositories.pagination import apply_keyset, build_page
+from models.database_models import UsuarioDB, LigaMiembroDB, RolUsuarioEnum, EstadoUsuarioEnum
 from models.usuario import UsuarioCreate, UsuarioUpdate
 
 class UsuarioRepository(BaseRepository[UsuarioDB, UsuarioCreate, UsuarioUpdate]):
     """Repository for User operations"""
     
+    # Fields carried by the cached principal (see services/principal_service.py)
+    PRINCIPAL_FIELDS = frozenset({"rol", "estado"})
+    
     def __init__(self):
         super().__init__(UsuarioDB)
+        self._principal_listeners: List[Callable[[UUID], None]] = []
+    
+    def on_principal_change(self, callback: Callable[[UUID], None]) -> None:
+        """Register a callback run with the user id whenever rol/estado change"""
+        self._principal_listeners.append(callback)
+    
+    def _notify_principal_change(self, usuario_id: UUID) -> None:
+        for callback in self._principal_listeners:
+            callback(usuario_id)
+    
+    def update(self, db_obj: UsuarioDB, obj_in: UsuarioUpdate) -> UsuarioDB:
+        """Update a user, notifying listeners when rol/estado change"""
+        if isinstance(obj_in, dict):
+            campos = obj_in.keys()
+        elif hasattr(obj_in, 'model_dump'):
+            campos = obj_in.model_dump(exclude_unset=True).keys()
+        else:
+            campos = obj_in.dict(exclude_unset=True).keys()
+        usuario = super().update(db_obj, obj_in)
+        if self.PRINCIPAL_FIELDS.intersection(campos):
+            self._notify_principal_change(usuario.id)
+        return usuario
+    
+    def get_principal_data(self, usuario_id: UUID) -> Optional[Tuple[RolUsuarioEnum, EstadoUsuarioEnum, List[UUID]]]:
+        """Role/state columns plus league memberships of a user in one query"""
+        def query(db: Session):
+            row = db.execute(
+                select(
+                    self.model.rol,
+                    self.model.estado,
+                    func.array_agg(LigaMiembroDB.liga_id).label("ligas"),
+                )
+                .outerjoin(LigaMiembroDB, LigaMiembroDB.usuario_id == self.model.id)
+                .where(self.model.id == usuario_id)
+                .group_by(self.model.id)
+            ).first()
+            if row is None:
+                return None
+            return row.rol, row.estado, [liga_id for liga_id in row.ligas if liga_id is not None]
+        return self._execute_query(query)
     
     def get_by_correo(self, correo: str, exclude_id: Optional[UUID] = None) -> Optional[UsuarioDB]:
         """Get user by email"""
@@ -50,7 +96,7 @@ class UsuarioRepository(BaseRepository[UsuarioDB, UsuarioCreate, UsuarioUpdate])
         def query(db: Session):
             return db.query(self.model).filter(
                 self.model.estado == "activa"
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def get_by_rol(self, rol: str, skip: int = 0, limit: int = 100) -> List[UsuarioDB]:
@@ -58,7 +104,7 @@ class UsuarioRepository(BaseRepository[UsuarioDB, UsuarioCreate, UsuarioUpdate])
         def query(db: Session):
             return db.query(self.model).filter(
                 self.model.rol == rol
-            ).offset(skip).limit(limit).all()
+            ).order_by(*self.sort_columns).offset(skip).limit(limit).all()
         return self._execute_query(query)
     
     def search_by_name_or_alias(self, search_term: str, limit: int = 10) -> List[UsuarioDB]:
@@ -117,6 +163,34 @@ class UsuarioRepository(BaseRepository[UsuarioDB, UsuarioCreate, UsuarioUpdate])
                 usuario.estado = "bloqueado"
                 db.flush()
         self._execute_query(query)
+        self._notify_principal_change(usuario_id)
+
+class AsyncUsuarioRepository(AsyncBaseRepository[UsuarioDB, UsuarioCreate, UsuarioUpdate]):
+    """Async repository for User read operations"""
+    
+    def __init__(self):
+        super().__init__(UsuarioDB)
+    
+    async def get_activos_page(self, cursor: Optional[str] = None,
+                               limit: int = 100) -> Tuple[List[UsuarioDB], Optional[str]]:
+        """Get one page of active users after cursor; returns (items, next_cursor)"""
+        async def query(db: AsyncSession):
+            q = select(self.model).filter(self.model.estado == "activa")
+            result = await db.execute(apply_keyset(q, self.sort_columns, cursor, limit))
+            return build_page(result.scalars().all(), self.sort_columns, limit)
+        return await self._execute_query(query)
+    
+    async def get_activos(self, skip: int = 0, limit: int = 100) -> List[UsuarioDB]:
+        """Get active users only"""
+        async def query(db: AsyncSession):
+            result = await db.execute(
+                select(self.model).filter(
+                    self.model.estado == "activa"
+                ).order_by(*self.sort_columns).offset(skip).limit(limit)
+            )
+            return list(result.scalars().all())
+        return await self._execute_query(query)
 
-# Repository instance
-usuario_repository = UsuarioRepository()
\ No newline at end of file
+# Repository instances
+usuario_repository = UsuarioRepository()
+async_usuario_repository = AsyncUsuarioRepository()
\ No newline at end of file
@@ -31,4 +31,8 @@ class ConstraintViolationError(BusinessLogicError):
     def __init__(self, message: str, constraint_type: str = None, constraint_name: str = None):
         self.constraint_type = constraint_type
         self.constraint_name = constraint_name
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class ServiceUnavailableError(BusinessLogicError):
+    """Raised when the server is temporarily overloaded and the client should retry"""
+    pass
@@ -1,19 +1,30 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError, DataError, DatabaseError
 import traceback
+import time
 import os
 
-from routers import usuarios, equipos, media, ligas, temporadas, chatgpt, analytics, jugadores, equipos_fantasy
+from routers import usuarios, equipos, media, ligas, temporadas, chatgpt, analytics, jugadores, equipos_fantasy, images
 from routers.exception_handlers import create_business_exception_handlers
+from DAL.repositories.db_context import db_context
+from database import async_engine, pool_stats
 from services.constraint_error_service import constraint_error_service
+from services.auth_service import auth_service
+from services.password_hasher import password_hasher
+from services.jugador_catalog import jugador_catalog
+from services.temporada_calendar import temporada_calendar
+from services.response_cache import response_cache
 
 app = FastAPI(
     title="XNFL Fantasy API",
     description="API para la aplicación de Fantasy Football NFL",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson encodes responses that are not pre-serialized (see routers/serialization.py)
+    default_response_class=ORJSONResponse
 )
 
 # Configuración de CORS
@@ -31,6 +42,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# One unit of work (session + transaction) per request, shared by all repositories
+@app.middleware("http")
+async def db_unit_of_work(request: Request, call_next):
+    async with db_context.request_scope() as uow:
+        response = await call_next(request)
+        if response.status_code >= 500:
+            uow.failed = True
+    return response
+
+# Write back buffered session activity before the worker exits
+@app.on_event("shutdown")
+def flush_session_store():
+    auth_service.session_store.flush()
+
+# Season calendar changes made by other workers arrive through LISTEN/NOTIFY
+@app.on_event("startup")
+def start_temporada_calendar_listener():
+    temporada_calendar.start_listener()
+
+@app.on_event("shutdown")
+def stop_temporada_calendar_listener():
+    temporada_calendar.stop_listener()
+
 # Add business exception handlers
 create_business_exception_handlers(app)
 
@@ -81,6 +115,8 @@ app.include_router(temporadas.router, prefix="/api/temporadas", tags=["temporada
 app.include_router(chatgpt.router, prefix="/api/chatgpt", tags=["chatgpt"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 app.include_router(jugadores.router, prefix="/api/jugadores", tags=["jugadores"])
+# Image routes (ETag/304/Range) take precedence over the plain static mount below
+app.include_router(images.router, prefix="/imgs", tags=["imagenes"])
 
 # Mount static files for images
 # Ensure directories exist
@@ -97,4 +133,49 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "version": "1.0.0"}
\ No newline at end of file
+    return {"status": "healthy", "version": "1.0.0"}
+
+@app.get("/health/db")
+async def health_check_db():
+    """Database connectivity plus live connection pool statistics"""
+    start = time.perf_counter()
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        status_value, status_code = "healthy", 200
+    except Exception as e:
+        print(f"Database health check failed: {e}")
+        status_value, status_code = "unhealthy", 503
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "status": status_value,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+            "pools": pool_stats(),
+        }
+    )
+
+@app.get("/health/passwords")
+def health_check_passwords():
+    """Password hashing pool queue depth and rejections (back-pressure)"""
+    return password_hasher.stats()
+
+@app.get("/health/tokens")
+def health_check_tokens():
+    """Verified-token cache size and hit rate"""
+    return auth_service.token_cache.stats()
+
+@app.get("/health/jugadores-catalog")
+def health_check_jugadores_catalog():
+    """In-memory player catalog version, size and age"""
+    return jugador_catalog.stats()
+
+@app.get("/health/temporada-calendar")
+def health_check_temporada_calendar():
+    """Cached current-season calendar and LISTEN connection state"""
+    return temporada_calendar.stats()
+
+@app.get("/health/response-cache")
+def health_check_response_cache():
+    """Encoded list response cache size and hit rate"""
+    return response_cache.stats()
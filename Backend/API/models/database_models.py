@@ -61,6 +61,11 @@ class UsuarioDB(Base):
     ligas_miembros = relationship("LigaMiembroDB", back_populates="usuario")
     ligas_miembros_aud = relationship("LigaMiembroAudDB", back_populates="usuario")
 
+    __table_args__ = (
+        # get_activos / get_activos_page: estado = 'activa' ORDER BY creado_en, id
+        Index('idx_usuarios_activos_creado', 'creado_en', 'id', postgresql_where=text("estado = 'activa'")),
+    )
+
 class TemporadaDB(Base):
     __tablename__ = "temporadas"
     
@@ -141,7 +146,10 @@ class LigaDB(Base):
     __table_args__ = (
         CheckConstraint('equipos_max IN (4,6,8,10,12,14,16,18,20)', name='ck_equipos_max'),
         CheckConstraint('playoffs_equipos IN (4,6)', name='ck_playoffs_equipos'),
-        CheckConstraint('length(nombre) BETWEEN 1 AND 100', name='ck_nombre_liga_len')
+        CheckConstraint('length(nombre) BETWEEN 1 AND 100', name='ck_nombre_liga_len'),
+        # Listings and keyset pages ORDER BY creado_en, id (optionally per temporada)
+        Index('idx_ligas_creado', 'creado_en', 'id'),
+        Index('idx_ligas_temporada_creado', 'temporada_id', 'creado_en', 'id')
     )
 
 class LigaMiembroDB(Base):
@@ -161,7 +169,11 @@ class LigaMiembroDB(Base):
         UniqueConstraint('liga_id', 'alias', name='uq_alias_por_liga'),
         CheckConstraint('length(alias) BETWEEN 1 AND 50', name='ck_alias_len'),
         Index('uq_unico_comisionado_por_liga', 'liga_id', unique=True, 
-              postgresql_where=text("rol = 'Comisionado'"))
+              postgresql_where=text("rol = 'Comisionado'")),
+        # Manager counts (count_miembros_by_liga, ligas_cupos reconciliation): index-only
+        Index('idx_ligas_miembros_liga_managers', 'liga_id', postgresql_where=text("rol = 'Manager'")),
+        # Memberships of a user (get_principal_data); the PK only serves liga_id lookups
+        Index('idx_ligas_miembros_usuario', 'usuario_id', postgresql_include=['liga_id'])
     )
 
 class LigaMiembroAudDB(Base):
@@ -185,6 +197,7 @@ class LigaCupoDB(Base):
     __tablename__ = "ligas_cupos"
     
     liga_id = Column(PG_UUID(as_uuid=True), ForeignKey("ligas.id", ondelete="CASCADE"), primary_key=True)
+    # Manager members, kept current by triggers (SQL_scripts/create_ligas_cupos_counters.sql)
     miembros_actuales = Column(Integer, nullable=False, default=0)
     actualizado_en = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -221,11 +234,43 @@ class MediaDB(Base):
     # Relationships
     equipo = relationship("EquipoDB", back_populates="media")
 
+class ImagenDB(Base):
+    """Content-addressed image (file name derived from the sha256 of its bytes) with reference count"""
+    __tablename__ = "imagenes"
+
+    hash = Column(String(64), primary_key=True)
+    archivo = Column(String(100), nullable=False)  # file name in /imgs/pics (thumbnail: thumb_<archivo>)
+    referencias = Column(Integer, nullable=False, server_default=text("1"))
+    origen_url = Column(Text, nullable=True)
+    creado_en = Column(DateTime(timezone=True), server_default=func.now())
+    descargado_en = Column(DateTime(timezone=True), server_default=func.now())  # last download from origen_url
+
+    __table_args__ = (
+        CheckConstraint('referencias >= 0', name='ck_imagen_referencias'),
+        Index('idx_imagenes_origen_url', 'origen_url'),
+    )
+
+class SesionDB(Base):
+    """Active login session (SESSION_STORE=postgres), shared by every API worker"""
+    __tablename__ = "sesiones"
+
+    session_id = Column(String(36), primary_key=True)
+    usuario_id = Column(PG_UUID(as_uuid=True), ForeignKey("usuarios.id", ondelete="CASCADE"), nullable=False)
+    creado_en = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expira_en = Column(DateTime(timezone=True), nullable=False)
+    ultima_actividad = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_sesiones_usuario_id', 'usuario_id'),
+        Index('idx_sesiones_ultima_actividad', 'ultima_actividad'),
+    )
+
 class JugadoresDB(Base):
     __tablename__ = "jugadores"
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
-    nombre = Column(String(100), nullable=False)
+    # "C" collation: ORDER BY nombre is code point order, the order of the in-memory catalog
+    nombre = Column(String(100, collation="C"), nullable=False)
     posicion = Column(Enum(PosicionJugadorEnum), nullable=False)
     equipo_id = Column(PG_UUID(as_uuid=True), ForeignKey("equipos.id", ondelete="RESTRICT"), nullable=False)
     imagen_url = Column(Text, nullable=False)
@@ -239,7 +284,12 @@ class JugadoresDB(Base):
 
     __table_args__ = (
         UniqueConstraint('equipo_id', 'nombre', name='uq_jugador_por_equipo'),
-        CheckConstraint('length(nombre) BETWEEN 1 AND 100', name='ck_nombre_jugador_len')
+        CheckConstraint('length(nombre) BETWEEN 1 AND 100', name='ck_nombre_jugador_len'),
+        # get_with_filters and friends ORDER BY nombre, id; equipo_id filters use uq_jugador_por_equipo
+        Index('idx_jugadores_nombre', 'nombre', 'id'),
+        Index('idx_jugadores_posicion_nombre', 'posicion', 'nombre', 'id'),
+        Index('idx_jugadores_activos_nombre', 'nombre', 'id', postgresql_where=text('activo')),
+        Index('idx_jugadores_activos_posicion_nombre', 'posicion', 'nombre', 'id', postgresql_where=text('activo'))
     )
 
 class NoticiaJugadorDB(Base):
@@ -264,7 +314,11 @@ class NoticiaJugadorDB(Base):
         CheckConstraint(
             '(es_lesion = false AND resumen IS NULL AND designacion IS NULL) OR (es_lesion = true AND resumen IS NOT NULL AND designacion IS NOT NULL)',
             name='ck_lesion_campos_requeridos'
-        )
+        ),
+        # get_by_jugador_id: jugador_id ORDER BY creado_en DESC
+        Index('idx_noticias_jugadores_jugador_creado', jugador_id, creado_en.desc()),
+        # get_recent_injury_news: es_lesion AND creado_en >= cutoff ORDER BY creado_en DESC
+        Index('idx_noticias_jugadores_lesiones_creado', creado_en.desc(), postgresql_where=text('es_lesion'))
     )
 
 class EquipoFantasyDB(Base):
@@ -290,7 +344,14 @@ class EquipoFantasyDB(Base):
         CheckConstraint(
             "imagen_url IS NULL OR imagen_url ~ '\\.(jpg|jpeg|png)(\\?.*)?$'",
             name='ck_imagen_url_format'
-        )
+        ),
+        # get_by_liga_and_usuario / get_by_usuario_and_liga
+        Index('idx_equipos_fantasy_liga_usuario', 'liga_id', 'usuario_id'),
+        # get_by_liga(_page) and get_by_usuario ORDER BY creado_en, id
+        Index('idx_equipos_fantasy_liga_creado', 'liga_id', 'creado_en', 'id'),
+        Index('idx_equipos_fantasy_usuario_creado', 'usuario_id', 'creado_en', 'id'),
+        # exists_nombre_in_liga compares lower(nombre)
+        Index('idx_equipos_fantasy_liga_nombre_lower', liga_id, func.lower(nombre))
     )
 
 class EquipoFantasyAuditDB(Base):
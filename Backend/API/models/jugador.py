@@ -49,6 +49,7 @@ class JugadorResponse(JugadorBase):
     
     id: UUID = Field(..., description="ID único del jugador")
     creado_en: datetime = Field(..., description="Fecha de creación")
+    imagen_srcset: Optional[str] = Field(None, description="srcset con las versiones redimensionadas de la imagen (WebP)")
 
 # Extended response with team info
 class JugadorConEquipo(JugadorResponse):
@@ -61,6 +62,17 @@ class JugadorFilter(BaseModel):
     activo: Optional[bool] = Field(None, description="Filtrar por estado activo")
     nombre: Optional[str] = Field(None, description="Buscar por nombre (parcial)")
 
+# Lightweight result for the search box (typeahead)
+class JugadorSugerencia(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID = Field(..., description="ID único del jugador")
+    nombre: str = Field(..., description="Nombre del jugador")
+    posicion: PosicionJugadorEnum = Field(..., description="Posición del jugador")
+    equipo_id: UUID = Field(..., description="ID del equipo NFL")
+    thumbnail_url: Optional[str] = Field(None, description="URL del thumbnail del jugador")
+    activo: bool = Field(..., description="Si el jugador está activo")
+
 # Basic NFL team info to avoid circular imports
 class EquipoNFLResponseBasic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -115,6 +115,26 @@ class LigaConMiembros(LigaResponse):
     miembros: List[LigaMiembroResponse] = Field(default=[], description="Miembros de la liga")
 
 
+class LigaDirectorioItem(BaseModel):
+    """League directory row: summary plus season, commissioner and capacity"""
+    id: UUID = Field(..., description="ID único de la liga")
+    nombre: str = Field(..., description="Nombre de la liga")
+    descripcion: Optional[str] = Field(None, description="Descripción de la liga")
+    estado: EstadoLiga = Field(..., description="Estado de la liga")
+    temporada_id: UUID = Field(..., description="ID de la temporada")
+    temporada_nombre: str = Field(..., description="Nombre de la temporada")
+    comisionado_id: UUID = Field(..., description="ID del comisionado")
+    comisionado_alias: Optional[str] = Field(None, description="Alias del comisionado en la liga")
+    equipos_max: int = Field(..., description="Número máximo de equipos")
+    miembros_actuales: int = Field(..., description="Miembros (sin contar al comisionado)")
+    cupos_disponibles: int = Field(..., description="Cupos libres")
+    esta_llena: bool = Field(..., description="La liga no admite más miembros")
+    creado_en: datetime = Field(..., description="Fecha de creación")
+
+    class Config:
+        from_attributes = True
+
+
 class LigaFilter(BaseModel):
     """Filter for league search"""
     nombre: Optional[str] = Field(None, description="Buscar por nombre (parcial)")
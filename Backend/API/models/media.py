@@ -25,4 +25,4 @@ class Media(MediaInDB):
 
 class MediaResponse(MediaInDB):
     """Modelo de respuesta para media"""
-    pass
\ No newline at end of file
+    srcset: Optional[str] = Field(None, description="srcset con las versiones redimensionadas de la imagen (WebP)")
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""
+Pydantic model for cursor-paginated responses
+"""
+from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+class Pagina(BaseModel, Generic[T]):
+    """One page of results; pass next_cursor back as ?cursor= to get the next one"""
+    items: List[T] = Field(..., description="Elementos de la página")
+    next_cursor: Optional[str] = Field(None, description="Cursor de la página siguiente (null si no hay más)")
@@ -69,5 +69,9 @@ class TemporadaSemanaResponse(TemporadaSemanaInDB):
     pass
 
 
+class TemporadaConSemanasCreate(TemporadaCreate):
+    semanas_detalle: List[TemporadaSemanaBase] = Field(..., min_length=1, max_length=18, description="Semanas de la temporada")
+
+
 class TemporadaConSemanas(TemporadaResponse):
     semanas_detalle: List[TemporadaSemanaResponse] = Field(default=[], description="Detalle de semanas")
\ No newline at end of file
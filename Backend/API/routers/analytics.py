@@ -10,9 +10,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel
 
 from services.analytics_service import analytics_service
+from routers.serialization import FastModelRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=FastModelRoute)
 
 
 # --- Request/Response Models ---
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Dict, Any
+from uuid import UUID
 from services.auth_service import auth_service, ACCESS_TOKEN_EXPIRE_HOURS
+from services.principal_service import Principal, principal_service
 
 # Configuración de seguridad HTTP Bearer
 security = HTTPBearer()
@@ -21,20 +23,29 @@ class LoginResponse(BaseModel):
     message: str
     redirect_url: str = "/profile"
 
+def _authenticate(token: str) -> Principal:
+    """Verificar el token y resolver el principal (puede consultar la base de datos)"""
+    payload = auth_service.verify_token(token)
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise ValueError("Token inválido")
+    try:
+        usuario_id = UUID(str(user_id))
+    except ValueError:
+        raise ValueError("Token inválido")
+    principal = principal_service.get_principal(usuario_id, payload.get("session_id"))
+    if principal is None:
+        raise ValueError("Token inválido")
+    return principal
+
 # Dependency para obtener usuario actual
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
-    """Dependency para obtener el usuario actual desde el token JWT"""
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Principal:
+    """Dependency para obtener el usuario actual (id, rol, estado y ligas) desde el token JWT"""
     token = credentials.credentials
     
     try:
-        payload = auth_service.verify_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token inválido"
-            )
-        return {"user_id": user_id, "session_id": payload.get("session_id")}
+        # The session store and principal cache may hit the database; keep them off the event loop
+        return await run_in_threadpool(_authenticate, token)
     
     except ValueError as e:
         error_msg = str(e)
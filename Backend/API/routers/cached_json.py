@@ -0,0 +1,48 @@
+"""
+Serve list endpoints from services/response_cache.py
+
+Hits return the stored JSON bytes directly (no service call, no response_model
+validation); a matching If-None-Match gets 304 with no body.
+"""
+import inspect
+from typing import Any, Awaitable, Callable, Hashable, Union
+
+from fastapi import Request, Response, status
+
+from services.response_cache import CachedResponse, response_cache, to_jsonable
+
+
+def etag_matches(header_value: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    if header_value.strip() == '*':
+        return True
+    for tag in header_value.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def json_response(request: Request, entry: CachedResponse) -> Response:
+    """200 with the cached body, or 304 when the client already has it"""
+    # no-cache: clients may store the body but must revalidate with the ETag
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+async def cached_json(request: Request, namespace: str, key: Hashable,
+                      build: Callable[[], Union[Any, Awaitable[Any]]]) -> Response:
+    """Response for key from the cache, calling build() (sync or async) on a miss"""
+    entry = response_cache.get(namespace, key)
+    if entry is None:
+        generation = response_cache.generation(namespace)
+        data = build()
+        if inspect.isawaitable(data):
+            data = await data
+        entry = response_cache.put(namespace, key, to_jsonable(data), generation)
+    return json_response(request, entry)
@@ -10,9 +10,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
 from services.chatgpt_service import chatgpt_service
+from routers.serialization import FastModelRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=FastModelRoute)
 
 
 # --- Request/Response Models ---
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from typing import List
 from uuid import UUID
 from models.equipo import EquipoNFLCreate, EquipoNFLUpdate, EquipoNFLResponse, EquipoNFLConMedia
 from services.equipo_service import equipo_service
+from routers.cached_json import cached_json
 from database import get_db
+from routers.serialization import FastModelRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastModelRoute)
 
 @router.post("/", response_model=EquipoNFLResponse, status_code=status.HTTP_201_CREATED)
 async def crear_equipo_nfl(equipo: EquipoNFLCreate):
@@ -13,9 +15,9 @@ async def crear_equipo_nfl(equipo: EquipoNFLCreate):
     return equipo_service.crear_equipo(equipo)
 
 @router.get("/", response_model=List[EquipoNFLResponse])
-async def obtener_equipos_nfl():
+async def obtener_equipos_nfl(request: Request):
     """Obtener todos los equipos NFL"""
-    return equipo_service.listar()
+    return await cached_json(request, "equipos", "listar", equipo_service.listar)
 
 @router.get("/{equipo_id}", response_model=EquipoNFLResponse)
 async def obtener_equipo_nfl(equipo_id: UUID):
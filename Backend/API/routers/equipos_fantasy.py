@@ -1,7 +1,7 @@
 """
 FastAPI router for Equipos Fantasy (Fantasy Teams) endpoints
 """
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 
@@ -12,14 +12,16 @@ from models.equipo_fantasy import (
 )
 from services.equipo_fantasy_service import equipo_fantasy_service
 from routers.auth import get_current_user
-from models.database_models import UsuarioDB
+from services.principal_service import Principal
+from models.pagination import Pagina
+from routers.serialization import FastModelRoute
 
-router = APIRouter(prefix="/equipos-fantasy", tags=["equipos-fantasy"])
+router = APIRouter(prefix="/equipos-fantasy", tags=["equipos-fantasy"], route_class=FastModelRoute)
 
 @router.post("/", response_model=EquipoFantasyResponse, status_code=status.HTTP_201_CREATED)
 async def crear_equipo_fantasy(
     equipo: EquipoFantasyCreate,
-    current_user: UsuarioDB = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Crear un nuevo equipo fantasy.
@@ -43,7 +45,7 @@ async def obtener_equipo_fantasy(
 async def actualizar_equipo_fantasy(
     equipo_id: UUID,
     equipo_update: EquipoFantasyUpdate,
-    current_user: UsuarioDB = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Actualizar equipo fantasy (solo nombre e imagen).
@@ -56,7 +58,7 @@ async def actualizar_equipo_fantasy(
 @router.delete("/{equipo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def eliminar_equipo_fantasy(
     equipo_id: UUID,
-    current_user: UsuarioDB = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Eliminar equipo fantasy. Solo el propietario puede eliminarlo."""
     equipo_fantasy_service.eliminar_equipo_fantasy(equipo_id, current_user.id)
@@ -86,6 +88,15 @@ async def listar_equipos_por_liga(
     """Listar todos los equipos fantasy de una liga específica"""
     return equipo_fantasy_service.listar_equipos_por_liga(liga_id, skip, limit)
 
+@router.get("/liga/{liga_id}/pagina", response_model=Pagina[EquipoFantasyResponse])
+async def paginar_equipos_por_liga(
+    liga_id: UUID,
+    cursor: Optional[str] = Query(None, description="Cursor devuelto como next_cursor por la página anterior"),
+    limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
+):
+    """Listar los equipos fantasy de una liga con paginación por cursor"""
+    return equipo_fantasy_service.listar_equipos_por_liga_pagina(liga_id, cursor, limit)
+
 @router.get("/usuario/{usuario_id}", response_model=List[EquipoFantasyResponse])
 async def listar_equipos_por_usuario(
     usuario_id: UUID,
@@ -9,6 +9,7 @@ from exceptions.business_exceptions import (
     NotFoundError, 
     ForeignKeyError, 
     ConstraintViolationError,
+    ServiceUnavailableError,
     BusinessLogicError
 )
 
@@ -55,6 +56,14 @@ def create_business_exception_handlers(app):
             }
         )
     
+    @app.exception_handler(ServiceUnavailableError)
+    async def service_unavailable_error_handler(request: Request, exc: ServiceUnavailableError):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": exc.message, "error_code": exc.error_code},
+            headers={"Retry-After": "1"}
+        )
+    
     @app.exception_handler(BusinessLogicError)
     async def business_logic_error_handler(request: Request, exc: BusinessLogicError):
         return JSONResponse(
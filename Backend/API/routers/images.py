@@ -1,148 +1,265 @@
 """
-Router for serving images (pictures and thumbnails)
+Router for serving images (pictures, thumbnails and responsive renditions)
+
+Files are streamed from disk (never read fully into memory) with strong ETags
+derived from the file content, conditional GET (304) and single byte-range support.
 """
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, HTTPException, Path, Request
 from fastapi.responses import FileResponse, Response
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Tuple
+import anyio
+import hashlib
 import os
+import re
+import stat
 from pathlib import Path as PathLib
 
-router = APIRouter()
+from DAL.file_storage.resize_service import image_resize_service
+from routers.cached_json import etag_matches
+from routers.serialization import FastModelRoute
+
+router = APIRouter(route_class=FastModelRoute)
 
 # Base directories for image storage
 PICS_DIR = "/app/imgs/pics"
 THUMBNAILS_DIR = "/app/imgs/thumbnails"
+RENDITIONS_DIR = "/app/imgs/renditions"
+
+CONTENT_TYPE_MAP = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.avif': 'image/avif',
+}
+
+# Stored names are UUIDs or content hashes and never reused, so clients may cache forever
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_SHA256_NAME = re.compile(r'^([0-9a-f]{64})\.\w+$')
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+@lru_cache(maxsize=4096)
+def _file_digest(file_path: str, mtime_ns: int, size: int) -> str:
+    """sha256 of a file; keyed by mtime/size so a rewritten file gets a new digest"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def _strong_etag(file_path: str, filename: str, stat_result: os.stat_result, hash_named: bool) -> str:
+    """Strong ETag from the content hash (free for content-addressed originals)"""
+    match = _SHA256_NAME.match(filename) if hash_named else None
+    if match:
+        return f'"{match.group(1)}"'
+    digest = await run_in_threadpool(_file_digest, file_path, stat_result.st_mtime_ns, stat_result.st_size)
+    return f'"{digest}"'
+
+
+def _not_modified(request: Request, etag: str, stat_result: os.stat_result) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            return int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _parse_range(header_value: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single 'bytes=' range into inclusive (start, end).
+    Returns None when the header should be ignored (multi-range, other units);
+    raises ValueError when the range is unsatisfiable.
+    """
+    match = _RANGE.match(header_value.strip())
+    if not match:
+        return None
+    start_str, end_str = match.groups()
+    if not start_str and not end_str:
+        return None
+    if not start_str:
+        # Suffix range: last N bytes
+        length = int(end_str)
+        if length == 0:
+            raise ValueError("Rango no satisfacible")
+        return max(size - length, 0), size - 1
+    start = int(start_str)
+    end = min(int(end_str), size - 1) if end_str else size - 1
+    if start >= size or start > end:
+        raise ValueError("Rango no satisfacible")
+    return start, end
+
+
+class _RangeFileResponse(FileResponse):
+    """FileResponse that streams only bytes [start, end] of the file"""
+
+    def __init__(self, path: str, start: int, end: int, **kwargs):
+        self.start = start
+        self.end = end
+        super().__init__(path, status_code=206, **kwargs)
+        self.headers['content-length'] = str(end - start + 1)
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.end - self.start + 1
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                # File shrank underneath us; close the body
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def _serve_image(request: Request, directory: str, filename: str, not_found_detail: str,
+                       hash_named: bool = False) -> Response:
+    """Stream an image with ETag/Last-Modified, conditional GET and Range support"""
+    # Only plain file names inside the directory are served
+    if filename != os.path.basename(filename) or filename in ('', '.', '..'):
+        raise HTTPException(status_code=400, detail="Ruta inválida")
+    file_path = os.path.join(directory, filename)
+
+    try:
+        stat_result = await run_in_threadpool(os.stat, file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=400, detail="Ruta inválida")
+
+    etag = await _strong_etag(file_path, filename, stat_result, hash_named)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': formatdate(stat_result.st_mtime, usegmt=True),
+        'Cache-Control': CACHE_CONTROL,
+        'Accept-Ranges': 'bytes',
+    }
+
+    if _not_modified(request, etag, stat_result):
+        return Response(status_code=304, headers=headers)
+
+    content_type = CONTENT_TYPE_MAP.get(PathLib(filename).suffix.lower(), 'image/jpeg')
+    headers['Content-Disposition'] = f'inline; filename="{filename}"'
+
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, stat_result.st_size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, 'Content-Range': f'bytes */{stat_result.st_size}'}
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            headers['Content-Range'] = f'bytes {start}-{end}/{stat_result.st_size}'
+            return _RangeFileResponse(
+                file_path, start, end,
+                headers=headers,
+                media_type=content_type,
+                stat_result=stat_result,
+                method=request.method,
+            )
+
+    return FileResponse(
+        file_path,
+        headers=headers,
+        media_type=content_type,
+        stat_result=stat_result,
+        method=request.method,
+    )
+
 
 @router.get("/pics/{filename}")
-async def get_picture(filename: str = Path(..., description="Nombre del archivo de imagen")):
+async def get_picture(request: Request, filename: str = Path(..., description="Nombre del archivo de imagen")):
     """
     Obtener una imagen en formato binario.
-    
+
     Args:
         filename: Nombre del archivo de imagen
-        
+
     Returns:
         Datos binarios de la imagen con el content-type apropiado
     """
-    file_path = os.path.join(PICS_DIR, filename)
-    
-    # Validate file exists
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Imagen no encontrada")
-    
-    # Validate it's actually a file (not a directory)
-    if not os.path.isfile(file_path):
-        raise HTTPException(status_code=400, detail="Ruta inválida")
-    
-    # Get file extension to determine content type
-    ext = PathLib(filename).suffix.lower()
-    content_type_map = {
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.webp': 'image/webp'
-    }
-    
-    content_type = content_type_map.get(ext, 'image/jpeg')
-    
-    # Read file and return binary data
-    try:
-        with open(file_path, 'rb') as f:
-            image_data = f.read()
-        
-        return Response(
-            content=image_data,
-            media_type=content_type,
-            headers={
-                'Cache-Control': 'public, max-age=31536000',  # Cache for 1 year
-                'Content-Disposition': f'inline; filename="{filename}"'
-            }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error al leer la imagen: {str(e)}")
+    # Content-addressed originals are named after the sha256 of their bytes
+    return await _serve_image(request, PICS_DIR, filename, "Imagen no encontrada", hash_named=True)
 
 
 @router.get("/thumbnails/{filename}")
-async def get_thumbnail(filename: str = Path(..., description="Nombre del archivo de thumbnail")):
+async def get_thumbnail(request: Request, filename: str = Path(..., description="Nombre del archivo de thumbnail")):
     """
     Obtener un thumbnail en formato binario.
-    
+
     Args:
         filename: Nombre del archivo de thumbnail (debe incluir 'thumb_' prefix)
-        
+
     Returns:
         Datos binarios del thumbnail con el content-type apropiado
     """
-    file_path = os.path.join(THUMBNAILS_DIR, filename)
-    
-    # Validate file exists
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Thumbnail no encontrado")
-    
-    # Validate it's actually a file (not a directory)
-    if not os.path.isfile(file_path):
-        raise HTTPException(status_code=400, detail="Ruta inválida")
-    
-    # Get file extension to determine content type
-    ext = PathLib(filename).suffix.lower()
-    content_type_map = {
-        '.jpg': 'image/jpeg',
-        '.jpeg': 'image/jpeg',
-        '.png': 'image/png',
-        '.gif': 'image/gif',
-        '.webp': 'image/webp'
-    }
-    
-    content_type = content_type_map.get(ext, 'image/jpeg')
-    
-    # Read file and return binary data
-    try:
-        with open(file_path, 'rb') as f:
-            image_data = f.read()
-        
-        return Response(
-            content=image_data,
-            media_type=content_type,
-            headers={
-                'Cache-Control': 'public, max-age=31536000',  # Cache for 1 year
-                'Content-Disposition': f'inline; filename="{filename}"'
-            }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error al leer el thumbnail: {str(e)}")
-
-
-@router.get("/list-pics")
-async def list_pictures():
+    return await _serve_image(request, THUMBNAILS_DIR, filename, "Thumbnail no encontrado")
+
+
+@router.get("/renditions/{width}/{filename}")
+async def get_rendition(
+    request: Request,
+    width: int = Path(..., gt=0, description="Ancho de la variante en píxeles"),
+    filename: str = Path(..., description="Nombre del archivo (<nombre>.webp o <nombre>.avif)")
+):
     """
-    Listar todas las imágenes disponibles (útil para desarrollo/debug).
-    
+    Obtener una variante responsive (WebP/AVIF) de una imagen.
+
     Returns:
-        Lista de nombres de archivos de imágenes
+        Datos binarios de la variante con el content-type apropiado
     """
-    try:
-        if not os.path.exists(PICS_DIR):
-            return {"images": []}
-        
-        files = [f for f in os.listdir(PICS_DIR) if os.path.isfile(os.path.join(PICS_DIR, f))]
-        return {"images": files, "count": len(files)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error al listar imágenes: {str(e)}")
+    return await _serve_image(request, os.path.join(RENDITIONS_DIR, str(width)), filename, "Variante no encontrada")
 
 
-@router.get("/list-thumbnails")
-async def list_thumbnails():
+@router.get("/resize/{width}x{height}/{filename}")
+async def get_resized_picture(
+    request: Request,
+    width: int = Path(..., description="Ancho máximo en píxeles"),
+    height: int = Path(..., description="Alto máximo en píxeles"),
+    filename: str = Path(..., description="Nombre del archivo de imagen original")
+):
     """
-    Listar todos los thumbnails disponibles (útil para desarrollo/debug).
-    
+    Obtener una imagen redimensionada (WebP) que cabe en width x height.
+    Se genera bajo demanda y queda en caché en disco.
+
     Returns:
-        Lista de nombres de archivos de thumbnails
+        Datos binarios de la imagen redimensionada
     """
     try:
-        if not os.path.exists(THUMBNAILS_DIR):
-            return {"thumbnails": []}
-        
-        files = [f for f in os.listdir(THUMBNAILS_DIR) if os.path.isfile(os.path.join(THUMBNAILS_DIR, f))]
-        return {"thumbnails": files, "count": len(files)}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error al listar thumbnails: {str(e)}")
+        path = await image_resize_service.get_resized(filename, width, height)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Imagen no encontrada")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await _serve_image(request, os.path.dirname(path), os.path.basename(path), "Imagen no encontrada")
+
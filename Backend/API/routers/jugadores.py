@@ -1,7 +1,8 @@
 """
 API Router for Jugadores (Players) endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 from uuid import UUID
 import os
@@ -10,16 +11,22 @@ from datetime import datetime
 
 from models.jugador import (
     JugadorResponse, JugadorCreate, JugadorUpdate, JugadorConEquipo, 
-    JugadorFilter, JugadorBulkRequest, JugadorBulkResult,
+    JugadorFilter, JugadorBulkRequest, JugadorBulkResult, JugadorSugerencia,
     NoticiaJugadorCreate, NoticiaJugadorResponse, NoticiaJugadorConAutor
 )
 from models.database_models import PosicionJugadorEnum
+from models.pagination import Pagina
 from services.jugador_service import jugador_service
+from DAL.repositories.db_context import db_context
+from services.jugador_catalog import jugador_catalog
+from routers.cached_json import cached_json
 from services.noticia_jugador_service import noticia_jugador_service
 from routers.auth import get_current_user
+from services.principal_service import Principal
 from database import get_db
+from routers.serialization import FastModelRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastModelRoute)
 
 @router.post("/", response_model=JugadorResponse, status_code=status.HTTP_201_CREATED)
 async def crear_jugador(jugador: JugadorCreate):
@@ -27,6 +34,25 @@ async def crear_jugador(jugador: JugadorCreate):
     Crear un nuevo jugador.
     """
     return jugador_service.create(jugador)
+
+def _processed_upload_path(uploaded_file_path: str, timestamp: str, base_name: str, success: bool) -> str:
+    status_label = 'success' if success else 'error'
+    return os.path.join(os.path.dirname(uploaded_file_path), f"{timestamp}_{status_label}_{base_name}.json")
+
+def _move_upload(uploaded_file_path: str, final_path: str) -> None:
+    """Rename a bulk upload to its final name (never raises: runs as an after-commit/rollback hook)"""
+    try:
+        if not os.path.exists(uploaded_file_path):
+            return
+        # Overwrite if exists
+        if os.path.exists(final_path):
+            os.remove(final_path)
+        os.replace(uploaded_file_path, final_path)
+    except Exception as e:
+        print(f"[DEBUG] Error renaming file: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
 @router.post("/bulk", response_model=JugadorBulkResult, status_code=status.HTTP_201_CREATED)
 async def crear_jugadores_bulk(
     request: JugadorBulkRequest
@@ -85,36 +111,27 @@ async def crear_jugadores_bulk(
             detail={"message": "No se pudo guardar el archivo entrante", "error": str(e)}
         )
 
-    result = jugador_service.crear_jugadores_bulk(request.jugadores, request.filename)
-
-    try:
-        if uploaded_file_path and os.path.exists(uploaded_file_path):
-            status_label = 'success' if getattr(result, 'success', False) else 'error'
-            final_filename = f"{timestamp}_{status_label}_{base_name}.json"
-            final_path = os.path.join(os.path.dirname(uploaded_file_path), final_filename)
-            
-            print(f"[DEBUG] Renaming from: {uploaded_file_path}")
-            print(f"[DEBUG] Renaming to: {final_path}")
-            
-            # Overwrite if exists
-            if os.path.exists(final_path):
-                os.remove(final_path)
-            os.replace(uploaded_file_path, final_path)
-            
-            print(f"[DEBUG] File renamed successfully to: {final_path}")
+    # Image downloads and the inserts block; keep them off the event loop
+    result = await run_in_threadpool(jugador_service.crear_jugadores_bulk, request.jugadores, request.filename)
 
-            # If the result object supports a `processed_file` attribute, set it
-            if hasattr(result, 'processed_file'):
-                try:
-                    setattr(result, 'processed_file', final_path)
-                except Exception:
-                    pass
+    if uploaded_file_path:
+        success = getattr(result, 'success', False)
+        final_path = _processed_upload_path(uploaded_file_path, timestamp, base_name, success)
+        if success:
+            # The players are committed with the request's unit of work: file the
+            # upload as processed only then, and as failed if the commit does not happen
+            error_path = _processed_upload_path(uploaded_file_path, timestamp, base_name, False)
+            db_context.after_commit(lambda: _move_upload(uploaded_file_path, final_path))
+            db_context.after_rollback(lambda: _move_upload(uploaded_file_path, error_path))
+        else:
+            _move_upload(uploaded_file_path, final_path)
 
-    except Exception as e:
-        print(f"[DEBUG] Error renaming file: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        pass
+        # If the result object supports a `processed_file` attribute, set it
+        if hasattr(result, 'processed_file'):
+            try:
+                setattr(result, 'processed_file', final_path)
+            except Exception:
+                pass
 
     # Si la operación no fue exitosa, retornar error 400
     if not getattr(result, 'success', False):
@@ -133,14 +150,19 @@ async def crear_jugadores_bulk(
 
 @router.get("/", response_model=List[JugadorResponse])
 async def listar_jugadores(
+    request: Request,
     skip: int = Query(0, ge=0, description="Elementos a omitir"),
     limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
 ):
     """Listar todos los jugadores con paginación"""
-    return jugador_service.listar_jugadores(skip, limit)
+    return await cached_json(
+        request, "jugadores", (jugador_catalog.version, "listar", skip, limit),
+        lambda: jugador_service.listar_jugadores_async(skip, limit)
+    )
 
 @router.get("/buscar", response_model=List[JugadorResponse])
 async def buscar_jugadores(
+    request: Request,
     posicion: Optional[PosicionJugadorEnum] = Query(None, description="Filtrar por posición"),
     equipo_id: Optional[UUID] = Query(None, description="Filtrar por equipo NFL"),
     activo: Optional[bool] = Query(None, description="Filtrar por estado activo"),
@@ -156,25 +178,73 @@ async def buscar_jugadores(
         activo=activo,
         nombre=nombre
     )
-    return jugador_service.buscar_jugadores(filters, skip, limit)
+    return await cached_json(
+        request, "jugadores", (jugador_catalog.version, "buscar", posicion, equipo_id, activo, nombre, skip, limit),
+        lambda: jugador_service.buscar_jugadores_async(filters, skip, limit)
+    )
+
+@router.get("/sugerencias", response_model=List[JugadorSugerencia])
+async def sugerir_jugadores(
+    q: str = Query(..., min_length=2, max_length=100, description="Texto escrito en el buscador"),
+    limit: int = Query(10, ge=1, le=25, description="Máximo de sugerencias"),
+    activo: Optional[bool] = Query(None, description="Filtrar por estado activo"),
+):
+    """
+    Sugerencias para el buscador de jugadores (typeahead).
+    Ignora mayúsculas y tildes, tolera errores de escritura y ordena por similitud.
+    """
+    return await jugador_service.sugerir_jugadores_async(q, limit, activo)
+
+@router.get("/pagina", response_model=Pagina[JugadorResponse])
+async def paginar_jugadores(
+    request: Request,
+    posicion: Optional[PosicionJugadorEnum] = Query(None, description="Filtrar por posición"),
+    equipo_id: Optional[UUID] = Query(None, description="Filtrar por equipo NFL"),
+    activo: Optional[bool] = Query(None, description="Filtrar por estado activo"),
+    nombre: Optional[str] = Query(None, description="Buscar por nombre (parcial)"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto como next_cursor por la página anterior"),
+    limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
+):
+    """
+    Buscar jugadores con paginación por cursor (orden alfabético).
+    Pasar next_cursor como ?cursor= para obtener la página siguiente; es null en la última.
+    """
+    filters = JugadorFilter(
+        posicion=posicion,
+        equipo_id=equipo_id,
+        activo=activo,
+        nombre=nombre
+    )
+    return await cached_json(
+        request, "jugadores", (jugador_catalog.version, "pagina", posicion, equipo_id, activo, nombre, cursor, limit),
+        lambda: jugador_service.buscar_jugadores_pagina_async(filters, cursor, limit)
+    )
 
 @router.get("/posicion/{posicion}", response_model=List[JugadorResponse])
 async def listar_jugadores_por_posicion(
+    request: Request,
     posicion: PosicionJugadorEnum,
     skip: int = Query(0, ge=0, description="Elementos a omitir"),
     limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
 ):
     """Listar jugadores por posición"""
-    return jugador_service.listar_jugadores_por_posicion(posicion.value, skip, limit)
+    return await cached_json(
+        request, "jugadores", (jugador_catalog.version, "posicion", posicion, skip, limit),
+        lambda: jugador_service.listar_jugadores_por_posicion_async(posicion.value, skip, limit)
+    )
 
 @router.get("/equipo/{equipo_id}", response_model=List[JugadorResponse])
 async def listar_jugadores_por_equipo(
+    request: Request,
     equipo_id: UUID,
     skip: int = Query(0, ge=0, description="Elementos a omitir"),
     limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
 ):
     """Listar jugadores de un equipo NFL específico"""
-    return jugador_service.listar_jugadores_por_equipo(equipo_id, skip, limit)
+    return await cached_json(
+        request, "jugadores", (jugador_catalog.version, "equipo", equipo_id, skip, limit),
+        lambda: jugador_service.listar_jugadores_por_equipo_async(equipo_id, skip, limit)
+    )
 
 @router.get("/liga/{liga_id}", response_model=List[JugadorResponse])
 async def listar_jugadores_por_liga(
@@ -196,12 +266,12 @@ async def listar_jugadores_por_usuario(
 @router.get("/{jugador_id}", response_model=JugadorResponse)
 async def obtener_jugador(jugador_id: UUID):
     """Obtener un jugador por ID"""
-    return jugador_service.obtener_jugador(jugador_id)
+    return await jugador_service.obtener_jugador_async(jugador_id)
 
 @router.get("/{jugador_id}/completo", response_model=JugadorConEquipo)
 async def obtener_jugador_completo(jugador_id: UUID):
     """Obtener jugador con información del equipo fantasy"""
-    return jugador_service.obtener_jugador_con_equipo(jugador_id)
+    return await jugador_service.obtener_jugador_con_equipo_async(jugador_id)
 
 @router.put("/{jugador_id}", response_model=JugadorResponse)
 async def actualizar_jugador(
@@ -224,7 +294,7 @@ async def eliminar_jugador(jugador_id: UUID):
 async def crear_noticia_jugador(
     jugador_id: UUID,
     noticia: NoticiaJugadorCreate,
-    current_user: dict = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Crear una noticia para un jugador.
@@ -249,10 +319,7 @@ async def crear_noticia_jugador(
     • Suspendido (SUS): no elegible por sanción
     """
     try:
-        # Get authenticated user ID
-        author_id = UUID(current_user["user_id"])
-        
-        return noticia_jugador_service.crear_noticia(jugador_id, noticia, author_id)
+        return noticia_jugador_service.crear_noticia(jugador_id, noticia, current_user)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -5,11 +5,13 @@ from pydantic import BaseModel
 
 from models.liga import (
     LigaResponse, LigaCreate, LigaUpdate,
-    LigaMiembroResponse, LigaConMiembros, LigaFilter
+    LigaMiembroResponse, LigaConMiembros, LigaFilter, LigaDirectorioItem
 )
 from services.liga_service import liga_service
+from models.pagination import Pagina
+from routers.serialization import FastModelRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastModelRoute)
 
 class LigaCreateResponse(BaseModel):
     """Response for league creation including available slots"""
@@ -30,7 +32,8 @@ async def crear_liga(liga: LigaCreate):
     Crear una nueva liga.
     """
     try:
-        liga_creada = liga_service.crear_liga(liga)
+        # The hash is awaited on the hashing pool, without holding a threadpool slot
+        liga_creada = await liga_service.crear_liga_async(liga)
         info_cupos = liga_service.obtener_info_cupos(liga_creada.id)
         
         return LigaCreateResponse(
@@ -52,7 +55,7 @@ async def listar_ligas(
     limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
 ):
     """Listar todas las ligas con paginación"""
-    return liga_service.listar_ligas(skip, limit)
+    return await liga_service.listar_ligas_async(skip, limit)
 
 @router.get("/buscar", response_model=List[LigaResponse])
 async def buscar_ligas(
@@ -68,12 +71,44 @@ async def buscar_ligas(
         temporada_id=temporada_id,
         estado=estado
     )
-    return liga_service.buscar_ligas(filtros, skip, limit)
+    return await liga_service.buscar_ligas_async(filtros, skip, limit)
+
+@router.get("/pagina", response_model=Pagina[LigaResponse])
+async def paginar_ligas(
+    nombre: Optional[str] = Query(None, description="Buscar por nombre (parcial)"),
+    temporada_id: Optional[UUID] = Query(None, description="Filtrar por temporada"),
+    estado: Optional[str] = Query(None, description="Filtrar por estado (Pre_draft, Draft)"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto como next_cursor por la página anterior"),
+    limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
+):
+    """Buscar ligas con paginación por cursor (las más antiguas primero)"""
+    filtros = LigaFilter(
+        nombre=nombre,
+        temporada_id=temporada_id,
+        estado=estado
+    )
+    return await liga_service.buscar_ligas_pagina_async(filtros, cursor, limit)
+
+@router.get("/directorio", response_model=Pagina[LigaDirectorioItem])
+async def directorio_ligas(
+    nombre: Optional[str] = Query(None, description="Buscar por nombre (parcial)"),
+    temporada_id: Optional[UUID] = Query(None, description="Filtrar por temporada"),
+    estado: Optional[str] = Query(None, description="Filtrar por estado (Pre_draft, Draft)"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto como next_cursor por la página anterior"),
+    limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
+):
+    """Directorio de ligas con temporada, comisionado y cupos (paginación por cursor)"""
+    filtros = LigaFilter(
+        nombre=nombre,
+        temporada_id=temporada_id,
+        estado=estado
+    )
+    return await liga_service.listar_directorio_async(filtros, cursor, limit)
 
 @router.get("/{liga_id}", response_model=LigaResponse)
 async def obtener_liga(liga_id: UUID):
     """Obtener una liga por ID"""
-    return liga_service.obtener_liga(liga_id)
+    return await liga_service.obtener_liga_async(liga_id)
 
 @router.get("/{liga_id}/completa", response_model=LigaConMiembros)
 async def obtener_liga_completa(liga_id: UUID):
@@ -108,7 +143,7 @@ async def unirse_liga(
 ):
     """Unirse a una liga"""
     try:
-        return liga_service.unirse_liga(
+        return await liga_service.unirse_liga_async(
             liga_id, request.usuario_id, request.contrasena, request.alias, request.nombre_equipo
         )
     except ValueError as e:
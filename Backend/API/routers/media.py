@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, status, UploadFile, File, Depends
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 from uuid import UUID
 from models.media import MediaCreate, MediaUpdate, MediaResponse
 from services.media_service import media_service
 from database import get_db
+from routers.serialization import FastModelRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastModelRoute)
 
 @router.post("/", response_model=MediaResponse, status_code=status.HTTP_201_CREATED)
 async def crear_media(media: MediaCreate):
@@ -76,7 +78,14 @@ async def subir_imagen_equipo(equipo_id: UUID, file: UploadFile = File(...)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El archivo debe ser una imagen"
         )
-    return media_service.subir_imagen(equipo_id, file.filename)
+    try:
+        # The upload is spooled to disk in chunks off the event loop
+        return await run_in_threadpool(media_service.subir_imagen, equipo_id, file.file, file.filename)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.get("/equipos-con-media/", response_model=List[UUID])
 async def obtener_equipos_con_media():
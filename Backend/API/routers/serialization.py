@@ -0,0 +1,85 @@
+"""
+Response serialization fast path
+
+Services already return validated response models. FastAPI would validate
+them again against response_model, dump them to Python objects and encode
+those with json.dumps. FastModelRoute instead writes them straight to JSON
+bytes with pydantic's serializer when the returned value is exactly the
+declared response_model (or a list of it). Anything else (dicts, ORM objects,
+subclasses, Response objects) takes the regular path, so response_model
+filtering still applies there.
+
+Every router is created with APIRouter(route_class=FastModelRoute).
+"""
+import functools
+import inspect
+import typing
+from typing import Any, Callable, Optional
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+
+
+def _exact_type_check(response_model: Any) -> Optional[Callable[[Any], bool]]:
+    """Predicate for values that are exactly response_model, or None if not supported"""
+    if typing.get_origin(response_model) is list:
+        args = typing.get_args(response_model)
+        item = args[0] if args else None
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return lambda value: isinstance(value, list) and all(type(element) is item for element in value)
+        return None
+    if isinstance(response_model, type) and issubclass(response_model, BaseModel):
+        return lambda value: type(value) is response_model
+    return None
+
+
+class FastModelRoute(APIRoute):
+    """APIRoute that encodes already-validated response models directly to JSON bytes"""
+
+    def get_route_handler(self) -> Callable:
+        self._install_fast_path()
+        return super().get_route_handler()
+
+    def _install_fast_path(self) -> None:
+        call = self.dependant.call
+        if getattr(call, "__fast_model_route__", False) or not self.response_model:
+            return
+        check = _exact_type_check(self.response_model)
+        if (
+            check is None
+            # Headers/cookies set on an injected Response are only merged on the regular path
+            or self.dependant.response_param_name is not None
+            or self.response_model_include is not None
+            or self.response_model_exclude is not None
+            or self.response_model_exclude_unset
+            or self.response_model_exclude_defaults
+            or self.response_model_exclude_none
+            or not inspect.isfunction(call)
+        ):
+            return
+
+        adapter = TypeAdapter(self.response_model)
+        status_code = self.status_code or 200
+        by_alias = self.response_model_by_alias
+
+        def render(value: Any) -> Any:
+            if check(value):
+                return Response(
+                    content=adapter.dump_json(value, by_alias=by_alias),
+                    status_code=status_code,
+                    media_type="application/json",
+                )
+            return value
+
+        if inspect.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def endpoint(*args, **kwargs):
+                return render(await call(*args, **kwargs))
+        else:
+            @functools.wraps(call)
+            def endpoint(*args, **kwargs):
+                return render(call(*args, **kwargs))
+
+        endpoint.__fast_model_route__ = True
+        self.dependant.call = endpoint
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
+from datetime import date
+from typing import List, Optional
 from uuid import UUID
 
 from models.temporada import (
@@ -8,18 +9,25 @@ from models.temporada import (
     TemporadaUpdate,
     TemporadaSemanaResponse,
     TemporadaSemanaCreate,
-    TemporadaConSemanas
+    TemporadaConSemanas,
+    TemporadaConSemanasCreate
 )
 from services.temporada_service import temporada_service
 from database import get_db
+from routers.serialization import FastModelRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastModelRoute)
 
 @router.post("/", response_model=TemporadaResponse, status_code=status.HTTP_201_CREATED)
 async def crear_temporada(temporada: TemporadaCreate):
     """Crear una nueva temporada"""
     return temporada_service.crear_temporada(temporada)
 
+@router.post("/con-semanas", response_model=TemporadaConSemanas, status_code=status.HTTP_201_CREATED)
+async def crear_temporada_con_semanas(temporada: TemporadaConSemanasCreate):
+    """Crear una temporada junto con todas sus semanas"""
+    return temporada_service.crear_temporada_con_semanas(temporada)
+
 @router.get("/", response_model=List[TemporadaResponse])
 async def listar_temporadas():
     """Listar todas las temporadas"""
@@ -30,6 +38,11 @@ async def obtener_temporada_actual():
     """Obtener la temporada actual"""
     return temporada_service.obtener_temporada_actual()
 
+@router.get("/actual/semana", response_model=TemporadaSemanaResponse)
+async def obtener_semana_actual(fecha: Optional[date] = Query(None, description="Fecha a consultar (hoy por defecto)")):
+    """Obtener la semana de la temporada actual que contiene la fecha"""
+    return temporada_service.obtener_semana_actual(fecha)
+
 @router.get("/{temporada_id}", response_model=TemporadaResponse)
 async def obtener_temporada(temporada_id: UUID):
     """Obtener una temporada por ID"""
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Request
+from fastapi import APIRouter, HTTPException, Depends, status, Request, Query
 
 from typing import List, Optional
 from uuid import UUID
@@ -16,12 +16,15 @@ from models.database_models import UsuarioDB, RolUsuarioEnum, EstadoUsuarioEnum
 from database import get_db
 from services.auth_service import auth_service
 from routers.auth import get_current_user, LoginResponse
+from services.principal_service import Principal
+from models.pagination import Pagina
 from services.usuario_service import usuario_service
 from exceptions.business_exceptions import ValidationError, ConflictError, NotFoundError
 from jose import JWTError
 import re
+from routers.serialization import FastModelRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastModelRoute)
 
 def convert_usuario_to_response(usuario_db: UsuarioDB) -> UsuarioResponse:
     """Convertir modelo de base de datos a modelo de respuesta"""
@@ -44,7 +47,8 @@ def convert_usuario_to_response(usuario_db: UsuarioDB) -> UsuarioResponse:
 async def crear_usuario(usuario: UsuarioCreate):
     """Crear un nuevo usuario"""
     try:
-        return usuario_service.crear_usuario(usuario)
+        # The hash is awaited on the hashing pool, without holding a threadpool slot
+        return await usuario_service.crear_usuario_async(usuario)
     except ConflictError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.message)
     except ValidationError as e:
@@ -53,13 +57,21 @@ async def crear_usuario(usuario: UsuarioCreate):
 @router.get("/", response_model=List[UsuarioResponse])
 async def listar_usuarios():
     """Obtener lista de todos los usuarios activos"""
-    return usuario_service.listar_usuarios()
+    return await usuario_service.listar_usuarios_async()
+
+@router.get("/pagina", response_model=Pagina[UsuarioResponse])
+async def paginar_usuarios(
+    cursor: Optional[str] = Query(None, description="Cursor devuelto como next_cursor por la página anterior"),
+    limit: int = Query(100, ge=1, le=100, description="Límite de elementos")
+):
+    """Obtener usuarios activos con paginación por cursor"""
+    return await usuario_service.listar_usuarios_pagina_async(cursor, limit)
 
 @router.get("/{usuario_id}", response_model=UsuarioResponse)
 async def obtener_usuario(usuario_id: UUID):
     """Obtener un usuario específico por ID"""
     try:
-        return usuario_service.obtener_usuario(usuario_id)
+        return await usuario_service.obtener_usuario_async(usuario_id)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
 
@@ -67,7 +79,7 @@ async def obtener_usuario(usuario_id: UUID):
 async def actualizar_usuario(
     usuario_id: UUID,
     updates: UsuarioUpdate,
-    current=Depends(get_current_user),
+    current: Principal = Depends(get_current_user),
 ):
     """Actualizar datos de perfil del usuario.
     Reglas:
@@ -76,12 +88,7 @@ async def actualizar_usuario(
     - Campos permitidos: nombre, alias, idioma, imagen_perfil_url, (correo opcional con verificación de unicidad).
     """
     try:
-        requester_id = UUID(str(current.get("user_id")))
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
-    
-    try:
-        return usuario_service.actualizar_usuario(usuario_id, updates, requester_id)
+        return usuario_service.actualizar_usuario(usuario_id, updates, current)
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
     except ConflictError as e:
@@ -99,7 +106,7 @@ async def login_usuario(credenciales: UsuarioLogin, request: Request):
     - Mensajes de error genéricos por seguridad
     """
     # Autenticar usuario usando el servicio de autenticación
-    resultado_login = auth_service.login_user(credenciales.correo, credenciales.contrasena)
+    resultado_login = await auth_service.login_user_async(credenciales.correo, credenciales.contrasena)
 
     if not resultado_login.get("success"):
         # Propagar mensaje específico cuando corresponda
@@ -171,4 +178,4 @@ def _is_strong_password(pwd: str) -> bool:
 @router.post("/unlock/set-password")
 async def establecer_contrasena(payload: UnlockSetPassword):
     """Permitir establecer una nueva contraseña usando el token de desbloqueo."""
-    return usuario_service.establecer_contrasena(payload.token, payload.new_password)
+    return await usuario_service.establecer_contrasena_async(payload.token, payload.new_password)
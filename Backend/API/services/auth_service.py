@@ -1,35 +1,40 @@
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 import os
+import time
 from dotenv import load_dotenv
 import uuid
 load_dotenv()
 
+from services.session_store import SessionStore, build_session_store
+from services.password_hasher import password_hasher
+from services.token_cache import TokenCache
+from services.principal_service import principal_service
+from exceptions.business_exceptions import ServiceUnavailableError
+
 # Configuración JWT
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_HOURS = 12  # 12 horas según requerimientos
 
-# Configuración de password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class AuthService:
     """Servicio de autenticación con JWT y gestión de sesiones"""
     
-    def __init__(self):
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, session_store: Optional[SessionStore] = None):
+        self.session_store = session_store or build_session_store()
+        self.token_cache = TokenCache()
         self.max_failed_attempts = 5
     
     def hash_password(self, password: str) -> str:
-        """Crear hash de contraseña"""
-        return pwd_context.hash(password)
+        """Crear hash de contraseña (en el pool de hashing)"""
+        return password_hasher.hash(password)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verificar contraseña"""
-        return pwd_context.verify(plain_password, hashed_password)
+        """Verificar contraseña (en el pool de hashing)"""
+        return password_hasher.verify(plain_password, hashed_password)
     
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Crear token JWT de acceso"""
@@ -52,13 +57,7 @@ class AuthService:
         token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         
         # Registrar sesión activa
-        self.active_sessions[session_id] = {
-            "user_id": data.get("sub"),
-            "token": token,
-            "created_at": datetime.utcnow(),
-            "expires_at": expire,
-            "last_activity": datetime.utcnow()
-        }
+        self.session_store.create(session_id, data.get("sub"), expire.replace(tzinfo=timezone.utc).timestamp())
         
         return token
     
@@ -78,25 +77,32 @@ class AuthService:
     def verify_token(self, token: str) -> Dict[str, Any]:
         """Verificar y decodificar token JWT"""
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            
-            # Verificar tipo de token
-            if payload.get("token_type") != "access":
-                raise ValueError("Tipo de token inválido")
+            # Tokens ya verificados (hasta su exp) evitan repetir la verificación de firma
+            cache_key = self.token_cache.key(token)
+            payload = self.token_cache.get(cache_key)
+            if payload is None:
+                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+                
+                # Verificar tipo de token
+                if payload.get("token_type") != "access":
+                    raise ValueError("Tipo de token inválido")
+                self.token_cache.put(cache_key, payload)
             
             # Verificar si la sesión está activa
             session_id = payload.get("session_id")
-            if session_id and session_id in self.active_sessions:
-                session = self.active_sessions[session_id]
+            session = self.session_store.get(session_id) if session_id else None
+            if session is not None:
                 # Verificar inactividad ANTES de actualizar la última actividad
-                now = datetime.utcnow()
-                last_activity = session.get("last_activity") or session.get("created_at")
-                if last_activity and (now - last_activity) > timedelta(hours=12):
+                now = time.time()
+                if now - session["last_activity"] > self.session_store.inactivity_seconds:
                     # Expirada por inactividad: invalidar y rechazar
                     self.invalidate_session(session_id)
                     raise ValueError("Sesión expirada por inactividad")
                 # Todo bien: actualizar última actividad
-                session["last_activity"] = now
+                self.session_store.touch(session_id, now)
+            elif session_id and self.session_store.shared:
+                # Con un almacén compartido una sesión desconocida fue cerrada o purgada
+                raise ValueError("Token inválido")
             # Si no hay session en memoria, aceptar token válido (modo stateless)
             
             return payload
@@ -106,136 +112,162 @@ class AuthService:
     
     def invalidate_session(self, session_id: str):
         """Invalidar sesión específica"""
-        if session_id in self.active_sessions:
-            del self.active_sessions[session_id]
+        self.token_cache.invalidate_session(session_id)
+        self.session_store.delete(session_id)
     
     def invalidate_all_user_sessions(self, user_id: str):
         """Invalidar todas las sesiones de un usuario"""
-        sessions_to_remove = []
-        for session_id, session_data in self.active_sessions.items():
-            if session_data["user_id"] == user_id:
-                sessions_to_remove.append(session_id)
-        
-        for session_id in sessions_to_remove:
-            del self.active_sessions[session_id]
+        self.token_cache.invalidate_user(user_id)
+        self.session_store.delete_user(user_id)
     
-    def increment_failed_attempts(self, usuario_db, db_session: Session) -> int:
-        """Incrementar intentos fallidos en la base de datos"""
-        # Incrementar contador
-        usuario_db.failed_attempts += 1
+    def increment_failed_attempts(self, usuario_db) -> int:
+        """Incrementar intentos fallidos en la base de datos
 
-        # Si alcanza el máximo permitido, bloquear la cuenta
-        try:
-            from models.database_models import EstadoUsuarioEnum
-            if usuario_db.failed_attempts >= self.max_failed_attempts:
+        Se guarda en una transacción propia: el contador persiste aunque la
+        petición se revierta.
+        """
+        from models.database_models import UsuarioDB, EstadoUsuarioEnum
+        from DAL.repositories.db_context import db_context
+
+        with db_context.get_standalone_session() as db:
+            usuario = db.get(UsuarioDB, usuario_db.id, with_for_update=True)
+            usuario.failed_attempts += 1
+            # Si alcanza el máximo permitido, bloquear la cuenta
+            if usuario.failed_attempts >= self.max_failed_attempts:
                 # Cambiar estado a bloqueado (equivalente a 'inactiva' solicitada)
-                usuario_db.estado = EstadoUsuarioEnum.bloqueado
-        finally:
-            # Guardar siempre los cambios
-            db_session.commit()
+                usuario.estado = EstadoUsuarioEnum.bloqueado
+            failed_attempts, estado = usuario.failed_attempts, usuario.estado
+
+        # Ya confirmado fuera de la unidad de trabajo
+        if estado == EstadoUsuarioEnum.bloqueado:
+            principal_service.invalidate(usuario_db.id)
 
-        return usuario_db.failed_attempts
+        return failed_attempts
     
     def reset_failed_attempts(self, usuario_db, db_session: Session):
         """Resetear intentos fallidos después de login exitoso"""
         usuario_db.failed_attempts = 0
-        db_session.commit()
+        db_session.flush()
     
     def get_active_sessions_count(self, user_id: str) -> int:
         """Obtener número de sesiones activas de un usuario"""
-        count = 0
-        for session_data in self.active_sessions.values():
-            if session_data["user_id"] == user_id:
-                count += 1
-        return count
+        return self.session_store.count_user(user_id)
 
-    def login_user(self, correo: str, contrasena: str) -> Dict[str, Any]:
+    def _login_lookup(self, correo: str) -> Tuple[Optional[Dict[str, Any]], Any, Optional[str]]:
         """
-        Autenticar usuario con validación de intentos fallidos y bloqueo
+        Primer paso del login: (resultado de error, o None con el id y el hash del usuario)
         """
         from models.database_models import UsuarioDB, EstadoUsuarioEnum
+        from DAL.repositories.db_context import db_context
+
+        with db_context.get_session() as db_session:
+            # Buscar usuario por correo
+            usuario = db_session.query(UsuarioDB).filter(UsuarioDB.correo == correo).first()
+            
+            if not usuario:
+                return {
+                    "success": False,
+                    "message": "Credenciales inválidas"
+                }, None, None
+            
+            # Verificar si la cuenta está activa
+            if usuario.estado != EstadoUsuarioEnum.activa:
+                return {
+                    "success": False,
+                    "message": "Cuenta bloqueada"
+                }, None, None
+            
+            # Verificar si la cuenta está bloqueada (o debe bloquearse)
+            if usuario.failed_attempts >= 5:
+                # Asegurar que el estado refleje el bloqueo
+                try:
+                    from models.database_models import EstadoUsuarioEnum as _EstadoEnum
+                    if usuario.estado != _EstadoEnum.bloqueado:
+                        usuario.estado = _EstadoEnum.bloqueado
+                        db_session.flush()
+                        principal_service.invalidate_after_commit(usuario.id)
+                except Exception:
+                    # Si no se puede actualizar el estado por cualquier razón, continuar devolviendo error
+                    pass
+                return {
+                    "success": False,
+                    "message": "Cuenta inactiva por múltiples intentos fallidos"
+                }, None, None
+            
+            return None, usuario.id, usuario.contrasena_hash
+
+    def _login_complete(self, usuario_id, password_valid: bool) -> Dict[str, Any]:
+        """
+        Segundo paso del login, con la contraseña ya verificada: intentos fallidos o tokens
+        """
+        from models.database_models import UsuarioDB
         from models.usuario import UsuarioResponse, RolUsuario, EstadoUsuario
         from DAL.repositories.db_context import db_context
-        
-        try:
-            with db_context.get_session() as db_session:
-                # Buscar usuario por correo
-                usuario = db_session.query(UsuarioDB).filter(UsuarioDB.correo == correo).first()
-                
-                if not usuario:
-                    return {
-                        "success": False,
-                        "message": "Credenciales inválidas"
-                    }
-                
-                # Verificar si la cuenta está activa
-                if usuario.estado != EstadoUsuarioEnum.activa:
-                    return {
-                        "success": False,
-                        "message": "Cuenta bloqueada"
-                    }
-                
-                # Verificar si la cuenta está bloqueada (o debe bloquearse)
-                if usuario.failed_attempts >= 5:
-                    # Asegurar que el estado refleje el bloqueo
-                    try:
-                        from models.database_models import EstadoUsuarioEnum as _EstadoEnum
-                        if usuario.estado != _EstadoEnum.bloqueado:
-                            usuario.estado = _EstadoEnum.bloqueado
-                            db_session.commit()
-                    except Exception:
-                        # Si no se puede actualizar el estado por cualquier razón, continuar devolviendo error
-                        pass
-                    return {
-                        "success": False,
-                        "message": "Cuenta inactiva por múltiples intentos fallidos"
-                    }
-                
-                # Verificar contraseña
-                if not self.verify_password(contrasena, usuario.contrasena_hash):
-                    # Incrementar intentos fallidos
-                    new_attempts = self.increment_failed_attempts(usuario, db_session)
-                    
-                    message = "Credenciales inválidas"
-                    if new_attempts >= 5:
-                        message = "Cuenta inactiva por múltiples intentos fallidos"
-                    
-                    return {
-                        "success": False,
-                        "message": message
-                    }
-                
-                # Login exitoso - resetear intentos fallidos
-                self.reset_failed_attempts(usuario, db_session)
-                
-                # Crear tokens
-                access_token = self.create_access_token(data={"sub": str(usuario.id)})
-                refresh_token = self.create_refresh_token(str(usuario.id))
-                
-                # Crear modelo de respuesta del usuario (robusto ante enums o strings)
-                rol_val = getattr(usuario.rol, "value", usuario.rol)
-                estado_val = getattr(usuario.estado, "value", usuario.estado)
 
-                usuario_response = UsuarioResponse(
-                    id=usuario.id,
-                    nombre=usuario.nombre,
-                    alias=usuario.alias,
-                    correo=usuario.correo,
-                    rol=RolUsuario(rol_val),
-                    estado=EstadoUsuario(estado_val),
-                    idioma=usuario.idioma,
-                    imagen_perfil_url=usuario.imagen_perfil_url,
-                    creado_en=usuario.creado_en
-                )
+        with db_context.get_session() as db_session:
+            usuario = db_session.get(UsuarioDB, usuario_id)
+            if not usuario:
+                return {
+                    "success": False,
+                    "message": "Credenciales inválidas"
+                }
+            
+            if not password_valid:
+                # Incrementar intentos fallidos
+                new_attempts = self.increment_failed_attempts(usuario)
+                
+                message = "Credenciales inválidas"
+                if new_attempts >= 5:
+                    message = "Cuenta inactiva por múltiples intentos fallidos"
                 
                 return {
-                    "success": True,
-                    "access_token": access_token,
-                    "refresh_token": refresh_token,
-                    "usuario": usuario_response,
-                    "message": "Login exitoso"
+                    "success": False,
+                    "message": message
                 }
             
+            # Login exitoso - resetear intentos fallidos
+            self.reset_failed_attempts(usuario, db_session)
+            
+            # Crear tokens
+            access_token = self.create_access_token(data={"sub": str(usuario.id)})
+            refresh_token = self.create_refresh_token(str(usuario.id))
+            
+            # Crear modelo de respuesta del usuario (robusto ante enums o strings)
+            rol_val = getattr(usuario.rol, "value", usuario.rol)
+            estado_val = getattr(usuario.estado, "value", usuario.estado)
+
+            usuario_response = UsuarioResponse(
+                id=usuario.id,
+                nombre=usuario.nombre,
+                alias=usuario.alias,
+                correo=usuario.correo,
+                rol=RolUsuario(rol_val),
+                estado=EstadoUsuario(estado_val),
+                idioma=usuario.idioma,
+                imagen_perfil_url=usuario.imagen_perfil_url,
+                creado_en=usuario.creado_en
+            )
+            
+            return {
+                "success": True,
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "usuario": usuario_response,
+                "message": "Login exitoso"
+            }
+
+    def login_user(self, correo: str, contrasena: str) -> Dict[str, Any]:
+        """
+        Autenticar usuario con validación de intentos fallidos y bloqueo
+        """
+        try:
+            error, usuario_id, contrasena_hash = self._login_lookup(correo)
+            if error:
+                return error
+            return self._login_complete(usuario_id, self.verify_password(contrasena, contrasena_hash))
+        except ServiceUnavailableError:
+            # Pool de hashing saturado: el cliente debe reintentar (503)
+            raise
         except Exception as e:
             # En producción, usar logging apropiado
             # logger.error(f"Error en login_user: {str(e)}")
@@ -244,5 +276,25 @@ class AuthService:
                 "message": "Error interno del servidor"
             }
 
+    async def login_user_async(self, correo: str, contrasena: str) -> Dict[str, Any]:
+        """
+        login_user para rutas async: las consultas van al threadpool y bcrypt se
+        espera en el event loop, sin ocupar un hilo del threadpool
+        """
+        try:
+            error, usuario_id, contrasena_hash = await run_in_threadpool(self._login_lookup, correo)
+            if error:
+                return error
+            password_valid = await password_hasher.verify_async(contrasena, contrasena_hash)
+            return await run_in_threadpool(self._login_complete, usuario_id, password_valid)
+        except ServiceUnavailableError:
+            # Pool de hashing saturado: el cliente debe reintentar (503)
+            raise
+        except Exception:
+            return {
+                "success": False,
+                "message": "Error interno del servidor"
+            }
+
 # Instancia global del servicio de autenticación
 auth_service = AuthService()
@@ -6,6 +6,7 @@ from uuid import UUID
 import re
 
 from models.database_models import EquipoFantasyDB, EquipoFantasyAuditDB
+from models.pagination import Pagina
 from models.equipo_fantasy import (
     EquipoFantasyCreate, EquipoFantasyUpdate, EquipoFantasyResponse, 
     EquipoFantasyConRelaciones, EquipoFantasyFilter, EquipoFantasyAuditResponse,
@@ -122,6 +123,15 @@ class EquipoFantasyService:
         equipos = equipo_fantasy_repository.get_by_liga(liga_id, skip, limit)
         return [_to_equipo_fantasy_response(equipo) for equipo in equipos]
     
+    def listar_equipos_por_liga_pagina(self, liga_id: UUID, cursor: Optional[str] = None,
+                                       limit: int = 100) -> Pagina[EquipoFantasyResponse]:
+        """List fantasy teams by league, one keyset page at a time (sorted by creado_en)"""
+        equipos, next_cursor = equipo_fantasy_repository.get_by_liga_page(liga_id, cursor, limit)
+        return Pagina[EquipoFantasyResponse](
+            items=[_to_equipo_fantasy_response(equipo) for equipo in equipos],
+            next_cursor=next_cursor
+        )
+    
     def listar_equipos_por_usuario(self, usuario_id: UUID, skip: int = 0, limit: int = 100) -> List[EquipoFantasyResponse]:
         """List fantasy teams by user"""
         equipos = equipo_fantasy_repository.get_by_usuario(usuario_id, skip, limit)
@@ -8,6 +8,7 @@ from models.database_models import EquipoDB
 from models.equipo import EquipoNFLCreate, EquipoNFLUpdate, EquipoNFLResponse, EquipoNFLConMedia
 from DAL.repositories.equipo_repository import equipo_repository
 from services.error_handling import handle_db_errors
+from services.response_cache import response_cache
 from validators.equipo_nfl_validator import EquipoNFLValidator
 from exceptions.business_exceptions import ValidationError, ConflictError, NotFoundError
 
@@ -34,6 +35,7 @@ class EquipoNFLService:
         validator.validate_nombre_unique(equipo.nombre)
         
         nuevo_equipo = equipo_repository.create(equipo)
+        response_cache.invalidate_after_commit("equipos")
         return _to_response(nuevo_equipo)
 
     def listar(self) -> List[EquipoNFLResponse]:
@@ -66,6 +68,7 @@ class EquipoNFLService:
             validator.validate_nombre_unique(equipo_update.nombre, equipo_id)
         
         equipo_actualizado = equipo_repository.update(equipo_id, equipo_update)
+        response_cache.invalidate_after_commit("equipos")
         return _to_response(equipo_actualizado)
 
     @handle_db_errors
@@ -78,6 +81,8 @@ class EquipoNFLService:
         validator.validate_equipo_can_be_deleted(equipo)
         
         equipo_repository.delete(equipo_id)
+        # Player listings by team answer 404 for teams that no longer exist
+        response_cache.invalidate_after_commit("equipos", "jugadores")
 
 
 # Create service instance
@@ -10,7 +10,8 @@ from exceptions.business_exceptions import (
     ConflictError, 
     NotFoundError, 
     ForeignKeyError, 
-    ConstraintViolationError
+    ConstraintViolationError,
+    ServiceUnavailableError
 )
 
 def handle_db_errors(func: Callable) -> Callable:
@@ -32,7 +33,7 @@ def handle_db_errors(func: Callable) -> Callable:
             # Handle other database errors
             print(f"Database error in {func.__name__}: {e}")  # Log for debugging
             raise ValidationError("Error interno del servidor. Por favor, inténtelo más tarde.")
-        except (ValidationError, ConflictError, NotFoundError, ForeignKeyError, ConstraintViolationError):
+        except (ValidationError, ConflictError, NotFoundError, ForeignKeyError, ConstraintViolationError, ServiceUnavailableError):
             # Re-raise business exceptions as-is
             raise
         except Exception as e:
@@ -62,7 +63,7 @@ def handle_db_errors_async(func: Callable) -> Callable:
             # Handle other database errors
             print(f"Database error in {func.__name__}: {e}")  # Log for debugging
             raise ValidationError("Error interno del servidor. Por favor, inténtelo más tarde.")
-        except (ValidationError, ConflictError, NotFoundError, ForeignKeyError, ConstraintViolationError):
+        except (ValidationError, ConflictError, NotFoundError, ForeignKeyError, ConstraintViolationError, ServiceUnavailableError):
             # Re-raise business exceptions as-is
             raise
         except Exception as e:
@@ -0,0 +1,369 @@
+"""
+In-process snapshot of the player catalog for read-heavy listings
+
+jugadores changes rarely (bulk loads, admin edits) but is listed on every
+draft screen. The catalog keeps every player in memory as compact records
+with secondary indexes by position, NFL team and active flag plus a name
+index, so list and filter endpoints are answered without a database round
+trip. Snapshots are immutable: JugadorService writes produce a new version
+once their transaction commits, copying only the indexes they touch, and
+readers keep using whichever version they started with.
+
+Writes made by other workers are picked up when the local snapshot is older
+than JUGADOR_CATALOG_TTL_SECONDS and gets reloaded.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from DAL.file_storage.cdn_service import cdn_service
+from DAL.repositories.db_context import db_context
+from DAL.repositories.jugador_repository import jugador_repository, async_jugador_repository
+from DAL.repositories.text_search import normalize
+from models.database_models import PosicionJugadorEnum
+from models.jugador import JugadorResponse
+
+JUGADOR_CATALOG_ENABLED = os.getenv("JUGADOR_CATALOG_ENABLED", "true").strip().lower() == "true"
+JUGADOR_CATALOG_TTL_SECONDS = float(os.getenv("JUGADOR_CATALOG_TTL_SECONDS", "60"))
+
+# (nombre, str(id)): the jugador_repository.SORT_COLUMNS order. Code point order,
+# which jugadores.nombre matches in the database through its "C" collation
+SortKey = Tuple[str, str]
+
+
+class JugadorRecord:
+    """One player in the catalog"""
+
+    __slots__ = (
+        "id", "nombre", "posicion", "equipo_id", "imagen_url", "thumbnail_url",
+        "activo", "creado_en", "clave", "busqueda", "_respuesta",
+    )
+
+    def __init__(self, row: Any):
+        self.id = row.id
+        self.nombre = row.nombre
+        self.posicion = row.posicion
+        self.equipo_id = row.equipo_id
+        self.imagen_url = row.imagen_url
+        self.thumbnail_url = row.thumbnail_url
+        self.activo = row.activo
+        self.creado_en = row.creado_en
+        self.clave: SortKey = (row.nombre, str(row.id))
+        self.busqueda = normalize(row.nombre)
+        self._respuesta: Optional[JugadorResponse] = None
+
+    def respuesta(self) -> JugadorResponse:
+        """JugadorResponse for this record, built once per snapshot version"""
+        if self._respuesta is None:
+            respuesta = JugadorResponse.model_validate(self, from_attributes=True)
+            respuesta.imagen_srcset = cdn_service.get_srcset(self.imagen_url)
+            self._respuesta = respuesta
+        return self._respuesta
+
+
+def _fragmentos(busqueda: str) -> Set[str]:
+    """Suffixes of every word: a term found inside a word is a prefix of one of them"""
+    return {palabra[i:] for palabra in busqueda.split() for i in range(len(palabra))}
+
+
+class CatalogSnapshot:
+    """Immutable view of every player with its secondary indexes
+
+    Index lists hold sort keys in (nombre, id) order, so any of them can be
+    walked in listing order and cut at skip/limit.
+    """
+
+    __slots__ = (
+        "version", "loaded_at", "_records", "_by_id", "_orden",
+        "_por_posicion", "_por_equipo", "_por_activo", "_prefijos",
+    )
+
+    def __init__(self, version: int, loaded_at: float):
+        self.version = version
+        self.loaded_at = loaded_at
+        self._records: Dict[SortKey, JugadorRecord] = {}
+        self._by_id: Dict[UUID, SortKey] = {}
+        self._orden: List[SortKey] = []
+        self._por_posicion: Dict[PosicionJugadorEnum, List[SortKey]] = {}
+        self._por_equipo: Dict[UUID, List[SortKey]] = {}
+        self._por_activo: Dict[bool, List[SortKey]] = {}
+        # Sorted (fragment, key) pairs, searched by prefix with bisect
+        self._prefijos: List[Tuple[str, SortKey]] = []
+
+    @classmethod
+    def build(cls, rows: Iterable[Any], version: int) -> "CatalogSnapshot":
+        snapshot = cls(version, time.monotonic())
+        records = sorted((JugadorRecord(row) for row in rows), key=lambda record: record.clave)
+        for record in records:
+            snapshot._records[record.clave] = record
+            snapshot._by_id[record.id] = record.clave
+            snapshot._orden.append(record.clave)
+            snapshot._por_posicion.setdefault(record.posicion, []).append(record.clave)
+            snapshot._por_equipo.setdefault(record.equipo_id, []).append(record.clave)
+            snapshot._por_activo.setdefault(record.activo, []).append(record.clave)
+            snapshot._prefijos.extend((fragmento, record.clave) for fragmento in _fragmentos(record.busqueda))
+        snapshot._prefijos.sort()
+        return snapshot
+
+    def apply(self, upserts: Sequence[JugadorRecord], deleted: Iterable[UUID], version: int) -> "CatalogSnapshot":
+        """New snapshot with upserts added/replaced and deleted ids removed
+
+        Only the index lists touched by the change are copied; the rest are
+        shared with this snapshot.
+        """
+        snapshot = CatalogSnapshot(version, self.loaded_at)
+        snapshot._records = dict(self._records)
+        snapshot._by_id = dict(self._by_id)
+        snapshot._orden = list(self._orden)
+        snapshot._por_posicion = dict(self._por_posicion)
+        snapshot._por_equipo = dict(self._por_equipo)
+        snapshot._por_activo = dict(self._por_activo)
+        snapshot._prefijos = list(self._prefijos)
+        copied: Set[Tuple[int, Any]] = set()
+
+        def owned(index: Dict[Any, List[SortKey]], key: Any) -> List[SortKey]:
+            # Copy-on-write of a single index list
+            marker = (id(index), key)
+            if marker not in copied:
+                copied.add(marker)
+                index[key] = list(index.get(key, ()))
+            return index[key]
+
+        def remove(clave: SortKey) -> None:
+            record = snapshot._records.pop(clave)
+            del snapshot._by_id[record.id]
+            for keys in (
+                snapshot._orden,
+                owned(snapshot._por_posicion, record.posicion),
+                owned(snapshot._por_equipo, record.equipo_id),
+                owned(snapshot._por_activo, record.activo),
+            ):
+                del keys[bisect_left(keys, clave)]
+            for fragmento in _fragmentos(record.busqueda):
+                del snapshot._prefijos[bisect_left(snapshot._prefijos, (fragmento, clave))]
+
+        for jugador_id in deleted:
+            clave = snapshot._by_id.get(jugador_id)
+            if clave is not None:
+                remove(clave)
+
+        for record in upserts:
+            clave = snapshot._by_id.get(record.id)
+            if clave is not None:
+                remove(clave)
+            snapshot._records[record.clave] = record
+            snapshot._by_id[record.id] = record.clave
+            insort(snapshot._orden, record.clave)
+            insort(owned(snapshot._por_posicion, record.posicion), record.clave)
+            insort(owned(snapshot._por_equipo, record.equipo_id), record.clave)
+            insort(owned(snapshot._por_activo, record.activo), record.clave)
+            for fragmento in _fragmentos(record.busqueda):
+                insort(snapshot._prefijos, (fragmento, record.clave))
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, jugador_id: UUID) -> Optional[JugadorRecord]:
+        clave = self._by_id.get(jugador_id)
+        return self._records[clave] if clave is not None else None
+
+    def tiene_equipo(self, equipo_id: UUID) -> bool:
+        """True if some player belongs to equipo_id (so the NFL team exists)"""
+        return bool(self._por_equipo.get(equipo_id))
+
+    def _buscar(self, termino: str) -> List[SortKey]:
+        """Keys of players whose name may contain termino (callers check the substring)"""
+        token = max(termino.split(), key=len)
+        prefijos = self._prefijos
+        i = bisect_left(prefijos, (token,))
+        claves = set()
+        while i < len(prefijos) and prefijos[i][0].startswith(token):
+            claves.add(prefijos[i][1])
+            i += 1
+        return sorted(claves)
+
+    def filtrar(self, posicion: Optional[PosicionJugadorEnum] = None, equipo_id: Optional[UUID] = None,
+                activo: Optional[bool] = None, nombre: Optional[str] = None,
+                skip: int = 0, limit: int = 100) -> List[JugadorRecord]:
+        """Players matching every given filter, in (nombre, id) order
+
+        Same semantics as jugador_repository.get_with_filters: nombre matches
+        anywhere in the name, ignoring case and accents.
+        """
+        termino = normalize(nombre) if nombre else ""
+        candidatos: List[Sequence[SortKey]] = []
+        if posicion is not None:
+            candidatos.append(self._por_posicion.get(posicion, ()))
+        if equipo_id is not None:
+            candidatos.append(self._por_equipo.get(equipo_id, ()))
+        if activo is not None:
+            candidatos.append(self._por_activo.get(activo, ()))
+        if termino:
+            candidatos.append(self._buscar(termino))
+        if len(candidatos) <= 1 and not termino:
+            claves = candidatos[0] if candidatos else self._orden
+            return [self._records[clave] for clave in claves[skip:skip + limit]]
+
+        # Walk the most selective index and check the remaining filters per record
+        resultado: List[JugadorRecord] = []
+        for clave in min(candidatos, key=len):
+            record = self._records[clave]
+            if posicion is not None and record.posicion != posicion:
+                continue
+            if equipo_id is not None and record.equipo_id != equipo_id:
+                continue
+            if activo is not None and record.activo != activo:
+                continue
+            if termino and termino not in record.busqueda:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            resultado.append(record)
+            if len(resultado) >= limit:
+                break
+        return resultado
+
+
+class JugadorCatalog:
+    """Holds the current snapshot, loads it lazily and applies committed writes"""
+
+    def __init__(self, ttl_seconds: float = JUGADOR_CATALOG_TTL_SECONDS, enabled: bool = JUGADOR_CATALOG_ENABLED):
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        # Bumped by every write; a load that overlaps a write may miss it
+        self._writes = 0
+        self._loading = False
+        self.loads = 0
+        self.updates = 0
+
+    @property
+    def version(self) -> int:
+        """Changes whenever the served player data may have changed"""
+        return self._version
+
+    def _fresh(self) -> Optional[CatalogSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl_seconds:
+            return snapshot
+        return None
+
+    def _begin_load(self) -> Tuple[bool, int]:
+        """(should load, write counter); one worker thread reloads while others serve the stale copy"""
+        with self._lock:
+            if self._loading and self._snapshot is not None:
+                return False, self._writes
+            self._loading = True
+            return True, self._writes
+
+    def _install(self, rows: Iterable[Any], writes: int) -> CatalogSnapshot:
+        with self._lock:
+            try:
+                self._version += 1
+                snapshot = CatalogSnapshot.build(rows, self._version)
+                if self._writes != writes:
+                    # A write committed while loading; serve this once, reload on next read
+                    snapshot.loaded_at = float("-inf")
+                self._snapshot = snapshot
+                self.loads += 1
+                return snapshot
+            finally:
+                self._loading = False
+
+    def _abort_load(self) -> None:
+        with self._lock:
+            self._loading = False
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current snapshot, loading it with one query when missing or expired"""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        should_load, writes = self._begin_load()
+        if not should_load:
+            return self._snapshot
+        try:
+            rows = jugador_repository.get_catalogo()
+        except Exception:
+            self._abort_load()
+            raise
+        return self._install(rows, writes)
+
+    async def snapshot_async(self) -> CatalogSnapshot:
+        """snapshot() for async paths, loading through the async repository"""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        should_load, writes = self._begin_load()
+        if not should_load:
+            return self._snapshot
+        try:
+            rows = await async_jugador_repository.get_catalogo()
+        except BaseException:
+            self._abort_load()
+            raise
+        return self._install(rows, writes)
+
+    def _apply(self, upserts: Sequence[JugadorRecord], deleted: Sequence[UUID]) -> None:
+        with self._lock:
+            self._writes += 1
+            if self._snapshot is None:
+                return
+            try:
+                self._version += 1
+                self._snapshot = self._snapshot.apply(upserts, deleted, self._version)
+                self.updates += 1
+            except Exception:
+                # Indexes out of step with the data: rebuild from the database on next read
+                self._snapshot = None
+
+    def upsert_after_commit(self, rows: Iterable[Any]) -> None:
+        """Add or replace players (ORM objects or catalog rows) once the transaction commits
+
+        Records are built right away, while ORM objects are still attached to
+        their session.
+        """
+        records = [JugadorRecord(row) for row in rows]
+        if records:
+            db_context.after_commit(lambda: self._apply(records, ()))
+
+    def remove_after_commit(self, jugador_ids: Iterable[UUID]) -> None:
+        """Drop players once the transaction commits"""
+        ids = list(jugador_ids)
+        if ids:
+            db_context.after_commit(lambda: self._apply((), ids))
+
+    def invalidate(self) -> None:
+        """Forget the snapshot; the next read reloads it"""
+        with self._lock:
+            self._writes += 1
+            self._snapshot = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "enabled": self.enabled,
+            "loaded": snapshot is not None,
+            "version": self._version,
+            "players": len(snapshot) if snapshot is not None else 0,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 3)
+            if snapshot is not None and snapshot.loaded_at != float("-inf") else None,
+            "ttl_seconds": self.ttl_seconds,
+            "loads": self.loads,
+            "updates": self.updates,
+        }
+
+
+# Singleton instance
+jugador_catalog = JugadorCatalog()
@@ -8,27 +8,47 @@ import shutil
 from datetime import datetime
 
 from models.database_models import JugadoresDB
+from models.pagination import Pagina
 from models.jugador import (
     JugadorCreate, JugadorUpdate, JugadorResponse, JugadorConEquipo, 
-    JugadorFilter, EquipoNFLResponseBasic, JugadorBulkCreate, JugadorBulkResult
+    JugadorFilter, EquipoNFLResponseBasic, JugadorBulkCreate, JugadorBulkResult,
+    JugadorSugerencia
 )
-from DAL.repositories.jugador_repository import jugador_repository
-from DAL.repositories.equipo_repository import equipo_repository
+from DAL.repositories.jugador_repository import jugador_repository, async_jugador_repository
+from DAL.repositories.equipo_repository import equipo_repository, async_equipo_repository
 from services.validation_service import validation_service
-from services.error_handling import handle_db_errors
-from DAL.file_storage.cdn_service import cdn_service
+from services.jugador_catalog import jugador_catalog, CatalogSnapshot
+from services.response_cache import response_cache
+from services.error_handling import handle_db_errors, handle_db_errors_async
+from DAL.file_storage.cdn_service import cdn_service, ImageBatchError
 from validators.jugador_validator import jugador_validator
 from exceptions.business_exceptions import ValidationError, ConflictError, NotFoundError
 
 def _to_jugador_response(jugador: JugadoresDB) -> JugadorResponse:
-    return JugadorResponse.model_validate(jugador, from_attributes=True)
+    jugador_data = JugadorResponse.model_validate(jugador, from_attributes=True)
+    jugador_data.imagen_srcset = cdn_service.get_srcset(jugador.imagen_url)
+    return jugador_data
 
 def _to_jugador_con_equipo_response(jugador: JugadoresDB) -> JugadorConEquipo:
     jugador_data = JugadorConEquipo.model_validate(jugador, from_attributes=True)
+    jugador_data.imagen_srcset = cdn_service.get_srcset(jugador.imagen_url)
     if jugador.equipo_nfl:
         jugador_data.equipo_nfl = EquipoNFLResponseBasic.model_validate(jugador.equipo_nfl, from_attributes=True)
     return jugador_data
 
+def _catalog_responses(records) -> List[JugadorResponse]:
+    return [record.respuesta() for record in records]
+
+def _filtrar(catalogo: CatalogSnapshot, filters: JugadorFilter, skip: int, limit: int):
+    return catalogo.filtrar(
+        posicion=filters.posicion,
+        equipo_id=filters.equipo_id,
+        activo=filters.activo,
+        nombre=filters.nombre,
+        skip=skip,
+        limit=limit
+    )
+
 class JugadorService:
     """Service for Player CRUD operations"""
     
@@ -64,8 +84,16 @@ class JugadorService:
             raise ValidationError(f"Error al procesar la imagen: {str(e)}")
         
         # Create jugador using repository (commit is handled automatically)
-        db_jugador = jugador_repository.create(jugador_data)
+        try:
+            db_jugador = jugador_repository.create(jugador_data)
+        except Exception:
+            cdn_service.delete_image(saved_image_path)
+            raise
+        # The image reference is taken outside the transaction: release it if the request rolls back
+        cdn_service.delete_image_after_rollback(saved_image_path)
         
+        jugador_catalog.upsert_after_commit([db_jugador])
+        response_cache.invalidate_after_commit("jugadores")
         return db_jugador
 
     @handle_db_errors
@@ -90,6 +118,8 @@ class JugadorService:
     
     def listar_jugadores(self, skip: int = 0, limit: int = 100) -> List[JugadorResponse]:
         """List all players with pagination"""
+        if jugador_catalog.enabled:
+            return _catalog_responses(jugador_catalog.snapshot().filtrar(skip=skip, limit=limit))
         jugadores = jugador_repository.get_multi(skip, limit)
         return [_to_jugador_response(jugador) for jugador in jugadores]
     
@@ -123,7 +153,31 @@ class JugadorService:
             if not equipo:
                 raise NotFoundError("Equipo NFL no encontrado")
         
-        updated_jugador = jugador_repository.update(jugador, actualizacion)
+        # A new image (URL or base64) is stored like on create
+        imagen_anterior = None
+        if actualizacion.imagen_url and actualizacion.imagen_url != jugador.imagen_url:
+            imagen_anterior = jugador.imagen_url
+            try:
+                actualizacion.imagen_url, actualizacion.thumbnail_url = cdn_service.save_image_auto(
+                    actualizacion.imagen_url,
+                    entity_type="jugador"
+                )
+            except ValueError as e:
+                raise ValidationError(f"Error al procesar la imagen: {str(e)}")
+        
+        try:
+            updated_jugador = jugador_repository.update(jugador, actualizacion)
+        except Exception:
+            if imagen_anterior is not None:
+                cdn_service.delete_image(actualizacion.imagen_url)
+            raise
+        jugador_catalog.upsert_after_commit([updated_jugador])
+        response_cache.invalidate_after_commit("jugadores")
+        if imagen_anterior is not None:
+            # Release the replaced image (or the reference the same content just
+            # took again) once the update commits, the new one if it rolls back
+            cdn_service.delete_image_after_commit(imagen_anterior)
+            cdn_service.delete_image_after_rollback(actualizacion.imagen_url)
         return _to_jugador_response(updated_jugador)
     
     def eliminar_jugador(self, jugador_id: UUID) -> bool:
@@ -132,15 +186,32 @@ class JugadorService:
         if not jugador:
             raise NotFoundError("Jugador no encontrado")
         
-        return jugador_repository.delete(jugador_id)
+        eliminado = jugador_repository.delete(jugador_id)
+        if eliminado:
+            jugador_catalog.remove_after_commit([jugador_id])
+            response_cache.invalidate_after_commit("jugadores")
+        if eliminado:
+            # Release the stored image only if the deletion commits
+            # (shared content-addressed files keep other references)
+            cdn_service.delete_image_after_commit(jugador.imagen_url)
+        return eliminado
     
     def buscar_jugadores(self, filters: JugadorFilter, skip: int = 0, limit: int = 100) -> List[JugadorResponse]:
         """Search players with filters"""
+        if jugador_catalog.enabled:
+            return _catalog_responses(_filtrar(jugador_catalog.snapshot(), filters, skip, limit))
         jugadores = jugador_repository.get_with_filters(filters, skip, limit)
         return [_to_jugador_response(jugador) for jugador in jugadores]
     
     def listar_jugadores_por_equipo(self, equipo_id: UUID, skip: int = 0, limit: int = 100) -> List[JugadorResponse]:
         """List all players from a specific NFL team"""
+        if jugador_catalog.enabled:
+            catalogo = jugador_catalog.snapshot()
+            # A team with players in the catalog exists; only empty teams need the lookup
+            if not catalogo.tiene_equipo(equipo_id) and not equipo_repository.get(equipo_id):
+                raise NotFoundError("Equipo NFL no encontrado")
+            return _catalog_responses(catalogo.filtrar(equipo_id=equipo_id, skip=skip, limit=limit))
+        
         # Validate NFL team exists
         equipo = equipo_repository.get(equipo_id)
         if not equipo:
@@ -158,6 +229,8 @@ class JugadorService:
         except ValueError:
             raise ValidationError("Posición inválida")
         
+        if jugador_catalog.enabled:
+            return _catalog_responses(jugador_catalog.snapshot().filtrar(posicion=posicion_enum, skip=skip, limit=limit))
         jugadores = jugador_repository.get_by_posicion(posicion_enum, skip, limit)
         return [_to_jugador_response(jugador) for jugador in jugadores]
     
@@ -191,16 +264,97 @@ class JugadorService:
         jugadores = jugador_repository.get_by_usuario_id(usuario_id, skip, limit)
         return [_to_jugador_response(jugador) for jugador in jugadores]
     
-    def _convert_bulk_to_create(self, jugador_bulk: JugadorBulkCreate, equipo_cache: dict) -> JugadorCreate:
-        """Convert JugadorBulkCreate to JugadorCreate with team lookup"""
-        # Get or cache the NFL team by name
-        if jugador_bulk.equipo_nfl not in equipo_cache:
-            equipo = equipo_repository.get_by_nombre(jugador_bulk.equipo_nfl)
-            if not equipo:
-                raise NotFoundError(f"El equipo NFL '{jugador_bulk.equipo_nfl}' no existe")
-            equipo_cache[jugador_bulk.equipo_nfl] = equipo
+    # ------------------------------------------------------------------
+    # Async read paths (awaited by async routes, do not block the event loop)
+    # ------------------------------------------------------------------
+    
+    @handle_db_errors_async
+    async def listar_jugadores_async(self, skip: int = 0, limit: int = 100) -> List[JugadorResponse]:
+        """List all players with pagination"""
+        if jugador_catalog.enabled:
+            catalogo = await jugador_catalog.snapshot_async()
+            return _catalog_responses(catalogo.filtrar(skip=skip, limit=limit))
+        jugadores = await async_jugador_repository.get_multi(skip, limit)
+        return [_to_jugador_response(jugador) for jugador in jugadores]
+    
+    @handle_db_errors_async
+    async def obtener_jugador_async(self, jugador_id: UUID) -> JugadorResponse:
+        """Get a player by ID"""
+        jugador = await async_jugador_repository.get(jugador_id)
+        if not jugador:
+            raise NotFoundError("Jugador no encontrado")
+        return _to_jugador_response(jugador)
+    
+    @handle_db_errors_async
+    async def obtener_jugador_con_equipo_async(self, jugador_id: UUID) -> JugadorConEquipo:
+        """Get player with NFL team information"""
+        jugador = await async_jugador_repository.get_with_equipo(jugador_id)
+        if not jugador:
+            raise NotFoundError("Jugador no encontrado")
+        return _to_jugador_con_equipo_response(jugador)
+    
+    @handle_db_errors_async
+    async def buscar_jugadores_async(self, filters: JugadorFilter, skip: int = 0, limit: int = 100) -> List[JugadorResponse]:
+        """Search players with filters"""
+        if jugador_catalog.enabled:
+            return _catalog_responses(_filtrar(await jugador_catalog.snapshot_async(), filters, skip, limit))
+        jugadores = await async_jugador_repository.get_with_filters(filters, skip, limit)
+        return [_to_jugador_response(jugador) for jugador in jugadores]
+    
+    @handle_db_errors_async
+    async def sugerir_jugadores_async(self, q: str, limit: int = 10,
+                                      activo: Optional[bool] = None) -> List[JugadorSugerencia]:
+        """Typeahead: top players whose name matches q (accent/case insensitive, typo tolerant)"""
+        jugadores = await async_jugador_repository.search_typeahead(q, limit, activo)
+        return [JugadorSugerencia.model_validate(jugador) for jugador in jugadores]
+    
+    @handle_db_errors_async
+    async def buscar_jugadores_pagina_async(self, filters: JugadorFilter, cursor: Optional[str] = None,
+                                            limit: int = 100) -> Pagina[JugadorResponse]:
+        """Search players with filters, one keyset page at a time (sorted by nombre)"""
+        jugadores, next_cursor = await async_jugador_repository.get_with_filters_page(filters, cursor, limit)
+        return Pagina[JugadorResponse](
+            items=[_to_jugador_response(jugador) for jugador in jugadores],
+            next_cursor=next_cursor
+        )
+    
+    @handle_db_errors_async
+    async def listar_jugadores_por_equipo_async(self, equipo_id: UUID, skip: int = 0, limit: int = 100) -> List[JugadorResponse]:
+        """List all players from a specific NFL team"""
+        if jugador_catalog.enabled:
+            catalogo = await jugador_catalog.snapshot_async()
+            if not catalogo.tiene_equipo(equipo_id) and not await async_equipo_repository.get(equipo_id):
+                raise NotFoundError("Equipo NFL no encontrado")
+            return _catalog_responses(catalogo.filtrar(equipo_id=equipo_id, skip=skip, limit=limit))
+        
+        equipo = await async_equipo_repository.get(equipo_id)
+        if not equipo:
+            raise NotFoundError("Equipo NFL no encontrado")
+        
+        jugadores = await async_jugador_repository.get_by_equipo(equipo_id, skip, limit)
+        return [_to_jugador_response(jugador) for jugador in jugadores]
+    
+    @handle_db_errors_async
+    async def listar_jugadores_por_posicion_async(self, posicion: str, skip: int = 0, limit: int = 100) -> List[JugadorResponse]:
+        """List all players by position"""
+        from models.database_models import PosicionJugadorEnum
+        
+        try:
+            posicion_enum = PosicionJugadorEnum(posicion)
+        except ValueError:
+            raise ValidationError("Posición inválida")
         
-        equipo_nfl = equipo_cache[jugador_bulk.equipo_nfl]
+        if jugador_catalog.enabled:
+            catalogo = await jugador_catalog.snapshot_async()
+            return _catalog_responses(catalogo.filtrar(posicion=posicion_enum, skip=skip, limit=limit))
+        jugadores = await async_jugador_repository.get_by_posicion(posicion_enum, skip, limit)
+        return [_to_jugador_response(jugador) for jugador in jugadores]
+    
+    def _convert_bulk_to_create(self, jugador_bulk: JugadorBulkCreate, equipos_por_nombre: dict) -> JugadorCreate:
+        """Convert JugadorBulkCreate to JugadorCreate using the preloaded NFL teams"""
+        equipo_nfl = equipos_por_nombre.get(jugador_bulk.equipo_nfl.lower())
+        if not equipo_nfl:
+            raise NotFoundError(f"El equipo NFL '{jugador_bulk.equipo_nfl}' no existe")
         
         return JugadorCreate(
             nombre=jugador_bulk.nombre,
@@ -228,15 +382,24 @@ class JugadorService:
         - If required fields missing, player not created and error reported
         """
         errors = []
-        validated_players = []
-        equipo_cache = {}  # Cache to avoid repeated DB queries
+        validated_players = []  # (row number, JugadorCreate)
+        
+        # All NFL teams referenced by the file, in one query
+        equipos_por_nombre = equipo_repository.get_by_nombres(
+            jugador_bulk.equipo_nfl for jugador_bulk in jugadores_data
+        )
         
         # Step 1: Validation and conversion phase
+        vistos = {}  # (equipo_id, nombre) -> first row number, catches duplicates inside the file
         for i, jugador_bulk in enumerate(jugadores_data):
             try:
                 # Convert bulk data to create format and validate
-                jugador_create = self._convert_bulk_to_create(jugador_bulk, equipo_cache)
-                validated_players.append(jugador_create)
+                jugador_create = self._convert_bulk_to_create(jugador_bulk, equipos_por_nombre)
+                clave = (jugador_create.equipo_id, jugador_create.nombre)
+                if clave in vistos:
+                    raise ConflictError(f"Jugador duplicado en el archivo (ver jugador {vistos[clave]})")
+                vistos[clave] = i + 1
+                validated_players.append((i + 1, jugador_create))
                 
             except ValidationError as e:
                 errors.append(f"Jugador {i+1} ({jugador_bulk.nombre if hasattr(jugador_bulk, 'nombre') and jugador_bulk.nombre else 'sin nombre'}): {e.message}")
@@ -247,6 +410,12 @@ class JugadorService:
             except Exception as e:
                 errors.append(f"Jugador {i+1}: Error de validación: {str(e)}")
         
+        # uq_jugador_por_equipo check for the whole file with a single set query
+        existentes = jugador_repository.get_existing_nombre_equipo(vistos.keys())
+        for fila, jugador_create in validated_players:
+            if (jugador_create.equipo_id, jugador_create.nombre) in existentes:
+                errors.append(f"Jugador {fila} ({jugador_create.nombre}): Ya existe un jugador con ese nombre en el equipo")
+        
         # Step 2: If there are any errors, return without creating anything
         if errors:
             return JugadorBulkResult(
@@ -257,56 +426,59 @@ class JugadorService:
                 processed_file=cdn_service.move_processed_file(filename, success=False) if filename else None
             )
         
-        # Step 3: Process images and prepare data for all players
-        players_to_create = []
+        # Step 3: Process images and prepare data for all players (concurrently, all-or-nothing)
+        players_to_create = [jugador_create for _, jugador_create in validated_players]
         try:
-            for jugador_create in validated_players:
-                # Save image and generate thumbnail
-                saved_image_path, saved_thumbnail_path = cdn_service.save_image_auto(
-                    jugador_create.imagen_url,
-                    entity_type="jugador"
-                )
-                
-                # Update paths to local storage
-                jugador_create.imagen_url = saved_image_path
-                jugador_create.thumbnail_url = saved_thumbnail_path
-                players_to_create.append(jugador_create)
-                
-        except ValueError as e:
+            saved_images = cdn_service.save_images_parallel(
+                [jugador_create.imagen_url for jugador_create in players_to_create],
+                entity_type="jugador"
+            )
+        except ImageBatchError as e:
             return JugadorBulkResult(
                 success=False,
                 created_count=0,
-                error_count=1,
-                errors=[f"Error al procesar imágenes: {str(e)}"],
+                error_count=len(e.errors),
+                errors=[
+                    f"Jugador {validated_players[i][0]} ({validated_players[i][1].nombre}): Error al procesar imagen: {msg}"
+                    for i, msg in e.errors
+                ],
                 processed_file=cdn_service.move_processed_file(filename, success=False) if filename else None
             )
         
+        for jugador_create, (saved_image_path, saved_thumbnail_path) in zip(players_to_create, saved_images):
+            # Update paths to local storage
+            jugador_create.imagen_url = saved_image_path
+            jugador_create.thumbnail_url = saved_thumbnail_path
+        
         # Step 4: Create all players in a single transaction
         try:
             from DAL.repositories.db_context import db_context
             
-            with db_context.get_session() as db:
-                created_players = []
-                
-                for jugador_create in players_to_create:
-                    # Create player directly in the transaction
-                    db_jugador = jugador_repository.create(jugador_create)
-                    created_players.append(db_jugador)
-                
-                # Transaction will be committed automatically when context exits
+            # One multi-row INSERT ... RETURNING, committed (or rolled back) as a whole
+            with db_context.unit_of_work() as uow:
+                # The only release of the images saved in step 3: a failure in this
+                # block or a later rollback of the request both roll this unit of work back
+                uow.after_rollback(lambda: cdn_service.delete_images(path for path, _ in saved_images))
+                created_ids = jugador_repository.bulk_create(
+                    [jugador_create.model_dump() for jugador_create in players_to_create]
+                )
+                if jugador_catalog.loaded:
+                    jugador_catalog.upsert_after_commit(jugador_repository.get_catalogo(created_ids))
+                response_cache.invalidate_after_commit("jugadores")
             
-            # Move file to processed folder on success
+            # Name the file is filed under; the router moves it once the unit of work commits
             processed_file = cdn_service.move_processed_file(filename, success=True) if filename else None
             
             return JugadorBulkResult(
                 success=True,
-                created_count=len(created_players),
+                created_count=len(created_ids),
                 error_count=0,
                 errors=[],
                 processed_file=processed_file
             )
             
         except Exception as e:
+            # Nothing was inserted; the rollback hook above releases the images
             return JugadorBulkResult(
                 success=False,
                 created_count=0,
@@ -4,6 +4,8 @@ Business logic service for Liga membership operations
 from typing import List
 from uuid import UUID
 
+from starlette.concurrency import run_in_threadpool
+
 from models.database_models import LigaMiembroDB, LigaMiembroAudDB, EquipoFantasyDB
 from models.liga import LigaMiembroResponse, LigaMiembroCreate
 from DAL.repositories.liga_repository import liga_miembro_repository, liga_cupo_repository
@@ -12,6 +14,9 @@ from DAL.repositories.db_context import db_context
 from validators.liga_validator import LigaValidator
 from validators.usuario_validator import UsuarioValidator
 from services.security_service import security_service
+from services.password_hasher import password_hasher
+from exceptions.business_exceptions import ServiceUnavailableError
+from services.principal_service import principal_service
 
 def _to_miembro_response(miembro: LigaMiembroDB) -> LigaMiembroResponse:
     return LigaMiembroResponse.model_validate(miembro, from_attributes=True)
@@ -23,47 +28,77 @@ class LigaMembresiaService:
         """
         Unirse a una liga.
         """
-        # Validate all requirements for joining
-        liga_validator = LigaValidator()
-        liga = liga_validator.validate_for_join_liga(liga_id, usuario_id, alias, nombre_equipo)
+        # Reject invalid joins with one unlocked query before the (slow) password check
+        liga = LigaValidator().validate_for_join_liga(liga_id, usuario_id, alias, nombre_equipo)
         
         # Verify password
         try:
             password_valid = security_service.verify_password(contrasena, liga.contrasena_hash)
+        except ServiceUnavailableError:
+            raise
         except Exception as e:
             raise ValueError(f"Error al verificar contraseña: {str(e)}")
+        if not password_valid:
+            raise ValueError("Contraseña incorrecta")
         
-        # Create membership, fantasy team, and audit record in a single transaction
-        with db_context.get_session() as db:
-            # Create membership
-            nueva_membresia = LigaMiembroDB(
-                liga_id=liga_id,
-                usuario_id=usuario_id,
-                alias=alias,
-                rol="Manager"
-            )
-            
-            # Create corresponding fantasy team with the specified team name
-            nuevo_equipo_fantasy = EquipoFantasyDB(
-                liga_id=liga_id,
-                usuario_id=usuario_id,
-                nombre=nombre_equipo
-            )
-            
-            # Add audit record
-            audit_record = LigaMiembroAudDB(
-                liga_id=liga_id,
-                usuario_id=usuario_id,
-                accion="unirse"
-            )
-            
-            db.add(nueva_membresia)
-            db.add(nuevo_equipo_fantasy)
-            db.add(audit_record)
-            db.flush()
-            db.refresh(nueva_membresia)
+        return self._completar_union(liga_id, usuario_id, alias, nombre_equipo)
+    
+    async def unirse_liga_async(self, liga_id: UUID, usuario_id: UUID, contrasena: str, alias: str, nombre_equipo: str) -> LigaMiembroResponse:
+        """unirse_liga awaiting the password check instead of blocking a thread"""
+        liga = await run_in_threadpool(
+            LigaValidator().validate_for_join_liga, liga_id, usuario_id, alias, nombre_equipo
+        )
+        
+        try:
+            password_valid = await password_hasher.verify_async(contrasena, liga.contrasena_hash)
+        except ServiceUnavailableError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error al verificar contraseña: {str(e)}")
+        if not password_valid:
+            raise ValueError("Contraseña incorrecta")
+        
+        return await run_in_threadpool(self._completar_union, liga_id, usuario_id, alias, nombre_equipo)
+    
+    def _completar_union(self, liga_id: UUID, usuario_id: UUID, alias: str, nombre_equipo: str) -> LigaMiembroResponse:
+        # Re-validate under the league row lock and create membership, fantasy team
+        # and audit record in the same transaction
+        with db_context.unit_of_work():
+            LigaValidator().validate_for_join_liga(liga_id, usuario_id, alias, nombre_equipo, lock=True)
             
-            return _to_miembro_response(nueva_membresia)
+            with db_context.get_session() as db:
+                # Create membership
+                nueva_membresia = LigaMiembroDB(
+                    liga_id=liga_id,
+                    usuario_id=usuario_id,
+                    alias=alias,
+                    rol="Manager"
+                )
+                
+                # Create corresponding fantasy team with the specified team name
+                nuevo_equipo_fantasy = EquipoFantasyDB(
+                    liga_id=liga_id,
+                    usuario_id=usuario_id,
+                    nombre=nombre_equipo
+                )
+                
+                # Add audit record
+                audit_record = LigaMiembroAudDB(
+                    liga_id=liga_id,
+                    usuario_id=usuario_id,
+                    accion="unirse"
+                )
+                
+                db.add(nueva_membresia)
+                db.add(nuevo_equipo_fantasy)
+                db.add(audit_record)
+                db.flush()
+                db.refresh(nueva_membresia)
+                respuesta = _to_miembro_response(nueva_membresia)
+        
+        # League memberships are part of the cached principal
+        principal_service.invalidate_after_commit(usuario_id)
+        return respuesta
     
     def salir_liga(self,liga_id: UUID, usuario_id: UUID) -> bool:
         """Leave a league"""
@@ -88,6 +123,7 @@ class LigaMembresiaService:
             if equipo_fantasy:
                 equipo_fantasy_repository.delete(equipo_fantasy.id)
             liga_miembro_repository.delete(membresia.id)
+            principal_service.invalidate_after_commit(usuario_id)
             return True
             
         except Exception as e:
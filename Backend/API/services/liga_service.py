@@ -1,15 +1,19 @@
-from typing import List
+from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
 from uuid import UUID
 
 from models.database_models import LigaDB, LigaMiembroDB
+from models.pagination import Pagina
 from models.liga import (
     LigaCreate, LigaUpdate, LigaResponse, 
-    LigaMiembroResponse, LigaConMiembros, LigaFilter
+    LigaMiembroResponse, LigaConMiembros, LigaFilter, LigaDirectorioItem
 )
-from DAL.repositories.liga_repository import liga_repository, liga_miembro_repository
+from DAL.repositories.liga_repository import liga_repository, liga_miembro_repository, async_liga_repository
 from services.security_service import security_service
+from services.password_hasher import password_hasher
 from services.liga_membresia_service import liga_membresia_service
-from services.error_handling import handle_db_errors
+from services.principal_service import principal_service
+from services.error_handling import handle_db_errors, handle_db_errors_async
 from validators.liga_validator import LigaValidator
 from exceptions.business_exceptions import NotFoundError
 
@@ -28,14 +32,23 @@ class LigaService:
         Crear una nueva liga con todas las validaciones y configuraciones por defecto.
         
         """
+        self._validar_creacion(liga)
+        return self._crear_liga(liga, security_service.hash_password(liga.contrasena))
+    
+    @handle_db_errors_async
+    async def crear_liga_async(self, liga: LigaCreate) -> LigaResponse:
+        """crear_liga awaiting the password hash instead of blocking a thread"""
+        await run_in_threadpool(self._validar_creacion, liga)
+        contrasena_hash = await password_hasher.hash_async(liga.contrasena)
+        return await run_in_threadpool(self._crear_liga, liga, contrasena_hash)
+    
+    def _validar_creacion(self, liga: LigaCreate) -> None:
         # Validate all requirements for creating a league
         validator = LigaValidator()
         validator.validate_for_create(liga.nombre, liga.temporada_id, liga.comisionado_id)
-        
-        # Validate and hash password
         security_service.validate_password_strength(liga.contrasena)
-        contrasena_hash = security_service.hash_password(liga.contrasena)
-        
+    
+    def _crear_liga(self, liga: LigaCreate, contrasena_hash: str) -> LigaResponse:
         # Prepare league data
         datos_liga = liga.model_dump(exclude={'contrasena', 'nombre_equipo_comisionado'})
         datos_liga['contrasena_hash'] = contrasena_hash
@@ -44,6 +57,8 @@ class LigaService:
         # This would ideally be a single repository method, but for now we'll note this
         # TODO: Move this complex transaction to liga_repository.create_with_commissioner()
         nueva_liga = liga_repository.create(datos_liga)
+        # The commissioner's membership is part of their cached principal
+        principal_service.invalidate_after_commit(liga.comisionado_id)
         
         return _to_liga_response(nueva_liga)
     
@@ -65,6 +80,46 @@ class LigaService:
             raise NotFoundError("Liga no encontrada")
         return _to_liga_response(liga)
     
+    @handle_db_errors_async
+    async def listar_ligas_async(self, skip: int = 0, limit: int = 100) -> List[LigaResponse]:
+        """List all leagues with pagination (async)"""
+        ligas = await async_liga_repository.get_multi(skip, limit)
+        return [_to_liga_response(liga) for liga in ligas]
+    
+    @handle_db_errors_async
+    async def buscar_ligas_async(self, filtros: LigaFilter, skip: int = 0, limit: int = 100) -> List[LigaResponse]:
+        """Search leagues with filters (async)"""
+        ligas = await async_liga_repository.search_with_filter(filtros, skip, limit)
+        return [_to_liga_response(liga) for liga in ligas]
+    
+    @handle_db_errors_async
+    async def buscar_ligas_pagina_async(self, filtros: LigaFilter, cursor: Optional[str] = None,
+                                        limit: int = 100) -> Pagina[LigaResponse]:
+        """Search leagues with filters, one keyset page at a time (sorted by creado_en)"""
+        ligas, next_cursor = await async_liga_repository.search_with_filter_page(filtros, cursor, limit)
+        return Pagina[LigaResponse](
+            items=[_to_liga_response(liga) for liga in ligas],
+            next_cursor=next_cursor
+        )
+    
+    @handle_db_errors_async
+    async def listar_directorio_async(self, filtros: LigaFilter, cursor: Optional[str] = None,
+                                      limit: int = 100) -> Pagina[LigaDirectorioItem]:
+        """League directory page: season, commissioner alias and capacity in a single query"""
+        filas, next_cursor = await async_liga_repository.get_directorio_page(filtros, cursor, limit)
+        return Pagina[LigaDirectorioItem](
+            items=[LigaDirectorioItem.model_validate(fila, from_attributes=True) for fila in filas],
+            next_cursor=next_cursor
+        )
+    
+    @handle_db_errors_async
+    async def obtener_liga_async(self, liga_id: UUID) -> LigaResponse:
+        """Get a league by ID (async)"""
+        liga = await async_liga_repository.get(liga_id)
+        if not liga:
+            raise NotFoundError("Liga no encontrada")
+        return _to_liga_response(liga)
+    
     def obtener_liga_con_miembros(self, liga_id: UUID) -> LigaConMiembros:
         """Get league with its members"""
         liga = liga_repository.get_with_miembros(liga_id)
@@ -98,17 +153,19 @@ class LigaService:
         """Join a league using the dedicated service"""
         return liga_membresia_service.unirse_liga(liga_id, usuario_id, contrasena, alias, nombre_equipo)
     
+    async def unirse_liga_async(self, liga_id: UUID, usuario_id: UUID, contrasena: str, alias: str, nombre_equipo: str) -> LigaMiembroResponse:
+        """Join a league without holding a threadpool slot during the password check"""
+        return await liga_membresia_service.unirse_liga_async(liga_id, usuario_id, contrasena, alias, nombre_equipo)
+    
     def obtener_info_cupos(self, liga_id: UUID) -> dict:
         """Get league capacity information"""
-        validator = LigaValidator()
-        liga = validator.validate_exists(liga_id)
-        current_members = validator.get_liga_current_members_count(liga_id)
+        equipos_max, current_members = LigaValidator.get_liga_capacidad(liga_id)
         
         return {
-            "equipos_max": liga.equipos_max,
+            "equipos_max": equipos_max,
             "miembros_actuales": current_members,
-            "cupos_disponibles": liga.equipos_max - current_members,
-            "esta_llena": current_members >= liga.equipos_max
+            "cupos_disponibles": equipos_max - current_members,
+            "esta_llena": current_members >= equipos_max
         }
     
 liga_service = LigaService()
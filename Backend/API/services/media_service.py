@@ -1,15 +1,18 @@
 """
 Business logic service for Media operations with separation of concerns
 """
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 from uuid import UUID
 from datetime import datetime
 
 from models.media import MediaCreate, MediaUpdate, MediaResponse
 from models.database_models import MediaDB
 from DAL.repositories.media_repository import media_repository
+from DAL.file_storage.cdn_service import cdn_service
 def _to_media_response(media: MediaDB) -> MediaResponse:
-    return MediaResponse.model_validate(media, from_attributes=True)
+    media_data = MediaResponse.model_validate(media, from_attributes=True)
+    media_data.srcset = cdn_service.get_srcset(media.url)
+    return media_data
 
 class MediaService:
     """Service for Media CRUD operations"""
@@ -76,35 +79,47 @@ class MediaService:
             return False
         return media_repository.delete_by_equipo(equipo_id)
 
-    def subir_imagen(self, equipo_id: UUID, filename: str) -> MediaResponse:
-        """Create media entry for uploaded image
+    def subir_imagen(self, equipo_id: UUID, file: BinaryIO, filename: str) -> MediaResponse:
+        """Store an uploaded image and create/update the team's media entry
         
         Args:
-            db: Database session
             equipo_id: Team ID
+            file: Uploaded file object (read in chunks, never fully in memory)
             filename: Uploaded file name
             
         Returns:
             MediaResponse with uploaded image URL
+            
+        Raises:
+            ValueError: If the file is not a valid image or is too large
         """
-        imagen_url = f"/media/equipos/{equipo_id}/{filename}"
+        imagen_url, _ = cdn_service.save_uploaded_stream(file, filename, entity_type="equipo")
         
         # Check if media already exists for this team
         existing_media = media_repository.get_by_equipo(equipo_id)
         
-        if existing_media:
-            # Update existing media
-            update_data = MediaUpdate(url=imagen_url)
-            updated_media = media_repository.update(existing_media, update_data)
-            return _to_media_response(updated_media)
-        else:
-            # Create new media
-            media_data = MediaCreate(
-                equipo_id=equipo_id,
-                url=imagen_url
-            )
-            new_media = media_repository.create(media_data)
-            return _to_media_response(new_media)
+        try:
+            if existing_media:
+                # Update existing media
+                imagen_anterior = existing_media.url
+                update_data = MediaUpdate(url=imagen_url)
+                media = media_repository.update(existing_media, update_data)
+                # Release the replaced image once the update commits; with content
+                # addressing the same upload maps to the same path and still took
+                # a reference of its own
+                cdn_service.delete_image_after_commit(imagen_anterior)
+            else:
+                # Create new media
+                media_data = MediaCreate(
+                    equipo_id=equipo_id,
+                    url=imagen_url
+                )
+                media = media_repository.create(media_data)
+        except Exception:
+            cdn_service.delete_image(imagen_url)
+            raise
+        cdn_service.delete_image_after_rollback(imagen_url)
+        return _to_media_response(media)
 
     def equipos_con_media(self) -> List[UUID]:
         """Get list of team IDs that have media
@@ -128,8 +143,10 @@ class MediaService:
         
         if existing_media:
             # Update existing media
+            imagen_anterior = existing_media.url
             update_data = MediaUpdate(url=imagen_generada_url)
             updated_media = media_repository.update(existing_media, update_data)
+            cdn_service.delete_image_after_commit(imagen_anterior)
             return _to_media_response(updated_media)
         else:
             # Create new media
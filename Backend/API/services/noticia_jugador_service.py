@@ -12,7 +12,7 @@ from models.jugador import (
 from models.database_models import NoticiaJugadorDB
 from DAL.repositories.noticia_jugador_repository import noticia_jugador_repository
 from DAL.repositories.jugador_repository import jugador_repository
-from DAL.repositories.usuario_repository import usuario_repository
+from services.principal_service import Principal
 from validators.jugador_validator import JugadorValidator
 from exceptions.business_exceptions import ValidationError
 
@@ -45,7 +45,7 @@ class NoticiaJugadorService:
         self, 
         jugador_id: UUID, 
         noticia_data: NoticiaJugadorCreate, 
-        author_id: UUID
+        author: Principal
     ) -> NoticiaJugadorResponse:
         """
         Create a new player news item.
@@ -67,13 +67,10 @@ class NoticiaJugadorService:
             noticia_data.designacion
         )
         
-        # Validate author exists and is administrator
-        author = usuario_repository.get(author_id)
-        if not author:
-            raise ValidationError(f"El usuario autor con ID {author_id} no existe")
-        if author.rol.value != "administrador":
+        # Validate author is an active administrator (from the authenticated principal)
+        if not author.es_administrador:
             raise ValidationError("Solo los administradores pueden crear noticias de jugadores")
-        if author.estado.value != "activa":
+        if not author.esta_activo:
             raise ValidationError("El usuario autor debe estar activo")
         
         # For non-injury news, clear injury-specific fields
@@ -83,7 +80,7 @@ class NoticiaJugadorService:
         
         # Create the news item
         nueva_noticia = noticia_jugador_repository.create_with_author(
-            jugador_id, noticia_data, author_id
+            jugador_id, noticia_data, author.id
         )
         
         return _to_noticia_response(nueva_noticia)
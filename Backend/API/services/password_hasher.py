@@ -0,0 +1,119 @@
+"""
+Bounded worker pool for bcrypt hashing and verification
+
+bcrypt is deliberately slow (~250ms per call). Running it on a small
+dedicated pool caps how much CPU a login storm can take, and rejecting work
+once the queue is full (ServiceUnavailableError -> 503) keeps latency bounded
+instead of letting every other endpoint wait behind queued hashes.
+bcrypt releases the GIL while hashing, so threads run it in parallel.
+
+Async routes must use hash_async/verify_async: they wait on the event loop,
+so a queued hash holds no threadpool slot (anyio's default limiter has 40
+threads, fewer than workers + queue_size) and a login storm cannot starve
+the sync routes and dependencies that run there.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+import bcrypt
+
+from exceptions.business_exceptions import ServiceUnavailableError
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+# Jobs allowed to wait for a worker before new ones are rejected
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "64"))
+
+
+class PasswordHasher:
+    """Runs password hashing on a bounded pool with queue-depth metrics"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_size: int = PASSWORD_HASH_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0  # queued + running
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+
+    def _submit(self, func: Callable[..., Any], *args) -> Future:
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self._rejected += 1
+                raise ServiceUnavailableError(
+                    "El servidor está procesando demasiadas solicitudes. Inténtelo de nuevo en unos segundos.",
+                    error_code="PASSWORD_POOL_SATURATED",
+                )
+            self._pending += 1
+        enqueued = time.perf_counter()
+
+        def run():
+            waited_ms = (time.perf_counter() - enqueued) * 1000
+            with self._lock:
+                self._running += 1
+                self._wait_total_ms += waited_ms
+                self._wait_max_ms = max(self._wait_max_ms, waited_ms)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+
+        try:
+            return self._executor.submit(run)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    @staticmethod
+    def _hash(password: str) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+    @staticmethod
+    def _verify(password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def hash(self, password: str) -> str:
+        """Hash a password on the pool (blocks the calling thread; scripts and sync callers only)"""
+        return self._submit(self._hash, password).result()
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """Verify a password on the pool (blocks the calling thread; scripts and sync callers only)"""
+        return self._submit(self._verify, password, hashed).result()
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a password on the pool without holding a threadpool slot while waiting"""
+        return await asyncio.wrap_future(self._submit(self._hash, password))
+
+    async def verify_async(self, password: str, hashed: str) -> bool:
+        """Verify a password on the pool without holding a threadpool slot while waiting"""
+        return await asyncio.wrap_future(self._submit(self._verify, password, hashed))
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool metrics (used by /health/passwords)"""
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_avg_ms": round(self._wait_total_ms / started, 3) if started else 0.0,
+                "wait_max_ms": round(self._wait_max_ms, 3),
+            }
+
+
+# Singleton instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,118 @@
+"""
+Authenticated principal (who is calling) with a short-TTL cache
+
+get_current_user resolves the user's role, state and league memberships once
+per request from this cache, so write paths can check permissions without
+re-reading the usuarios row. Entries are dropped once the transaction that
+changes rol/estado (through usuario_repository) or a membership commits.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+from uuid import UUID
+
+from DAL.repositories.db_context import db_context
+from DAL.repositories.usuario_repository import usuario_repository
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+
+
+class Principal:
+    """The authenticated user of a request
+
+    Also answers principal["user_id"] / principal.get("session_id") for code
+    written against the old dict returned by get_current_user.
+    """
+
+    __slots__ = ("id", "session_id", "rol", "estado", "ligas")
+
+    def __init__(self, id: UUID, session_id: Optional[str], rol: str, estado: str, ligas: FrozenSet[UUID]):
+        self.id = id
+        self.session_id = session_id
+        self.rol = rol
+        self.estado = estado
+        self.ligas = ligas
+
+    @property
+    def user_id(self) -> str:
+        return str(self.id)
+
+    @property
+    def es_administrador(self) -> bool:
+        return self.rol == "administrador"
+
+    @property
+    def esta_activo(self) -> bool:
+        return self.estado == "activa"
+
+    def es_miembro(self, liga_id: UUID) -> bool:
+        return liga_id in self.ligas
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "user_id":
+            return self.user_id
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key != "user_id" and key not in self.__slots__:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id}, rol={self.rol}, estado={self.estado})"
+
+
+class PrincipalService:
+    """Loads principals and caches them per user for PRINCIPAL_CACHE_TTL_SECONDS"""
+
+    def __init__(self, ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # user id -> (expires_at, rol, estado, ligas)
+        self._cache: Dict[UUID, Tuple[float, str, str, FrozenSet[UUID]]] = {}
+        # Bumped by every invalidation; a load that overlaps one is not kept
+        self._generation = 0
+        usuario_repository.on_principal_change(self.invalidate_after_commit)
+
+    def get_principal(self, user_id: UUID, session_id: Optional[str] = None) -> Optional[Principal]:
+        """Principal for user_id, or None if the user no longer exists"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(user_id)
+        if entry is None or entry[0] <= now:
+            generation = self._generation
+            data = usuario_repository.get_principal_data(user_id)
+            if data is None:
+                self.invalidate(user_id)
+                return None
+            rol, estado, ligas = data
+            entry = (
+                now + self.ttl_seconds,
+                getattr(rol, "value", rol),
+                getattr(estado, "value", estado),
+                frozenset(ligas),
+            )
+            with self._lock:
+                if self._generation == generation:
+                    self._cache[user_id] = entry
+        _, rol, estado, ligas = entry
+        return Principal(user_id, session_id, rol, estado, ligas)
+
+    def invalidate(self, user_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cache.pop(user_id, None)
+
+    def invalidate_after_commit(self, user_id: UUID) -> None:
+        """Drop user_id once the current transaction commits
+
+        Call after a rol/estado or membership write, inside the same unit of work.
+        """
+        db_context.after_commit(lambda: self.invalidate(user_id))
+
+
+# Singleton instance
+principal_service = PrincipalService()
@@ -0,0 +1,127 @@
+"""
+Cache of encoded JSON list responses
+
+Hot list pages (players, NFL teams) are stored as the final JSON bytes with
+their ETag, so repeat requests skip ORM hydration, Pydantic validation and
+serialization entirely. Entries are grouped by namespace; services drop a
+namespace after their writes commit, and every entry also expires after
+RESPONSE_CACHE_TTL_SECONDS so writes made by other workers show up.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import orjson
+
+from DAL.repositories.db_context import db_context
+
+RESPONSE_CACHE_MAX_BYTES = int(float(os.getenv("RESPONSE_CACHE_MAX_MB", "64")) * 1024 * 1024)
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+
+
+class CachedResponse:
+    """Encoded body plus its strong ETag"""
+
+    __slots__ = ("body", "etag", "expires_at")
+
+    def __init__(self, body: bytes, expires_at: float):
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """Byte-bounded LRU of encoded responses keyed by (namespace, key)"""
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int, Hashable], CachedResponse]" = OrderedDict()
+        # Bumped on invalidation so responses built from older data are not stored
+        self._generations: Dict[str, int] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def get(self, namespace: str, key: Hashable) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            cache_key = (namespace, self.generation(namespace), key)
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                self._remove(cache_key)
+            self.misses += 1
+            return None
+
+    def put(self, namespace: str, key: Hashable, data: Any, generation: int) -> CachedResponse:
+        """Encode data with orjson and store it, unless the namespace changed since generation"""
+        entry = CachedResponse(orjson.dumps(data), time.monotonic() + self.ttl_seconds)
+        if len(entry.body) > self.max_bytes:
+            return entry
+        with self._lock:
+            if generation != self.generation(namespace):
+                return entry
+            cache_key = (namespace, generation, key)
+            self._remove(cache_key)
+            self._entries[cache_key] = entry
+            self._size += len(entry.body)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def invalidate(self, *namespaces: str) -> None:
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self.generation(namespace) + 1
+                for cache_key in [k for k in self._entries if k[0] == namespace]:
+                    self._remove(cache_key)
+            self.invalidations += 1
+
+    def invalidate_after_commit(self, *namespaces: str) -> None:
+        """Drop namespaces once the current transaction commits"""
+        db_context.after_commit(lambda: self.invalidate(*namespaces))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, cache_key: Tuple[str, int, Hashable]) -> None:
+        # Caller holds the lock
+        entry = self._entries.pop(cache_key, None)
+        if entry is not None:
+            self._size -= len(entry.body)
+
+
+def to_jsonable(data: Any) -> Any:
+    """Pydantic model(s) -> the same JSON-compatible values FastAPI would send"""
+    if isinstance(data, (list, tuple)):
+        return [to_jsonable(item) for item in data]
+    if hasattr(data, "model_dump"):
+        return data.model_dump(mode="json")
+    return data
+
+
+# Singleton instance
+response_cache = ResponseCache()
@@ -1,19 +1,20 @@
 """
 Security utilities for password hashing and verification
 """
-import bcrypt
+from services.password_hasher import password_hasher
+
 class SecurityService:
     """Service for handling security-related operations"""
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        """Hash a password using bcrypt (on the password hashing pool)"""
+        return password_hasher.hash(password)
     
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
-        """Verify a password against its hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        """Verify a password against its hash (on the password hashing pool)"""
+        return password_hasher.verify(password, hashed)
     
     @staticmethod
     def validate_password_strength(password: str) -> None:
@@ -0,0 +1,237 @@
+"""
+Session stores for AuthService
+
+Sessions are indexed by session_id and by user_id so token verification,
+logout and "close all sessions" never scan every session. The backend is
+chosen with SESSION_STORE:
+
+- memory: process local, for tests and single-worker development
+- postgres: the `sesiones` table, shared by every uvicorn worker
+  (run SQL_scripts/create_sesiones_table.sql first)
+"""
+import heapq
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").strip().lower()
+SESSION_INACTIVITY_SECONDS = int(os.getenv("SESSION_INACTIVITY_HOURS", "12")) * 3600
+# How often buffered last_activity updates are written to a shared store
+SESSION_FLUSH_SECONDS = int(os.getenv("SESSION_FLUSH_SECONDS", "30"))
+
+
+class SessionStore(ABC):
+    """Storage for active sessions
+
+    Session records are dicts with user_id, created_at, expires_at and
+    last_activity (epoch seconds).
+    """
+
+    # True when every worker sees the same sessions, so an unknown session id
+    # means the session was closed rather than created by another worker
+    shared = False
+
+    def __init__(self, inactivity_seconds: int = SESSION_INACTIVITY_SECONDS):
+        self.inactivity_seconds = inactivity_seconds
+
+    @abstractmethod
+    def create(self, session_id: str, user_id: str, expires_at: float) -> None:
+        """Register a new session"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session record, or None if unknown"""
+
+    @abstractmethod
+    def touch(self, session_id: str, now: float) -> None:
+        """Record activity on a session"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Remove one session"""
+
+    @abstractmethod
+    def delete_user(self, user_id: str) -> int:
+        """Remove every session of a user; returns how many were removed"""
+
+    @abstractmethod
+    def count_user(self, user_id: str) -> int:
+        """Number of live sessions of a user"""
+
+    def flush(self) -> None:
+        """Write back buffered state (no-op for stores without buffering)"""
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store; expired sessions are purged from a heap as time passes"""
+
+    def __init__(self, inactivity_seconds: int = SESSION_INACTIVITY_SECONDS):
+        super().__init__(inactivity_seconds)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._by_user: Dict[str, Set[str]] = {}
+        self._expiry: List[Tuple[float, str]] = []  # (expires_at, session_id)
+
+    def _purge_expired(self, now: float) -> None:
+        # Caller holds the lock; amortized O(1) per session
+        while self._expiry and self._expiry[0][0] <= now:
+            _, session_id = heapq.heappop(self._expiry)
+            self._remove(session_id)
+
+    def _remove(self, session_id: str) -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        user_sessions = self._by_user.get(session["user_id"])
+        if user_sessions is not None:
+            user_sessions.discard(session_id)
+            if not user_sessions:
+                del self._by_user[session["user_id"]]
+        return True
+
+    def create(self, session_id: str, user_id: str, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            self._sessions[session_id] = {
+                "user_id": user_id,
+                "created_at": now,
+                "expires_at": expires_at,
+                "last_activity": now,
+            }
+            self._by_user.setdefault(user_id, set()).add(session_id)
+            heapq.heappush(self._expiry, (expires_at, session_id))
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return dict(session) if session is not None else None
+
+    def touch(self, session_id: str, now: float) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session["last_activity"] = now
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._remove(session_id)
+
+    def delete_user(self, user_id: str) -> int:
+        with self._lock:
+            session_ids = list(self._by_user.get(user_id, ()))
+            for session_id in session_ids:
+                self._remove(session_id)
+            return len(session_ids)
+
+    def count_user(self, user_id: str) -> int:
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            return sum(
+                1 for session_id in self._by_user.get(user_id, ())
+                if now - self._sessions[session_id]["last_activity"] <= self.inactivity_seconds
+            )
+
+
+class PostgresSessionStore(SessionStore):
+    """Store backed by the `sesiones` table
+
+    Lookups are primary-key reads. last_activity is buffered per worker and
+    written back in one batch every SESSION_FLUSH_SECONDS, so the inactivity
+    window seen by other workers may lag by up to that interval.
+    """
+
+    shared = True
+
+    def __init__(self, inactivity_seconds: int = SESSION_INACTIVITY_SECONDS,
+                 flush_seconds: int = SESSION_FLUSH_SECONDS):
+        super().__init__(inactivity_seconds)
+        from DAL.repositories.sesion_repository import sesion_repository
+        self._repository = sesion_repository
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def _to_datetime(ts: float) -> datetime:
+        return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+    def create(self, session_id: str, user_id: str, expires_at: float) -> None:
+        self._repository.crear(
+            session_id, UUID(str(user_id)), self._to_datetime(expires_at), self._to_datetime(time.time())
+        )
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        sesion = self._repository.get_by_session_id(session_id)
+        if sesion is None:
+            return None
+        last_activity = sesion.ultima_actividad.timestamp()
+        with self._lock:
+            last_activity = max(last_activity, self._pending.get(session_id, 0.0))
+        return {
+            "user_id": str(sesion.usuario_id),
+            "created_at": sesion.creado_en.timestamp(),
+            "expires_at": sesion.expira_en.timestamp(),
+            "last_activity": last_activity,
+        }
+
+    def touch(self, session_id: str, now: float) -> None:
+        with self._lock:
+            self._pending[session_id] = now
+            due = time.monotonic() - self._last_flush >= self.flush_seconds
+        if due:
+            try:
+                self.flush()
+            except Exception:
+                # Activity stays buffered; verifying the token must not fail on write-back
+                pass
+
+    def flush(self) -> None:
+        """Write buffered activity in one round trip and purge dead sessions"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        now = time.time()
+        try:
+            self._repository.touch_many({sid: self._to_datetime(ts) for sid, ts in pending.items()})
+            self._repository.purge(self._to_datetime(now - self.inactivity_seconds), self._to_datetime(now))
+        except Exception:
+            # Keep the activity for the next attempt (newer values win)
+            with self._lock:
+                for sid, ts in pending.items():
+                    if ts > self._pending.get(sid, 0.0):
+                        self._pending[sid] = ts
+            raise
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._pending.pop(session_id, None)
+        self._repository.delete_by_session_id(session_id)
+
+    def delete_user(self, user_id: str) -> int:
+        session_ids = self._repository.delete_by_usuario(UUID(str(user_id)))
+        with self._lock:
+            for session_id in session_ids:
+                self._pending.pop(session_id, None)
+        return len(session_ids)
+
+    def count_user(self, user_id: str) -> int:
+        now = time.time()
+        return self._repository.count_by_usuario(
+            UUID(str(user_id)), self._to_datetime(now - self.inactivity_seconds), self._to_datetime(now)
+        )
+
+
+def build_session_store(kind: str = SESSION_STORE) -> SessionStore:
+    """Create the store selected by SESSION_STORE"""
+    if kind == "memory":
+        return InMemorySessionStore()
+    if kind == "postgres":
+        return PostgresSessionStore()
+    raise ValueError(f"SESSION_STORE desconocido: {kind}")
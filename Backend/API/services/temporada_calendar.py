@@ -0,0 +1,212 @@
+"""
+In-process cache of the current season and its week calendar
+
+The current season and its weeks change a few times a year but "which week
+is it" is needed on every scoring, lineup-lock and waiver computation. The
+calendar keeps an immutable snapshot of the current TemporadaDB and its
+TemporadaSemanaDB rows, with the week start dates sorted so the week that
+contains a date is found by bisection.
+
+TemporadaService writes drop this worker's snapshot once their transaction
+commits and NOTIFY the temporada_calendar channel in the same transaction;
+every worker LISTENs on that channel from a background thread and drops its
+snapshot too. TEMPORADA_CALENDAR_TTL_SECONDS bounds staleness if the
+listener is disabled or disconnected. LISTEN needs a session-mode connection,
+so behind a transaction-mode PgBouncer the listener only runs when
+DIRECT_DATABASE_URL points at the server.
+"""
+import os
+import select
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy.engine import make_url
+
+from database import DB_APPLICATION_NAME, DIRECT_DATABASE_URL
+from DAL.repositories.db_context import db_context
+from DAL.repositories.temporada_repository import (
+    CALENDAR_CHANNEL,
+    temporada_repository,
+    temporada_semana_repository,
+)
+from models.temporada import TemporadaResponse, TemporadaSemanaResponse
+
+TEMPORADA_CALENDAR_TTL_SECONDS = float(os.getenv("TEMPORADA_CALENDAR_TTL_SECONDS", "300"))
+TEMPORADA_CALENDAR_LISTEN = os.getenv("TEMPORADA_CALENDAR_LISTEN", "true").strip().lower() == "true"
+
+# Seconds between reconnect attempts of the listener, and between stop checks
+_LISTEN_RETRY_SECONDS = 5.0
+_LISTEN_POLL_SECONDS = 1.0
+
+
+class CalendarSnapshot:
+    """Current season and its weeks, indexed by start date"""
+
+    __slots__ = ("temporada", "semanas", "_inicios", "_por_inicio", "_por_numero", "loaded_at")
+
+    def __init__(self, temporada: Optional[TemporadaResponse], semanas: Sequence[TemporadaSemanaResponse]):
+        self.temporada = temporada
+        self.semanas: Tuple[TemporadaSemanaResponse, ...] = tuple(semanas)
+        self._por_inicio = sorted(self.semanas, key=lambda s: s.fecha_inicio)
+        self._inicios: List[date] = [s.fecha_inicio for s in self._por_inicio]
+        self._por_numero = {s.numero: s for s in self.semanas}
+        self.loaded_at = time.monotonic()
+
+    def semana_para(self, fecha: date) -> Optional[TemporadaSemanaResponse]:
+        """Week whose [fecha_inicio, fecha_fin] range contains fecha, if any"""
+        if isinstance(fecha, datetime):
+            fecha = fecha.date()
+        # Weeks never overlap (TemporadaValidator): only the last one starting
+        # on or before fecha can contain it
+        i = bisect_right(self._inicios, fecha) - 1
+        if i < 0:
+            return None
+        semana = self._por_inicio[i]
+        return semana if fecha <= semana.fecha_fin else None
+
+    def semana(self, numero: int) -> Optional[TemporadaSemanaResponse]:
+        return self._por_numero.get(numero)
+
+
+class TemporadaCalendar:
+    """Holds the calendar snapshot, reloads it when dropped or expired and listens for changes"""
+
+    def __init__(self, ttl_seconds: float = TEMPORADA_CALENDAR_TTL_SECONDS, listen: bool = TEMPORADA_CALENDAR_LISTEN):
+        self.ttl_seconds = ttl_seconds
+        self.listen = listen
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CalendarSnapshot] = None
+        # Bumped by every invalidation; a load that overlaps one is not kept
+        self._generation = 0
+        self._listener: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.listening = False
+        self.loads = 0
+        self.invalidations = 0
+        self.notifications = 0
+
+    def _fresh(self) -> Optional[CalendarSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl_seconds:
+            return snapshot
+        return None
+
+    def snapshot(self) -> CalendarSnapshot:
+        """Current snapshot, loading it with two queries when missing or expired"""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        generation = self._generation
+        temporada = temporada_repository.get_actual()
+        semanas = temporada_semana_repository.get_by_temporada(temporada.id) if temporada else []
+        snapshot = CalendarSnapshot(
+            TemporadaResponse.model_validate(temporada, from_attributes=True) if temporada else None,
+            [TemporadaSemanaResponse.model_validate(s, from_attributes=True) for s in semanas],
+        )
+        with self._lock:
+            self.loads += 1
+            if self._generation == generation:
+                self._snapshot = snapshot
+        return snapshot
+
+    def temporada_actual(self) -> Optional[TemporadaResponse]:
+        return self.snapshot().temporada
+
+    def semana_actual(self, fecha: Optional[date] = None) -> Optional[TemporadaSemanaResponse]:
+        """Week of the current season containing fecha (today by default)"""
+        return self.snapshot().semana_para(fecha or date.today())
+
+    def invalidate(self) -> None:
+        """Forget the snapshot; the next read reloads it"""
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+            self.invalidations += 1
+
+    def invalidate_after_commit(self) -> None:
+        """Drop the calendar in every worker once the current transaction commits
+
+        Call after a season or week write, inside the same unit of work.
+        """
+        temporada_repository.notify_calendar_changed()
+        db_context.after_commit(self.invalidate)
+
+    # LISTEN ---------------------------------------------------------------
+
+    def start_listener(self) -> None:
+        """Start the background LISTEN thread (no-op when disabled or running)"""
+        if self.listen and DIRECT_DATABASE_URL is None:
+            # Through a transaction-mode PgBouncer LISTEN never receives a NOTIFY
+            print("Temporada calendar listener disabled: DB_PGBOUNCER is set and DIRECT_DATABASE_URL is not")
+            self.listen = False
+        if not self.listen or (self._listener is not None and self._listener.is_alive()):
+            return
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen_loop, name="temporada-calendar-listener", daemon=True)
+        self._listener.start()
+
+    def stop_listener(self) -> None:
+        self._stop.set()
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.join(timeout=_LISTEN_POLL_SECONDS * 2)
+
+    def _connect(self):
+        # A dedicated connection outside the pool (and PgBouncer), it stays open for good
+        dsn = make_url(DIRECT_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = psycopg2.connect(dsn, application_name=f"{DB_APPLICATION_NAME}-listener")
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CALENDAR_CHANNEL}")
+        return conn
+
+    def _listen_loop(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                # Changes made while not listening were missed
+                self.invalidate()
+                self.listening = True
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], _LISTEN_POLL_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        self.notifications += len(conn.notifies)
+                        conn.notifies.clear()
+                        self.invalidate()
+            except Exception as e:
+                print(f"Temporada calendar listener error: {e}")  # Log for debugging
+            finally:
+                self.listening = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            self._stop.wait(_LISTEN_RETRY_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "temporada_id": str(snapshot.temporada.id) if snapshot is not None and snapshot.temporada else None,
+            "semanas": len(snapshot.semanas) if snapshot is not None else 0,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 3) if snapshot is not None else None,
+            "ttl_seconds": self.ttl_seconds,
+            "listen": self.listen,
+            "listening": self.listening,
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+            "notifications": self.notifications,
+        }
+
+
+# Singleton instance
+temporada_calendar = TemporadaCalendar()
@@ -1,6 +1,7 @@
 """
 Business logic service for Temporada operations with separation of concerns
 """
+from datetime import date
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.exc import IntegrityError
@@ -12,11 +13,14 @@ from models.temporada import (
     TemporadaUpdate,
     TemporadaSemanaResponse,
     TemporadaSemanaCreate,
-    TemporadaConSemanas
+    TemporadaConSemanas,
+    TemporadaConSemanasCreate
 )
 from DAL.repositories.temporada_repository import temporada_repository, temporada_semana_repository
 from DAL.repositories.liga_repository import liga_repository
+from DAL.repositories.db_context import db_context
 from services.error_handling import handle_db_errors
+from services.temporada_calendar import temporada_calendar
 from validators.temporada_validator import TemporadaValidator
 from exceptions.business_exceptions import ValidationError, ConflictError, NotFoundError
 
@@ -49,8 +53,39 @@ class TemporadaService:
             temporada_repository.unset_all_actual()
         
         nueva_temporada = temporada_repository.create(temporada)
+        temporada_calendar.invalidate_after_commit()
         return _to_temporada_response(nueva_temporada)
     
+    @handle_db_errors
+    def crear_temporada_con_semanas(self, temporada: TemporadaConSemanasCreate) -> TemporadaConSemanas:
+        """Create a season together with its weeks in one transaction"""
+        TemporadaValidator.validate_complete_season_creation(
+            temporada.nombre,
+            temporada.semanas,
+            temporada.fecha_inicio,
+            temporada.fecha_fin,
+            temporada.es_actual
+        )
+        # Weeks are checked against the season in memory, no per-week lookups
+        semanas = [s.model_dump() for s in temporada.semanas_detalle]
+        TemporadaValidator.validate_weeks_within_season(None, semanas, temporada=temporada)
+        
+        with db_context.unit_of_work():
+            if temporada.es_actual:
+                temporada_repository.unset_all_actual()
+            nueva_temporada = temporada_repository.create(temporada.model_dump(exclude={"semanas_detalle"}))
+            temporada_semana_repository.create_many(nueva_temporada.id, semanas)
+            temporada_calendar.invalidate_after_commit()
+        
+        semanas_response = [
+            TemporadaSemanaResponse(temporada_id=nueva_temporada.id, **s)
+            for s in sorted(semanas, key=lambda s: s["numero"])
+        ]
+        return TemporadaConSemanas(
+            **_to_temporada_response(nueva_temporada).model_dump(),
+            semanas_detalle=semanas_response
+        )
+    
     def listar_temporadas(self) -> List[TemporadaResponse]:
         """List all seasons"""
         temporadas = temporada_repository.get_all_ordered()
@@ -65,10 +100,19 @@ class TemporadaService:
     
     def obtener_temporada_actual(self) -> TemporadaResponse:
         """Get current active season"""
-        temporada = temporada_repository.get_actual()
+        temporada = temporada_calendar.temporada_actual()
         if not temporada:
             raise NotFoundError("No hay temporada actual definida")
-        return _to_temporada_response(temporada)
+        return temporada
+
+    def obtener_semana_actual(self, fecha: Optional[date] = None) -> TemporadaSemanaResponse:
+        """Get the week of the current season containing fecha (today by default)"""
+        if not temporada_calendar.temporada_actual():
+            raise NotFoundError("No hay temporada actual definida")
+        semana = temporada_calendar.semana_actual(fecha)
+        if not semana:
+            raise NotFoundError("La fecha no corresponde a ninguna semana de la temporada actual")
+        return semana
     
     @handle_db_errors
     def actualizar_temporada(self, temporada_id: UUID, actualizacion: TemporadaUpdate) -> TemporadaResponse:
@@ -92,6 +136,7 @@ class TemporadaService:
             temporada_repository.unset_all_actual()
         
         temporada_actualizada = temporada_repository.update(temporada_id, actualizacion)
+        temporada_calendar.invalidate_after_commit()
         return _to_temporada_response(temporada_actualizada)
     
     @handle_db_errors
@@ -105,7 +150,9 @@ class TemporadaService:
         if liga_repository.has_associated_ligas(temporada_id):
             raise ValidationError("No se puede eliminar la temporada porque tiene ligas asociadas")
         
-        return temporada_repository.delete(temporada_id)
+        eliminada = temporada_repository.delete(temporada_id)
+        temporada_calendar.invalidate_after_commit()
+        return eliminada
     
     @handle_db_errors
     def crear_semana(self, semana: TemporadaSemanaCreate) -> TemporadaSemanaResponse:
@@ -119,6 +166,7 @@ class TemporadaService:
         )
         
         nueva_semana = temporada_semana_repository.create(semana)
+        temporada_calendar.invalidate_after_commit()
         
         return _to_semana_response(nueva_semana)
     
@@ -0,0 +1,107 @@
+"""
+LRU cache of verified JWT payloads
+
+Keyed by the sha256 of the token, so raw tokens are never kept in memory.
+Entries live until the token's exp and can be dropped per session or per user
+when sessions are invalidated. Session state (logout, inactivity) is still
+checked on every request by AuthService; this only skips the signature check.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+class TokenCache:
+    """Thread-safe LRU of decoded token payloads with hit/miss counters"""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # key -> (payload, exp)
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._by_session: Dict[str, Set[str]] = {}
+        self._by_user: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached payload, or None if absent or past its exp"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        exp = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (payload, float(exp))
+            self._index(self._by_session, payload.get("session_id"), key)
+            self._index(self._by_user, payload.get("sub"), key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_session(self, session_id: str) -> None:
+        with self._lock:
+            for key in list(self._by_session.get(session_id, ())):
+                self._remove(key)
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    @staticmethod
+    def _index(index: Dict[str, Set[str]], value: Optional[str], key: str) -> None:
+        if value is not None:
+            index.setdefault(str(value), set()).add(key)
+
+    @staticmethod
+    def _unindex(index: Dict[str, Set[str]], value: Optional[str], key: str) -> None:
+        if value is None:
+            return
+        keys = index.get(str(value))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[str(value)]
+
+    def _remove(self, key: str) -> None:
+        # Caller holds the lock
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        payload = entry[0]
+        self._unindex(self._by_session, payload.get("session_id"), key)
+        self._unindex(self._by_user, payload.get("sub"), key)
@@ -2,12 +2,13 @@
 Business logic service for Usuario operations with separation of concerns
 """
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 import os
 import re
 
 from jose import jwt, JWTError
+from starlette.concurrency import run_in_threadpool
 
 from models.usuario import (
     UsuarioCreate,
@@ -17,11 +18,14 @@ from models.usuario import (
     EstadoUsuario,
 )
 from models.database_models import UsuarioDB, RolUsuarioEnum, EstadoUsuarioEnum
-from DAL.repositories.usuario_repository import usuario_repository
+from models.pagination import Pagina
+from DAL.repositories.usuario_repository import usuario_repository, async_usuario_repository
 from services.auth_service import auth_service, SECRET_KEY, ALGORITHM
 from services.email_service import send_unlock_email
 from services.security_service import security_service
-from services.error_handling import handle_db_errors
+from services.password_hasher import password_hasher
+from services.principal_service import Principal
+from services.error_handling import handle_db_errors, handle_db_errors_async
 from validators.usuario_validator import UsuarioValidator
 from exceptions.business_exceptions import ConflictError, NotFoundError, ValidationError
 
@@ -54,7 +58,16 @@ class UsuarioService:
 
         # Hash password
         password_hash = auth_service.hash_password(usuario.contrasena)
-        
+        return self._crear_usuario(usuario, password_hash)
+
+    @handle_db_errors_async
+    async def crear_usuario_async(self, usuario: UsuarioCreate) -> UsuarioResponse:
+        """Create a new user, awaiting the password hash instead of blocking a thread"""
+        await run_in_threadpool(UsuarioValidator().validate_for_create, usuario.correo, usuario.alias)
+        password_hash = await password_hasher.hash_async(usuario.contrasena)
+        return await run_in_threadpool(self._crear_usuario, usuario, password_hash)
+
+    def _crear_usuario(self, usuario: UsuarioCreate, password_hash: str) -> UsuarioResponse:
         # Prepare user data
         user_data = usuario.model_dump(exclude={'contrasena', 'confirmar_contrasena'})
         user_data.update({
@@ -82,9 +95,33 @@ class UsuarioService:
             raise NotFoundError(f"Usuario con ID {usuario_id} no encontrado")
         return _convert_usuario_to_response(usuario)
 
+    @handle_db_errors_async
+    async def listar_usuarios_async(self, skip: int = 0, limit: int = 100) -> List[UsuarioResponse]:
+        """List active users with pagination (async)"""
+        usuarios = await async_usuario_repository.get_activos(skip, limit)
+        return [_convert_usuario_to_response(u) for u in usuarios]
+
+    @handle_db_errors_async
+    async def listar_usuarios_pagina_async(self, cursor: Optional[str] = None,
+                                           limit: int = 100) -> Pagina[UsuarioResponse]:
+        """List active users, one keyset page at a time (sorted by creado_en)"""
+        usuarios, next_cursor = await async_usuario_repository.get_activos_page(cursor, limit)
+        return Pagina[UsuarioResponse](
+            items=[_convert_usuario_to_response(u) for u in usuarios],
+            next_cursor=next_cursor
+        )
+
+    @handle_db_errors_async
+    async def obtener_usuario_async(self, usuario_id: UUID) -> UsuarioResponse:
+        """Get user by ID (async)"""
+        usuario = await async_usuario_repository.get(usuario_id)
+        if not usuario or usuario.estado == EstadoUsuarioEnum.eliminada:
+            raise NotFoundError(f"Usuario con ID {usuario_id} no encontrado")
+        return _convert_usuario_to_response(usuario)
+
     @handle_db_errors
-    def actualizar_usuario(self, usuario_id: UUID, updates: UsuarioUpdate, requester_id: UUID) -> UsuarioResponse:
-        """Update user information"""
+    def actualizar_usuario(self, usuario_id: UUID, updates: UsuarioUpdate, requester: Principal) -> UsuarioResponse:
+        """Update user information (requester is the authenticated principal)"""
         usuario_db = usuario_repository.get(usuario_id)
         
         if not usuario_db or usuario_db.estado == EstadoUsuarioEnum.eliminada:
@@ -95,11 +132,12 @@ class UsuarioService:
         # Validate all requirements for updating a user
         validator = UsuarioValidator()
         validator.validate_for_update(
-            requester_id, 
+            requester.id, 
             usuario_id, 
             usuario_db,
             new_email=data.get("correo"),
-            new_alias=data.get("alias")
+            new_alias=data.get("alias"),
+            requester_rol=requester.rol
         )
         
         # Update user through repository
@@ -160,10 +198,21 @@ class UsuarioService:
 
         usuario.estado = EstadoUsuarioEnum.activa
         usuario.failed_attempts = 0
-        usuario_repository.update(usuario.id, {"estado": usuario.estado, "failed_attempts": usuario.failed_attempts})
+        usuario_repository.update(usuario, {"estado": usuario.estado, "failed_attempts": usuario.failed_attempts})
         return {"ok": True, "message": "Tu cuenta ha sido desbloqueada. Ya puedes iniciar sesión."}
 
     def establecer_contrasena(self, token: str, new_password: str) -> Dict[str, Any]:
+        usuario = self._usuario_para_contrasena(token, new_password)
+        return self._guardar_contrasena(usuario, auth_service.hash_password(new_password))
+
+    async def establecer_contrasena_async(self, token: str, new_password: str) -> Dict[str, Any]:
+        """establecer_contrasena awaiting the password hash instead of blocking a thread"""
+        usuario = await run_in_threadpool(self._usuario_para_contrasena, token, new_password)
+        hashed = await password_hasher.hash_async(new_password)
+        return await run_in_threadpool(self._guardar_contrasena, usuario, hashed)
+
+    def _usuario_para_contrasena(self, token: str, new_password: str) -> UsuarioDB:
+        """Check the new password and the unlock token; returns the user it belongs to"""
         # Validate password strength
         validator = UsuarioValidator()
         validator.validate_password_strength_for_unlock(new_password)
@@ -191,12 +240,13 @@ class UsuarioService:
         usuario = usuario_repository.get(user_uuid)
         if not usuario:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
+        return usuario
 
-        hashed = auth_service.hash_password(new_password)
+    def _guardar_contrasena(self, usuario: UsuarioDB, hashed: str) -> Dict[str, Any]:
         usuario.contrasena_hash = hashed
         usuario.estado = EstadoUsuarioEnum.activa
         usuario.failed_attempts = 0
-        usuario_repository.update(usuario.id, {"contrasena_hash": usuario.contrasena_hash, "estado": usuario.estado, "failed_attempts": usuario.failed_attempts})
+        usuario_repository.update(usuario, {"contrasena_hash": usuario.contrasena_hash, "estado": usuario.estado, "failed_attempts": usuario.failed_attempts})
         return {"ok": True, "message": "Contraseña actualizada correctamente. Ya puedes iniciar sesión."}
 
 
@@ -2,12 +2,12 @@
 Liga validation service
 Validators use repositories to access data - NO direct database access
 """
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import UUID
 
 from models.database_models import LigaDB, UsuarioDB, TemporadaDB, RolMembresiaEnum
 from exceptions.business_exceptions import NotFoundError, ValidationError, ConflictError
-from DAL.repositories.liga_repository import liga_repository, liga_miembro_repository
+from DAL.repositories.liga_repository import liga_repository, liga_miembro_repository, liga_cupo_repository
 from DAL.repositories.usuario_repository import usuario_repository
 from DAL.repositories.temporada_repository import temporada_repository
 
@@ -88,17 +88,10 @@ class LigaValidator:
     @staticmethod
     def validate_liga_has_cupos(liga_id: UUID) -> None:
         """Validate that a league has available spots"""
-        # Get the league to check equipos_max
-        liga = liga_repository.get(liga_id)
-        if not liga:
-            raise NotFoundError("Liga no encontrada")
+        equipos_max, miembros_actuales = LigaValidator.get_liga_capacidad(liga_id)
         
-        # Count current members in the league (excluding comisionado)
-        # Only count members with Manager role, as Commissioner doesn't count towards limit
-        current_members_count = liga_miembro_repository.count_miembros_by_liga(liga_id)
-        
-        # Check if league is full (use equipos_max as the limit, comisionado doesn't count)
-        if current_members_count >= liga.equipos_max:
+        # Commissioner doesn't count towards equipos_max (ligas_cupos counts Managers only)
+        if miembros_actuales >= equipos_max:
             raise ValidationError("La liga está llena")
     
     @staticmethod
@@ -151,10 +144,18 @@ class LigaValidator:
         if liga.comisionado_id != usuario_id:
             raise ValidationError("Solo el comisionado puede realizar esta acción")
     
+    @staticmethod
+    def get_liga_capacidad(liga_id: UUID) -> Tuple[int, int]:
+        """(equipos_max, miembros_actuales) of a league, read from its ligas_cupos counter"""
+        capacidad = liga_cupo_repository.get_capacidad(liga_id)
+        if capacidad is None:
+            raise NotFoundError("Liga no encontrada")
+        return capacidad
+    
     @staticmethod
     def get_liga_current_members_count(liga_id: UUID) -> int:
         """Get the current number of members in a league (excluding commissioner)"""
-        return liga_miembro_repository.count_miembros_by_liga(liga_id)
+        return LigaValidator.get_liga_capacidad(liga_id)[1]
     
     @staticmethod
     def get_liga_total_members_count(liga_id: UUID) -> int:
@@ -189,18 +190,31 @@ class LigaValidator:
         return liga
     
     @staticmethod
-    def validate_for_join_liga(liga_id: UUID, usuario_id: UUID, alias: str, nombre_equipo: str) -> LigaDB:
-        """Validate all requirements for joining a league"""
-        liga = LigaValidator.validate_exists(liga_id)
-        LigaValidator.validate_usuario_not_in_liga(liga_id, usuario_id)
-        LigaValidator.validate_liga_has_cupos(liga_id)
-        LigaValidator.validate_alias_unique_in_liga(liga_id, alias)
+    def validate_for_join_liga(liga_id: UUID, usuario_id: UUID, alias: str, nombre_equipo: str,
+                               lock: bool = False) -> LigaDB:
+        """Validate all requirements for joining a league with a single query
+
+        Inside the joining transaction pass lock=True: the league row stays locked
+        until commit, so the capacity check cannot be raced by concurrent joins.
+        """
+        precheck = liga_repository.get_join_precheck(liga_id, usuario_id, alias, nombre_equipo, lock=lock)
+        if precheck is None:
+            raise NotFoundError("Liga no encontrada")
         
-        # Validate team name uniqueness
-        from validators.equipo_fantasy_validator import EquipoFantasyValidator
-        EquipoFantasyValidator.validate_nombre_unique_in_liga(nombre_equipo, liga_id)
+        if precheck.ya_es_miembro:
+            raise ConflictError("Ya eres miembro de esta liga")
         
-        return liga
+        # Commissioner doesn't count towards equipos_max
+        if precheck.miembros_actuales >= precheck.liga.equipos_max:
+            raise ValidationError("La liga está llena")
+        
+        if precheck.alias_ocupado:
+            raise ConflictError("Ese alias ya está ocupado en esta liga")
+        
+        if precheck.nombre_equipo_ocupado:
+            raise ConflictError("Ya existe un equipo con ese nombre en la liga")
+        
+        return precheck.liga
 
 
 # Create validator instance
@@ -82,15 +82,21 @@ class TemporadaValidator:
             raise ValidationError("La fecha de fin debe ser posterior a la fecha de inicio")
     
     @staticmethod
-    def validate_weeks_within_season(temporada_id: UUID, semanas_data: list) -> None:
-        """Validate that week dates are within season range and don't overlap"""
+    def validate_weeks_within_season(temporada_id: Optional[UUID], semanas_data: list, temporada=None) -> None:
+        """Validate that week dates are within season range and don't overlap
+
+        Pass the season itself (a TemporadaDB or a TemporadaCreate not yet
+        saved) as temporada to validate in memory without looking it up.
+        """
         
         # Get season to check date range
-        temporada = TemporadaValidator.validate_exists(temporada_id)
+        if temporada is None:
+            temporada = TemporadaValidator.validate_exists(temporada_id)
         if not temporada:
             raise NotFoundError("Temporada no encontrada")
         
         # Validate each week
+        numeros = set()
         for semana_data in semanas_data:
             numero = semana_data.get('numero')
             fecha_inicio = semana_data.get('fecha_inicio')
@@ -99,6 +105,9 @@ class TemporadaValidator:
             # Validate week number
             if numero < 1 or numero > temporada.semanas:
                 raise ValidationError(f"El número de semana {numero} está fuera del rango válido (1-{temporada.semanas})")
+            if numero in numeros:
+                raise ConflictError(f"La semana {numero} está repetida")
+            numeros.add(numero)
             
             # Validate week dates are within season
             if fecha_inicio < temporada.fecha_inicio or fecha_inicio > temporada.fecha_fin:
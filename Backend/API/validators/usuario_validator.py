@@ -116,14 +116,20 @@ class UsuarioValidator:
             raise ConflictError("El alias ya está en uso")
 
     @staticmethod
-    def validate_user_permission_for_update(requester_id: UUID, target_user_id: UUID) -> None:
-        """Validate that a user has permission to update another user"""
+    def validate_user_permission_for_update(requester_id: UUID, target_user_id: UUID,
+                                            requester_rol: Optional[str] = None) -> None:
+        """Validate that a user has permission to update another user
+        
+        requester_rol comes from the authenticated principal; it is only
+        looked up when the caller does not provide it.
+        """
         if requester_id != target_user_id:
-            requester = UsuarioRepository().get(requester_id)
-            if not requester:
-                raise ValidationError("Usuario no autorizado")
+            if requester_rol is None:
+                requester = UsuarioRepository().get(requester_id)
+                if not requester:
+                    raise ValidationError("Usuario no autorizado")
+                requester_rol = getattr(requester.rol, "value", requester.rol)
             
-            requester_rol = getattr(requester.rol, "value", requester.rol)
             if str(requester_rol) != "administrador":
                 raise ValidationError("No tienes permiso para actualizar este usuario")
 
@@ -162,10 +168,11 @@ class UsuarioValidator:
     
     @staticmethod
     def validate_for_update(requester_id: UUID, target_user_id: UUID, usuario_db: UsuarioDB, 
-                           new_email: Optional[str] = None, new_alias: Optional[str] = None) -> None:
+                           new_email: Optional[str] = None, new_alias: Optional[str] = None,
+                           requester_rol: Optional[str] = None) -> None:
         """Validate all requirements for updating a user"""
         # Validate user permission
-        UsuarioValidator.validate_user_permission_for_update(requester_id, target_user_id)
+        UsuarioValidator.validate_user_permission_for_update(requester_id, target_user_id, requester_rol)
         
         # Validate email uniqueness if being updated
         if new_email and new_email != usuario_db.correo:
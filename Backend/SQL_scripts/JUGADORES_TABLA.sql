@@ -10,7 +10,7 @@ END$$;
 
 CREATE TABLE IF NOT EXISTS jugadores (
   id             UUID PRIMARY KEY DEFAULT gen_random_uuid(),   
-  nombre         VARCHAR(100) NOT NULL,                        
+  nombre         VARCHAR(100) COLLATE "C" NOT NULL,            -- orden por punto de código
   posicion       posicion_jugador NOT NULL,                    -- QB/RB/WR/TE/K/DEF/IR
   equipo_id      UUID NOT NULL REFERENCES equipos(id)          -- equipo NFL (tabla equipos)
                  ON DELETE RESTRICT,
@@ -0,0 +1,22 @@
+-- Migration script for the content-addressed image store (IMAGE_CONTENT_ADDRESSED=true)
+-- Each stored image is named after the sha256 of its bytes and kept once, no matter
+-- how many players/teams point at it; files are removed when referencias reaches 0.
+
+CREATE TABLE IF NOT EXISTS public.imagenes (
+    hash character varying(64) PRIMARY KEY,
+    archivo character varying(100) NOT NULL,
+    referencias integer DEFAULT 1 NOT NULL,
+    origen_url text,
+    creado_en timestamp with time zone DEFAULT now(),
+    descargado_en timestamp with time zone DEFAULT now(),
+    CONSTRAINT ck_imagen_referencias CHECK ((referencias >= 0))
+);
+
+-- Existing tables: when the image was last downloaded from origen_url
+ALTER TABLE public.imagenes ADD COLUMN IF NOT EXISTS descargado_en timestamp with time zone DEFAULT now();
+
+-- Re-imports look images up by their source URL before downloading them again
+CREATE INDEX IF NOT EXISTS idx_imagenes_origen_url ON public.imagenes USING btree (origen_url);
+
+-- Verify the table
+SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'imagenes' ORDER BY ordinal_position;
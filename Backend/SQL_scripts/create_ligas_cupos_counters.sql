@@ -0,0 +1,93 @@
+-- Migration script for maintained league member counters
+-- ligas_cupos.miembros_actuales holds the number of Manager members of each
+-- league (the commissioner does not count towards equipos_max). Triggers keep
+-- it in step with ligas_miembros inside the same transaction as every join,
+-- leave or league deletion, so capacity checks read one row instead of
+-- counting members. The join precheck locks that row (FOR UPDATE) to enforce
+-- capacity atomically.
+--
+-- scripts/reconcile_ligas_cupos.py verifies the counters against ligas_miembros.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.ligas_cupos (
+    liga_id uuid NOT NULL,
+    miembros_actuales integer DEFAULT 0 NOT NULL,
+    actualizado_en timestamp with time zone DEFAULT now(),
+    CONSTRAINT ligas_cupos_pkey PRIMARY KEY (liga_id),
+    CONSTRAINT ligas_cupos_liga_id_fkey FOREIGN KEY (liga_id) REFERENCES public.ligas(id) ON DELETE CASCADE,
+    CONSTRAINT ck_miembros_no_negativos CHECK ((miembros_actuales >= 0))
+);
+
+-- Block joins/leaves until the counters are backfilled and the triggers exist
+LOCK TABLE public.ligas_miembros IN SHARE ROW EXCLUSIVE MODE;
+
+-- Every league gets its counter row when it is created
+CREATE OR REPLACE FUNCTION public.trg_ligas_cupos_init() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  INSERT INTO ligas_cupos (liga_id, miembros_actuales)
+  VALUES (NEW.id, 0)
+  ON CONFLICT (liga_id) DO NOTHING;
+  RETURN NULL;
+END;
+$$;
+
+-- +1 / -1 per Manager membership added, removed or moved between roles/leagues
+CREATE OR REPLACE FUNCTION public.trg_ligas_miembros_cupos() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  IF TG_OP = 'UPDATE' AND OLD.liga_id = NEW.liga_id AND OLD.rol = NEW.rol THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.rol = 'Manager' THEN
+    -- No row left when the whole league is being deleted (ON DELETE CASCADE)
+    UPDATE ligas_cupos
+    SET miembros_actuales = miembros_actuales - 1, actualizado_en = now()
+    WHERE liga_id = OLD.liga_id;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.rol = 'Manager' THEN
+    INSERT INTO ligas_cupos (liga_id, miembros_actuales)
+    VALUES (NEW.liga_id, 1)
+    ON CONFLICT (liga_id) DO UPDATE
+    SET miembros_actuales = ligas_cupos.miembros_actuales + 1, actualizado_en = now();
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_ligas_cupos_init ON public.ligas;
+CREATE TRIGGER trg_ligas_cupos_init AFTER INSERT ON public.ligas
+    FOR EACH ROW EXECUTE FUNCTION public.trg_ligas_cupos_init();
+
+DROP TRIGGER IF EXISTS trg_ligas_miembros_cupos ON public.ligas_miembros;
+CREATE TRIGGER trg_ligas_miembros_cupos AFTER INSERT OR DELETE OR UPDATE OF liga_id, rol ON public.ligas_miembros
+    FOR EACH ROW EXECUTE FUNCTION public.trg_ligas_miembros_cupos();
+
+-- Backfill (and correct) the counters of existing leagues
+INSERT INTO public.ligas_cupos (liga_id, miembros_actuales)
+SELECT l.id, count(m.usuario_id) FILTER (WHERE m.rol = 'Manager')
+FROM public.ligas l
+LEFT JOIN public.ligas_miembros m ON m.liga_id = l.id
+GROUP BY l.id
+ON CONFLICT (liga_id) DO UPDATE
+SET miembros_actuales = EXCLUDED.miembros_actuales, actualizado_en = now();
+
+COMMIT;
+
+-- Verify: no league without a counter, and no counter out of step
+SELECT count(*) AS ligas_sin_contador
+FROM public.ligas l
+LEFT JOIN public.ligas_cupos c ON c.liga_id = l.id
+WHERE c.liga_id IS NULL;
+
+SELECT c.liga_id, c.miembros_actuales, count(m.usuario_id) AS miembros_reales
+FROM public.ligas_cupos c
+LEFT JOIN public.ligas_miembros m ON m.liga_id = c.liga_id AND m.rol = 'Manager'
+GROUP BY c.liga_id, c.miembros_actuales
+HAVING c.miembros_actuales <> count(m.usuario_id);
@@ -0,0 +1,95 @@
+-- Migration script for indexes matching the repository query shapes
+-- Each index below serves a specific filter + ORDER BY used by DAL/repositories
+-- (see the comments next to the Index() declarations in models/database_models.py).
+-- Composite indexes lead with the equality columns and end with the sort keys
+-- (creado_en, id) / (nombre, id) used by offset and keyset pagination, so pages
+-- are read in order without a sort step. Partial indexes cover the hot
+-- predicates (activo, es_lesion, rol = 'Manager', estado = 'activa').
+--
+-- CONCURRENTLY avoids blocking writes on live tables; run with psql outside a
+-- transaction block (psql -f runs each statement on its own by default).
+-- scripts/check_query_plans.py verifies the resulting plans.
+
+-- equipos_fantasy -----------------------------------------------------------
+-- get_by_liga_and_usuario / get_by_usuario_and_liga
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_equipos_fantasy_liga_usuario
+    ON public.equipos_fantasy USING btree (liga_id, usuario_id);
+-- get_by_liga / get_by_liga_page / count_by_liga: liga_id ORDER BY creado_en, id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_equipos_fantasy_liga_creado
+    ON public.equipos_fantasy USING btree (liga_id, creado_en, id);
+-- get_by_usuario: usuario_id ORDER BY creado_en, id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_equipos_fantasy_usuario_creado
+    ON public.equipos_fantasy USING btree (usuario_id, creado_en, id);
+-- exists_nombre_in_liga: liga_id AND lower(nombre) = lower(:nombre)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_equipos_fantasy_liga_nombre_lower
+    ON public.equipos_fantasy USING btree (liga_id, lower((nombre)::text));
+
+-- Single-column indexes now covered by the composites above
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_equipos_fantasy_liga;
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_equipos_fantasy_usuario;
+
+-- ligas_miembros ------------------------------------------------------------
+-- count_miembros_by_liga: liga_id AND rol = 'Manager' (index-only count)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ligas_miembros_liga_managers
+    ON public.ligas_miembros USING btree (liga_id) WHERE (rol = 'Manager'::public.rol_membresia);
+-- Memberships of a user (usuario_repository.get_principal_data); the primary
+-- key (liga_id, usuario_id) cannot serve usuario_id lookups
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ligas_miembros_usuario
+    ON public.ligas_miembros USING btree (usuario_id) INCLUDE (liga_id);
+
+-- jugadores -----------------------------------------------------------------
+-- get_with_filters / get_with_filters_page / get_by_posicion / get_activos
+-- ORDER BY nombre, id; equipo_id filters use uq_jugador_por_equipo (equipo_id, nombre)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jugadores_nombre
+    ON public.jugadores USING btree (nombre, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jugadores_posicion_nombre
+    ON public.jugadores USING btree (posicion, nombre, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jugadores_activos_nombre
+    ON public.jugadores USING btree (nombre, id) WHERE activo;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jugadores_activos_posicion_nombre
+    ON public.jugadores USING btree (posicion, nombre, id) WHERE activo;
+
+-- noticias_jugadores --------------------------------------------------------
+-- get_by_jugador_id / get_by_jugador_with_author: jugador_id ORDER BY creado_en DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_noticias_jugadores_jugador_creado
+    ON public.noticias_jugadores USING btree (jugador_id, creado_en DESC);
+-- get_recent_injury_news: es_lesion AND creado_en >= :cutoff ORDER BY creado_en DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_noticias_jugadores_lesiones_creado
+    ON public.noticias_jugadores USING btree (creado_en DESC) WHERE es_lesion;
+
+-- ligas ---------------------------------------------------------------------
+-- search_with_filter(_page): ORDER BY creado_en, id, optionally per temporada;
+-- has_associated_ligas / count_ligas_by_temporada: temporada_id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ligas_creado
+    ON public.ligas USING btree (creado_en, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ligas_temporada_creado
+    ON public.ligas USING btree (temporada_id, creado_en, id);
+
+-- usuarios ------------------------------------------------------------------
+-- get_activos / get_activos_page: estado = 'activa' ORDER BY creado_en, id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_usuarios_activos_creado
+    ON public.usuarios USING btree (creado_en, id) WHERE (estado = 'activa'::public.estado_usuario);
+
+ANALYZE public.equipos_fantasy;
+ANALYZE public.ligas_miembros;
+ANALYZE public.jugadores;
+ANALYZE public.noticias_jugadores;
+ANALYZE public.ligas;
+ANALYZE public.usuarios;
+
+-- Verify the indexes (an invalid index means a CONCURRENTLY build failed: drop and re-run)
+SELECT i.tablename, i.indexname, i.indexdef, x.indisvalid AS valido
+FROM pg_indexes i
+JOIN pg_class c ON c.relname = i.indexname
+JOIN pg_index x ON x.indexrelid = c.oid
+WHERE i.schemaname = 'public'
+  AND i.indexname IN (
+    'idx_equipos_fantasy_liga_usuario', 'idx_equipos_fantasy_liga_creado',
+    'idx_equipos_fantasy_usuario_creado', 'idx_equipos_fantasy_liga_nombre_lower',
+    'idx_ligas_miembros_liga_managers', 'idx_ligas_miembros_usuario',
+    'idx_jugadores_nombre', 'idx_jugadores_posicion_nombre',
+    'idx_jugadores_activos_nombre', 'idx_jugadores_activos_posicion_nombre',
+    'idx_noticias_jugadores_jugador_creado', 'idx_noticias_jugadores_lesiones_creado',
+    'idx_ligas_creado', 'idx_ligas_temporada_creado', 'idx_usuarios_activos_creado'
+  )
+ORDER BY i.tablename, i.indexname;
@@ -0,0 +1,20 @@
+-- Migration script for the shared session store (SESSION_STORE=postgres)
+-- One row per login; every API worker validates tokens against this table, so
+-- logouts and "close all sessions" take effect on all workers.
+
+CREATE TABLE IF NOT EXISTS public.sesiones (
+    session_id character varying(36) PRIMARY KEY,
+    usuario_id uuid NOT NULL REFERENCES public.usuarios(id) ON DELETE CASCADE,
+    creado_en timestamp with time zone DEFAULT now() NOT NULL,
+    expira_en timestamp with time zone NOT NULL,
+    ultima_actividad timestamp with time zone DEFAULT now() NOT NULL
+);
+
+-- Per-user invalidation / counting
+CREATE INDEX IF NOT EXISTS idx_sesiones_usuario_id ON public.sesiones USING btree (usuario_id);
+
+-- Purge of sessions past the inactivity window
+CREATE INDEX IF NOT EXISTS idx_sesiones_ultima_actividad ON public.sesiones USING btree (ultima_actividad);
+
+-- Verify the table
+SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'sesiones' ORDER BY ordinal_position;
@@ -0,0 +1,24 @@
+-- Migration script for accent-insensitive trigram name search
+-- Player searches filter on f_unaccent(lower(nombre)) with LIKE '%term%' and the
+-- word-similarity operator (%>); both are answered by the GIN index below
+-- instead of scanning every row. The indexed expression must stay identical to
+-- DAL/repositories/text_search.search_key.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+CREATE EXTENSION IF NOT EXISTS unaccent WITH SCHEMA public;
+
+-- unaccent() is only STABLE (it depends on the search_path dictionary), so it
+-- cannot be used in an index; this wrapper pins the dictionary and is IMMUTABLE
+CREATE OR REPLACE FUNCTION public.f_unaccent(text)
+RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+
+CREATE INDEX IF NOT EXISTS idx_jugadores_nombre_trgm
+    ON public.jugadores USING gin (public.f_unaccent(lower(nombre)) public.gin_trgm_ops);
+
+ANALYZE public.jugadores;
+
+-- Verify the function and index
+SELECT public.f_unaccent(lower('Mbappé Ñúñez')) AS normalizado;
+SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'jugadores' AND indexname = 'idx_jugadores_nombre_trgm';
@@ -501,7 +501,7 @@ ALTER TABLE public.equipos_fantasy_audit OWNER TO postgres;
 
 CREATE TABLE public.jugadores (
     id uuid DEFAULT gen_random_uuid() NOT NULL,
-    nombre character varying(100) NOT NULL,
+    nombre character varying(100) COLLATE pg_catalog."C" NOT NULL,
     posicion public.posicion_jugador NOT NULL,
     equipo_id uuid NOT NULL,
     imagen_url text NOT NULL,
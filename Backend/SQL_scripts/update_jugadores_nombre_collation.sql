@@ -0,0 +1,12 @@
+-- Migration script to sort players by name in code point order
+-- Player listings are served both from the in-memory catalog (services/jugador_catalog.py,
+-- Python string order) and from the database (/api/jugadores/pagina, keyset on (nombre, id)).
+-- With the "C" collation ORDER BY nombre matches the catalog, so both agree on order and
+-- JUGADOR_CATALOG_ENABLED does not change it. Indexes on nombre are rebuilt by the ALTER.
+
+ALTER TABLE public.jugadores
+    ALTER COLUMN nombre TYPE character varying(100) COLLATE "C";
+
+-- Verify the collation
+SELECT column_name, collation_name FROM information_schema.columns
+WHERE table_name = 'jugadores' AND column_name = 'nombre';
@@ -0,0 +1,191 @@
+"""
+Benchmark list-response serialization: FastAPI defaults vs the fast path
+
+In-process mode (default) needs no database. It mounts /api/jugadores/ and
+/api/ligas/ twice over 100-row pages converted the way the services do
+(model_validate(from_attributes=True)):
+
+- before: APIRoute + JSONResponse (re-validation against response_model,
+  jsonable dump, json.dumps)
+- after:  FastModelRoute + ORJSONResponse (routers/serialization.py)
+
+and reports requests/s through the ASGI stack plus the serialization cost
+per page on its own.
+
+HTTP mode measures a running API instead; run it against the code before
+and after the change:
+
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --url http://localhost:8000 --duration 10 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "API"))
+
+import httpx  # noqa: E402
+from fastapi import APIRouter, FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import APIRoute  # noqa: E402
+
+from models.database_models import PosicionJugadorEnum  # noqa: E402
+from models.jugador import JugadorResponse  # noqa: E402
+from models.liga import LigaResponse  # noqa: E402
+from routers.serialization import FastModelRoute  # noqa: E402
+
+PATHS = ("/api/jugadores/", "/api/ligas/")
+
+
+def _jugador_rows(n: int) -> List[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), nombre=f"Jugador Número {i}", posicion=list(PosicionJugadorEnum)[i % len(PosicionJugadorEnum)],
+            equipo_id=uuid.uuid4(), imagen_url=f"/imgs/pics/{uuid.uuid4().hex}.webp",
+            thumbnail_url=f"/imgs/thumbnails/{uuid.uuid4().hex}.webp", activo=True, creado_en=now,
+        )
+        for i in range(n)
+    ]
+
+
+def _liga_rows(n: int) -> List[SimpleNamespace]:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), nombre=f"Liga {i}", descripcion="Liga de prueba para el benchmark", equipos_max=12,
+            estado="Pre_draft", temporada_id=uuid.uuid4(), comisionado_id=uuid.uuid4(), playoffs_equipos=4,
+            puntajes_decimales=True, trade_deadline_activa=False, limite_cambios_temp=None, limite_agentes_temp=None,
+            formato_posiciones={"QB": 1, "RB": 2, "WR": 2, "TE": 1, "K": 1, "DEF": 1},
+            puntos_config={"pase_td": 4, "carrera_td": 6}, creado_en=now, actualizado_en=now,
+        )
+        for i in range(n)
+    ]
+
+
+def build_app(route_class, response_class, page_size: int) -> FastAPI:
+    """Same endpoints, differing only in route/response classes"""
+    jugadores = _jugador_rows(page_size)
+    ligas = _liga_rows(page_size)
+    router = APIRouter(route_class=route_class)
+
+    @router.get(PATHS[0], response_model=List[JugadorResponse])
+    async def listar_jugadores():
+        return [JugadorResponse.model_validate(j, from_attributes=True) for j in jugadores]
+
+    @router.get(PATHS[1], response_model=List[LigaResponse])
+    async def listar_ligas():
+        return [LigaResponse.model_validate(liga, from_attributes=True) for liga in ligas]
+
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(router)
+    return app
+
+
+async def _drive(client: httpx.AsyncClient, path: str, duration: float, concurrency: int) -> float:
+    """Requests per second sustained by `concurrency` clients for `duration` seconds"""
+    deadline = time.perf_counter() + duration
+    count = 0
+
+    async def worker():
+        nonlocal count
+        while time.perf_counter() < deadline:
+            response = await client.get(path)
+            response.raise_for_status()
+            count += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return count / (time.perf_counter() - start)
+
+
+def _time_per_call(func: Callable[[], object], repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _run_sync(coro):
+    """Result of a coroutine that never suspends, without event loop overhead"""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended")
+
+
+def serialization_only(page_size: int, repeat: int) -> None:
+    """ms per page spent turning validated models into response bytes"""
+    from fastapi._compat import ModelField
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from pydantic import TypeAdapter
+
+    for name, model, rows in (("jugadores", JugadorResponse, _jugador_rows), ("ligas", LigaResponse, _liga_rows)):
+        items = [model.model_validate(row, from_attributes=True) for row in rows(page_size)]
+        field: ModelField = create_response_field(name=f"Response_{name}", type_=List[model])
+        adapter = TypeAdapter(List[model])
+
+        def before():
+            content = _run_sync(serialize_response(field=field, response_content=items))
+            return JSONResponse(content).body
+
+        def after():
+            return adapter.dump_json(items)
+
+        before_ms = _time_per_call(before, repeat)
+        after_ms = _time_per_call(after, repeat)
+        print(f"  {name:<10} before {before_ms:7.3f} ms/page   after {after_ms:7.3f} ms/page   x{before_ms / after_ms:.1f}")
+
+
+async def in_process(args) -> None:
+    print(f"ASGI throughput, {args.page_size}-row pages, {args.duration}s per run, concurrency {args.concurrency}")
+    apps = {
+        "before": build_app(APIRoute, JSONResponse, args.page_size),
+        "after": build_app(FastModelRoute, ORJSONResponse, args.page_size),
+    }
+    results = {}
+    for label, app in apps.items():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in PATHS:
+                results[(label, path)] = await _drive(client, path, args.duration, args.concurrency)
+    for path in PATHS:
+        before, after = results[("before", path)], results[("after", path)]
+        print(f"  {path:<17} before {before:8.1f} req/s   after {after:8.1f} req/s   x{after / before:.2f}")
+
+
+async def over_http(args) -> None:
+    print(f"HTTP throughput against {args.url}, {args.duration}s per path, concurrency {args.concurrency}")
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+        for path in PATHS:
+            rps = await _drive(client, f"{path}?limit={args.page_size}", args.duration, args.concurrency)
+            print(f"  {path:<17} {rps:8.1f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark a running API instead of the in-process apps")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per measured run")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations for the serialization-only timing")
+    args = parser.parse_args()
+    if args.url:
+        asyncio.run(over_http(args))
+        return
+    asyncio.run(in_process(args))
+    print("Serialization only:")
+    serialization_only(args.page_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Fail when a hot repository query plans a sequential scan over a large table
+
+Seeds a few thousand rows per table inside a single transaction, ANALYZEs
+them, then calls the repository methods listed in build_checks(). Every SELECT
+they issue is EXPLAINed on the same connection first. The transaction is rolled
+back at the end, so the database is left untouched.
+
+A check fails when its plan has a Seq Scan on a table with at least --min-rows
+estimated rows. Run SQL_scripts/create_query_shape_indexes.sql (and
+create_trigram_search_indexes.sql for name searches) first:
+
+    python scripts/check_query_plans.py
+    python scripts/check_query_plans.py --database-url postgresql://... --scale 5 --verbose
+
+Only the sync repositories are exercised: the async ones build the same
+statements (shared _apply_filters / SORT_COLUMNS) on a separate connection that
+cannot see the uncommitted seed.
+"""
+import argparse
+import hashlib
+import os
+import sys
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "API"))
+
+SEED_SQL = """
+INSERT INTO public.usuarios (id, nombre, alias, correo, contrasena_hash, creado_en)
+SELECT md5('planu' || g)::uuid, 'Usuario ' || g, 'plan' || g, 'plan' || g || '@plan-check.test', 'x',
+       now() - g * interval '1 minute'
+FROM generate_series(1, :usuarios) g;
+
+INSERT INTO public.equipos (id, nombre)
+SELECT md5('plane' || g)::uuid, 'Plan check NFL ' || g
+FROM generate_series(1, :equipos) g;
+
+INSERT INTO public.temporadas (id, nombre, semanas, fecha_inicio, fecha_fin, es_actual)
+SELECT md5('plant' || g)::uuid, 'Plan check ' || g, 18, date '2000-09-01' + g * 366, date '2001-01-31' + g * 366, false
+FROM generate_series(1, :temporadas) g;
+
+INSERT INTO public.ligas (id, nombre, contrasena_hash, equipos_max, temporada_id, comisionado_id, creado_en)
+SELECT md5('planl' || g)::uuid, 'Plan check liga ' || g, 'x', 12,
+       md5('plant' || (g % :temporadas + 1))::uuid, md5('planu' || (g % :usuarios + 1))::uuid,
+       now() - g * interval '1 minute'
+FROM generate_series(1, :ligas) g;
+
+INSERT INTO public.ligas_miembros (liga_id, usuario_id, alias, rol)
+SELECT md5('planl' || g)::uuid, md5('planu' || (g % :usuarios + 1))::uuid, 'alias0', 'Comisionado'
+FROM generate_series(1, :ligas) g
+ON CONFLICT DO NOTHING;
+
+INSERT INTO public.ligas_miembros (liga_id, usuario_id, alias)
+SELECT md5('planl' || g)::uuid, md5('planu' || ((g + k * (:usuarios / 10)) % :usuarios + 1))::uuid, 'alias' || k
+FROM generate_series(1, :ligas) g, generate_series(1, 9) k
+ON CONFLICT DO NOTHING;
+
+INSERT INTO public.equipos_fantasy (liga_id, usuario_id, nombre, creado_en)
+SELECT m.liga_id, m.usuario_id, 'Equipo ' || m.alias, now() - random() * interval '300 days'
+FROM public.ligas_miembros m
+JOIN public.ligas l ON l.id = m.liga_id
+WHERE l.nombre LIKE 'Plan check liga %';
+
+INSERT INTO public.jugadores (id, nombre, posicion, equipo_id, imagen_url, activo)
+SELECT md5('planj' || g)::uuid, 'Jugador ' || substr(md5(g::text), 1, 12),
+       (ARRAY['QB', 'RB', 'WR', 'TE', 'K', 'DEF'])[g % 6 + 1]::public.posicion_jugador,
+       md5('plane' || (g % :equipos + 1))::uuid, '/imgs/pics/plan.webp', g % 10 <> 0
+FROM generate_series(1, :jugadores) g;
+
+INSERT INTO public.noticias_jugadores (jugador_id, texto, es_lesion, creado_en, creado_por)
+SELECT md5('planj' || (g % :jugadores + 1))::uuid, 'Noticia de prueba ' || g, false,
+       now() - random() * interval '365 days', md5('planu1')::uuid
+FROM generate_series(1, :noticias) g;
+
+INSERT INTO public.noticias_jugadores (jugador_id, texto, es_lesion, resumen, designacion, creado_en, creado_por)
+SELECT md5('planj' || (g % :jugadores + 1))::uuid, 'Lesion de prueba ' || g, true, 'Lesion', 'Questionable',
+       now() - random() * interval '365 days', md5('planu1')::uuid
+FROM generate_series(1, :noticias / 10) g;
+"""
+
+SEEDED_TABLES = ("usuarios", "equipos", "temporadas", "ligas", "ligas_miembros",
+                 "equipos_fantasy", "jugadores", "noticias_jugadores")
+
+
+def seed_id(prefix: str, n: int) -> uuid.UUID:
+    """Same value as md5('<prefix><n>')::uuid in SEED_SQL"""
+    return uuid.UUID(hashlib.md5(f"{prefix}{n}".encode()).hexdigest())
+
+
+def seed_sizes(scale: float) -> Dict[str, int]:
+    sizes = {"usuarios": 5000, "equipos": 32, "temporadas": 20, "ligas": 2000,
+             "jugadores": 20000, "noticias": 50000}
+    return {name: max(int(rows * scale), 1) if name != "equipos" else rows for name, rows in sizes.items()}
+
+
+def build_checks() -> List[Tuple[str, Callable[[], Any]]]:
+    """(label, call) for each repository query shape that must use an index"""
+    from DAL.repositories.equipo_fantasy_repository import EquipoFantasyRepository
+    from DAL.repositories.jugador_repository import JugadorRepository
+    from DAL.repositories.liga_repository import LigaMiembroRepository, LigaRepository
+    from DAL.repositories.noticia_jugador_repository import NoticiaJugadorRepository
+    from DAL.repositories.usuario_repository import UsuarioRepository
+    from models.database_models import PosicionJugadorEnum
+    from models.jugador import JugadorFilter
+    from models.liga import LigaFilter
+
+    equipos_fantasy = EquipoFantasyRepository()
+    miembros = LigaMiembroRepository()
+    ligas = LigaRepository()
+    jugadores = JugadorRepository()
+    noticias = NoticiaJugadorRepository()
+    usuarios = UsuarioRepository()
+
+    liga, usuario, temporada = seed_id("planl", 7), seed_id("planu", 8), seed_id("plant", 7)
+    equipo, jugador = seed_id("plane", 3), seed_id("planj", 42)
+    qb = PosicionJugadorEnum.QB
+
+    return [
+        ("EquipoFantasyRepository.get_by_liga_and_usuario", lambda: equipos_fantasy.get_by_liga_and_usuario(liga, usuario)),
+        ("EquipoFantasyRepository.get_by_usuario_and_liga", lambda: equipos_fantasy.get_by_usuario_and_liga(usuario, liga)),
+        ("EquipoFantasyRepository.get_by_liga", lambda: equipos_fantasy.get_by_liga(liga)),
+        ("EquipoFantasyRepository.get_by_liga_page", lambda: equipos_fantasy.get_by_liga_page(liga)),
+        ("EquipoFantasyRepository.get_by_usuario", lambda: equipos_fantasy.get_by_usuario(usuario)),
+        ("EquipoFantasyRepository.count_by_liga", lambda: equipos_fantasy.count_by_liga(liga)),
+        ("EquipoFantasyRepository.exists_nombre_in_liga", lambda: equipos_fantasy.exists_nombre_in_liga(liga, "Equipo alias1")),
+        ("LigaMiembroRepository.count_miembros_by_liga", lambda: miembros.count_miembros_by_liga(liga)),
+        ("LigaMiembroRepository.get_miembros_by_liga", lambda: miembros.get_miembros_by_liga(liga)),
+        ("LigaRepository.search_with_filter", lambda: ligas.search_with_filter(LigaFilter())),
+        ("LigaRepository.search_with_filter(temporada)", lambda: ligas.search_with_filter(LigaFilter(temporada_id=temporada))),
+        ("LigaRepository.search_with_filter_page(temporada)", lambda: ligas.search_with_filter_page(LigaFilter(temporada_id=temporada))),
+        ("LigaRepository.has_associated_ligas", lambda: ligas.has_associated_ligas(temporada)),
+        ("LigaRepository.get_join_precheck", lambda: ligas.get_join_precheck(liga, usuario, "alias1", "Equipo alias1", lock=True)),
+        ("JugadorRepository.get_with_filters", lambda: jugadores.get_with_filters(JugadorFilter())),
+        ("JugadorRepository.get_with_filters(posicion, activo)", lambda: jugadores.get_with_filters(JugadorFilter(posicion=qb, activo=True))),
+        ("JugadorRepository.get_with_filters(equipo)", lambda: jugadores.get_with_filters(JugadorFilter(equipo_id=equipo))),
+        ("JugadorRepository.get_with_filters(nombre)", lambda: jugadores.get_with_filters(JugadorFilter(nombre="a1b2"))),
+        ("JugadorRepository.get_with_filters_page(posicion)", lambda: jugadores.get_with_filters_page(JugadorFilter(posicion=qb))),
+        ("JugadorRepository.get_by_posicion", lambda: jugadores.get_by_posicion(qb)),
+        ("JugadorRepository.get_by_equipo", lambda: jugadores.get_by_equipo(equipo)),
+        ("JugadorRepository.get_activos", lambda: jugadores.get_activos()),
+        ("JugadorRepository.search_by_nombre", lambda: jugadores.search_by_nombre("a1b2")),
+        ("NoticiaJugadorRepository.get_recent_injury_news", lambda: noticias.get_recent_injury_news()),
+        ("NoticiaJugadorRepository.get_by_jugador_id", lambda: noticias.get_by_jugador_id(jugador)),
+        ("UsuarioRepository.get_activos", lambda: usuarios.get_activos()),
+        ("UsuarioRepository.get_principal_data", lambda: usuarios.get_principal_data(usuario)),
+    ]
+
+
+def plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def describe(node: Dict[str, Any]) -> str:
+    text = node["Node Type"]
+    if "Index Name" in node:
+        text += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        text += f" on {node['Relation Name']}"
+    return text
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the seeded row counts")
+    parser.add_argument("--min-rows", type=int, default=1000,
+                        help="Seq Scans on tables with fewer estimated rows are accepted")
+    parser.add_argument("--verbose", action="store_true", help="Print every scan node, not only failures")
+    args = parser.parse_args()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from sqlalchemy import event, text
+
+    from database import engine
+    from DAL.repositories.db_context import db_context
+
+    current: Dict[str, Any] = {"label": None}
+    plans: Dict[str, List[Dict[str, Any]]] = {}
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        label = current["label"]
+        if label is None or executemany or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return
+        cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        plans.setdefault(label, []).append(cursor.fetchone()[0][0]["Plan"])
+
+    checks = build_checks()
+    failures = 0
+    with db_context.unit_of_work() as uow:
+        db = uow.session
+        try:
+            db.execute(text(SEED_SQL), seed_sizes(args.scale))
+            for table in SEEDED_TABLES:
+                db.execute(text(f"ANALYZE public.{table}"))
+            reltuples = dict(db.execute(text(
+                "SELECT relname, reltuples FROM pg_class "
+                "WHERE relnamespace = 'public'::regnamespace AND relkind = 'r'"
+            )).all())
+
+            event.listen(engine, "before_cursor_execute", explain)
+            try:
+                for label, call in checks:
+                    current["label"] = label
+                    call()
+                current["label"] = None
+            finally:
+                event.remove(engine, "before_cursor_execute", explain)
+        finally:
+            # Never keep the seed
+            uow.failed = True
+
+    for label, _ in checks:
+        bad, scans = [], []
+        for plan in plans.get(label, []):
+            for node in plan_nodes(plan):
+                if "Relation Name" not in node:
+                    continue
+                scans.append(describe(node))
+                if node["Node Type"] == "Seq Scan" and reltuples.get(node["Relation Name"], 0) >= args.min_rows:
+                    bad.append(describe(node))
+        failures += bool(bad)
+        status = "FAIL" if bad else "ok  "
+        print(f"{status} {label}")
+        for scan in (scans if args.verbose else bad):
+            print(f"       {scan}")
+
+    print(f"{len(checks) - failures}/{len(checks)} query shapes avoid sequential scans on large tables")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
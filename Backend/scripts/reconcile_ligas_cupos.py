@@ -0,0 +1,50 @@
+"""
+Verify ligas_cupos.miembros_actuales against ligas_miembros
+
+The counters are maintained by the triggers in
+SQL_scripts/create_ligas_cupos_counters.sql; this job checks them (and that
+every league has one) and can repair the ones that drifted, e.g. after
+manual edits with the triggers disabled. Meant to run periodically (cron):
+
+    python scripts/reconcile_ligas_cupos.py          # report, exit 1 on drift
+    python scripts/reconcile_ligas_cupos.py --fix    # recount drifted leagues
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "API"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="Recount the leagues whose counter is wrong or missing")
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL")
+    args = parser.parse_args()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from DAL.repositories.liga_repository import liga_cupo_repository
+
+    drift = liga_cupo_repository.find_drift()
+    for liga_id, registrado, real in drift:
+        registrado = "sin contador" if registrado is None else registrado
+        print(f"{liga_id}: miembros_actuales={registrado} real={real}")
+
+    if not drift:
+        print("ligas_cupos is consistent with ligas_miembros")
+        return 0
+    if not args.fix:
+        print(f"{len(drift)} league counter(s) out of step (re-run with --fix to repair)")
+        return 1
+
+    for liga_id, _, _ in drift:
+        # Each league in its own short transaction, recounted under its row lock
+        liga_cupo_repository.reconcile(liga_id)
+    remaining = liga_cupo_repository.find_drift()
+    print(f"Repaired {len(drift) - len(remaining)} of {len(drift)} league counter(s)")
+    return 1 if remaining else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())